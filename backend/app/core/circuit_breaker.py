@@ -0,0 +1,106 @@
+"""
+Circuit breaker for an upstream dependency.
+
+After `failure_threshold` consecutive failures the circuit opens and calls
+are refused without touching the upstream, so a dead provider costs
+nothing and its callers fail over at once instead of waiting on timeouts.
+After `reset_seconds` the circuit goes half-open: exactly one call, the
+probe, is let through and the rest are refused until it resolves. A success
+closes the circuit, a failure re-opens it for another `reset_seconds`, and a
+probe that ends without a verdict (cancelled, or refused for reasons that say
+nothing about the upstream) is released so the next caller can probe.
+"""
+
+import time
+from collections.abc import Callable
+from enum import IntEnum
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class CircuitState(IntEnum):
+    CLOSED = 0
+    HALF_OPEN = 1
+    OPEN = 2
+
+
+class CircuitOpenError(Exception):
+    """Refused without calling upstream: the circuit is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker (not thread-safe; one event loop)."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+        self.opened_total = 0
+
+    @property
+    def state(self) -> CircuitState:
+        if self._opened_at is None:
+            return CircuitState.CLOSED
+        if self._clock() - self._opened_at >= self.reset_seconds:
+            return CircuitState.HALF_OPEN
+        return CircuitState.OPEN
+
+    def allow(self) -> bool:
+        """
+        Whether a call may go upstream right now. While half-open, True
+        admits the caller as the probe, which must end in record_success,
+        record_failure or release.
+        """
+        state = self.state
+        if state == CircuitState.HALF_OPEN:
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+        return state == CircuitState.CLOSED
+
+    def release(self) -> None:
+        """An admitted call ended without saying anything about the upstream."""
+        self._probing = False
+
+    def record_success(self) -> None:
+        if self._opened_at is not None:
+            logger.info("circuit_closed", circuit=self.name)
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._probing = False
+        state = self.state
+        if state == CircuitState.HALF_OPEN or (
+            state == CircuitState.CLOSED and self._failures >= self.failure_threshold
+        ):
+            self._opened_at = self._clock()
+            self.opened_total += 1
+            logger.warning(
+                "circuit_opened",
+                circuit=self.name,
+                consecutive_failures=self._failures,
+                retry_in_seconds=self.reset_seconds,
+            )
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "state": self.state.name.lower(),
+            "consecutive_failures": self._failures,
+            "opened_total": self.opened_total,
+        }
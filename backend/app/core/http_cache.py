@@ -0,0 +1,149 @@
+"""
+Pre-serialized, pre-compressed JSON responses with ETag revalidation.
+
+A PreparedJSON is built once when the underlying data changes: the model is
+serialized to JSON bytes a single time, gzip and brotli variants are
+compressed up front, and a strong ETag is derived from the content. Serving
+it is then a dict lookup - no Pydantic serialization or compression per
+request, and a conditional request whose ETag matches gets an empty 304.
+
+Each encoding gets its own strong ETag ("<hash>", "<hash>-gzip", "<hash>-br")
+as required for strong validators, but any of them revalidates the content.
+
+Bodies built once per data change (the snapshot, date slates) compress at
+the highest levels. Bodies built on a request's cache miss (deltas, team
+schedules, date ranges) pass fast=True: the request waiting on them pays
+for the compression.
+"""
+
+import gzip
+import hashlib
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+import brotli
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from app.core.metrics import serialization_duration
+
+# Below this, compression overhead outweighs the savings
+MIN_COMPRESS_BYTES = 512
+
+# Clients must revalidate every time, but a matching ETag costs a 304 only
+CACHE_CONTROL = "no-cache"
+
+# (gzip level, brotli quality): built once and served many times, or built
+# while a request waits
+MAX_COMPRESSION = (9, 11)
+FAST_COMPRESSION = (6, 4)
+
+# Preference order when the client accepts several encodings equally
+_ENCODINGS = ("br", "gzip")
+
+
+@lru_cache(maxsize=256)
+def _accepted_encodings(header: str) -> dict[str, float]:
+    """Accept-Encoding as coding -> q-value (RFC 9110 section 12.5.3)."""
+    accepted: dict[str, float] = {}
+    for item in header.split(","):
+        coding, *params = item.split(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+@dataclass(frozen=True, slots=True)
+class PreparedJSON:
+    """Immutable JSON body with precomputed encodings and ETags."""
+
+    content: bytes
+    etag: str
+    # encoding -> (body, etag); "identity" is always present
+    variants: dict[str, tuple[bytes, str]] = field(repr=False)
+    # Every ETag (strong and weak form) that revalidates this content
+    matching_etags: frozenset[str] = field(repr=False)
+
+    @classmethod
+    def from_model(cls, model: BaseModel, *, fast: bool = False) -> "PreparedJSON":
+        start = time.perf_counter()
+        content = model.model_dump_json().encode()
+        serialization_duration.observe(time.perf_counter() - start, "json")
+        return cls.from_bytes(content, fast=fast)
+
+    @classmethod
+    def from_bytes(cls, content: bytes, *, fast: bool = False) -> "PreparedJSON":
+        digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+        etag = f'"{digest}"'
+
+        variants: dict[str, tuple[bytes, str]] = {"identity": (content, etag)}
+        if len(content) >= MIN_COMPRESS_BYTES:
+            gzip_level, brotli_quality = FAST_COMPRESSION if fast else MAX_COMPRESSION
+            # mtime=0 keeps gzip output deterministic for identical content
+            start = time.perf_counter()
+            variants["gzip"] = (
+                gzip.compress(content, compresslevel=gzip_level, mtime=0),
+                f'"{digest}-gzip"',
+            )
+            compressed = time.perf_counter()
+            variants["br"] = (
+                brotli.compress(content, mode=brotli.MODE_TEXT, quality=brotli_quality),
+                f'"{digest}-br"',
+            )
+            serialization_duration.observe(compressed - start, "gzip")
+            serialization_duration.observe(time.perf_counter() - compressed, "br")
+        return cls.from_variants(variants)
+
+    @classmethod
+    def from_variants(cls, variants: dict[str, tuple[bytes, str]]) -> "PreparedJSON":
+        """Wrap already-encoded variants (e.g. read back from shared state)."""
+        matching = {"*"}
+        for _, tag in variants.values():
+            matching.add(tag)
+            matching.add(f"W/{tag}")
+
+        content, etag = variants["identity"]
+        return cls(
+            content=content,
+            etag=etag,
+            variants=variants,
+            matching_etags=frozenset(matching),
+        )
+
+    def respond(self, request: Request) -> Response:
+        """Serve the best encoding for the request, or 304 if unchanged."""
+        encoding, best = "identity", 0.0
+        accepted = _accepted_encodings(request.headers.get("accept-encoding", ""))
+        for candidate in _ENCODINGS:
+            # Unlisted codings take the "*" q-value; q=0 means "not this one"
+            q = accepted.get(candidate, accepted.get("*", 0.0))
+            if q > best and candidate in self.variants:
+                encoding, best = candidate, q
+        body, etag = self.variants[encoding]
+
+        headers = {
+            "ETag": etag,
+            "Cache-Control": CACHE_CONTROL,
+            "Vary": "Accept-Encoding",
+        }
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and any(
+            tag.strip() in self.matching_etags for tag in if_none_match.split(",")
+        ):
+            return Response(status_code=304, headers=headers)
+
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,316 @@
+"""
+In-process metrics, served in the Prometheus text format at /metrics
+(behind X-Admin-Key, like the admin routes).
+
+No client library: counters and histograms are dicts keyed by label values,
+and recording one is a couple of dict operations on the event loop thread
+(no locks - nothing records from other threads). Histograms keep
+per-bucket counts and only build the cumulative series when scraped.
+
+Numbers other components already keep (rate-limit budget, coalescing,
+prediction cache, SSE subscribers) aren't duplicated: modules register a
+collector that reads their stats() at scrape time, so those cost nothing
+between scrapes.
+
+Also here: EventLoopLagMonitor, which measures how late the loop wakes a
+sleeping task - the best single signal that something is blocking it.
+"""
+
+import asyncio
+import bisect
+import math
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+PREFIX = "nba_oracle_"
+
+# Seconds. Covers sub-ms cache reads up to upstream read timeouts.
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+LAG_CHECK_SECONDS = 0.5
+
+
+@dataclass
+class Family:
+    """One metric as rendered: name, type, help and its samples."""
+
+    name: str
+    kind: str  # "counter", "gauge" or "histogram"
+    help: str
+    # (name suffix, labels, value)
+    samples: list[tuple[str, dict[str, str], float]] = field(default_factory=list)
+
+    def add(self, value: float, **labels: str) -> "Family":
+        self.samples.append(("", labels, value))
+        return self
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items())
+    return "{" + inner + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonic count per label combination."""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0.0)
+
+    def collect(self) -> Iterable[Family]:
+        family = Family(self.name, "counter", self.help)
+        for values, count in self._values.items():
+            family.samples.append(("", dict(zip(self.labels, values)), count))
+        yield family
+
+
+class Histogram:
+    """Observations bucketed by upper bound, per label combination."""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        # label values -> [per-bucket counts (+1 for +Inf), sum, count]
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [
+                [0] * (len(self.buckets) + 1),
+                0.0,
+                0,
+            ]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def count(self, *label_values: str) -> int:
+        series = self._series.get(label_values)
+        return series[2] if series else 0
+
+    def collect(self) -> Iterable[Family]:
+        family = Family(self.name, "histogram", self.help)
+        for values, (counts, total, n) in self._series.items():
+            labels = dict(zip(self.labels, values))
+            cumulative = 0
+            for bound, bucket_count in zip(
+                (*self.buckets, math.inf), counts, strict=True
+            ):
+                cumulative += bucket_count
+                family.samples.append(
+                    ("_bucket", {**labels, "le": _format_value(bound)}, cumulative)
+                )
+            family.samples.append(("_sum", labels, total))
+            family.samples.append(("_count", labels, n))
+        yield family
+
+
+class MetricsRegistry:
+    """Every metric and collector the /metrics endpoint renders."""
+
+    def __init__(self, prefix: str = PREFIX):
+        self.prefix = prefix
+        self._metrics: list[Counter | Histogram] = []
+        self._collectors: list[Callable[[], Iterable[Family]]] = []
+
+    def counter(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Counter:
+        metric = Counter(self.prefix + name, help, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        metric = Histogram(self.prefix + name, help, labels, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def collector(
+        self, fn: Callable[[], Iterable[Family]]
+    ) -> Callable[[], Iterable[Family]]:
+        """Register `fn` (usable as a decorator). Family names get the prefix."""
+        self._collectors.append(fn)
+        return fn
+
+    def collect(self) -> list[Family]:
+        families = [f for metric in self._metrics for f in metric.collect()]
+        for fn in self._collectors:
+            try:
+                for family in fn():
+                    family.name = self.prefix + family.name
+                    families.append(family)
+            except Exception as e:
+                # A broken collector must not take the whole scrape down
+                logger.warning(
+                    "metrics_collector_failed",
+                    collector=getattr(fn, "__qualname__", repr(fn)),
+                    error_message=str(e),
+                )
+        return families
+
+    def render(self) -> str:
+        lines = []
+        for family in self.collect():
+            lines.append(f"# HELP {family.name} {family.help}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            for suffix, labels, value in family.samples:
+                lines.append(
+                    f"{family.name}{suffix}{_format_labels(labels)} "
+                    f"{_format_value(value)}"
+                )
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# Upstream (balldontlie) calls, recorded in BalldontlieProvider._get_raw
+upstream_duration = registry.histogram(
+    "upstream_request_duration_seconds",
+    "Upstream API call latency (excluding rate-limit queueing)",
+    labels=("endpoint",),
+)
+upstream_requests = registry.counter(
+    "upstream_requests_total",
+    "Upstream API calls by outcome (ok or the error type)",
+    labels=("endpoint", "outcome"),
+)
+rate_limit_wait = registry.histogram(
+    "rate_limit_wait_seconds",
+    "Time spent queued for an upstream budget token",
+    labels=("priority",),
+)
+
+# Published slate
+snapshot_reads = registry.counter(
+    "snapshot_reads_total",
+    "Slate reads: hit (fresh snapshot), stale (served while upstream is "
+    "failing) or miss (had to wait for the first snapshot)",
+    labels=("result",),
+)
+delta_cache = registry.counter(
+    "delta_cache_requests_total",
+    "?since= delta bodies served from the per-version cache (hit) or built",
+    labels=("result",),
+)
+date_cache = registry.counter(
+    "date_cache_requests_total",
+    "Slates for other dates (?date=, /range): hit, disk (saved final date), "
+    "schedule (future date built from the season index), shared (built by "
+    "another worker), miss (fetched upstream) or stale (served after a failed "
+    "refetch)",
+    labels=("result",),
+)
+refresh_duration = registry.histogram(
+    "refresh_duration_seconds",
+    "Background refresh of today's slate, by data source",
+    labels=("data_source",),
+)
+refresh_failures = registry.counter(
+    "refresh_failures_total",
+    "Background refreshes that failed, by error type",
+    labels=("error_type",),
+)
+
+# Serving
+http_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template",
+    labels=("method", "route", "status"),
+)
+serialization_duration = registry.histogram(
+    "serialization_duration_seconds",
+    "Building a prepared response body: json, gzip or br",
+    labels=("stage",),
+)
+
+event_loop_lag = registry.histogram(
+    "event_loop_lag_seconds",
+    f"How late the event loop wakes a task sleeping {LAG_CHECK_SECONDS}s",
+    buckets=LAG_BUCKETS,
+)
+
+
+class EventLoopLagMonitor:
+    """Background task recording event loop wake-up lag."""
+
+    def __init__(self, interval: float = LAG_CHECK_SECONDS):
+        self.interval = interval
+        self.last_lag = 0.0
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="event-loop-lag")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.last_lag = max(0.0, time.perf_counter() - start - self.interval)
+            event_loop_lag.observe(self.last_lag)
@@ -0,0 +1,114 @@
+"""
+On-demand statistical sampling profiler.
+
+A background thread wakes every `interval` seconds, grabs the current stack
+of the target threads with sys._current_frames() and counts identical
+stacks. Nothing is installed on the profiled code (no sys.setprofile
+hooks), so the app runs at full speed between samples and pays nothing
+at all when no profile is running.
+
+Output is the "collapsed stack" format read by flamegraph.pl, speedscope
+and inferno: one line per distinct stack, root first, frames separated by
+";", then the sample count:
+
+    thread:MainThread;...;game_from_box_score (app/services/game_decoder.py) 42
+"""
+
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+DEFAULT_INTERVAL_SECONDS = 0.005
+MAX_DURATION_SECONDS = 60.0
+
+_PREFIXES = sorted(
+    {str(Path(p).resolve()) for p in sys.path if p and Path(p).is_dir()},
+    key=len,
+    reverse=True,
+)
+
+
+def _short_path(filename: str) -> str:
+    """Path relative to the sys.path entry it was imported from."""
+    for prefix in _PREFIXES:
+        if filename.startswith(prefix):
+            return filename[len(prefix) :].lstrip("/\\")
+    return filename
+
+
+class SamplingProfiler:
+    """Sample the stacks of `thread_ids` (default: every other thread)."""
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_INTERVAL_SECONDS,
+        thread_ids: set[int] | None = None,
+        line_numbers: bool = False,
+    ):
+        self.interval = interval
+        self.thread_ids = thread_ids
+        self.line_numbers = line_numbers
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._labels: dict[tuple, str] = {}  # (code, line) -> frame label
+
+    def _label(self, frame) -> str:
+        code = frame.f_code
+        key = (code, frame.f_lineno if self.line_numbers else 0)
+        label = self._labels.get(key)
+        if label is None:
+            where = _short_path(code.co_filename)
+            if self.line_numbers:
+                where = f"{where}:{frame.f_lineno}"
+            label = self._labels[key] = f"{code.co_qualname} ({where})"
+        return label
+
+    def _sample(self, names: dict[int, str]) -> None:
+        own = threading.get_ident()
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own:
+                continue
+            if self.thread_ids is not None and thread_id not in self.thread_ids:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(self._label(frame))
+                frame = frame.f_back
+            labels.append(f"thread:{names.get(thread_id, thread_id)}")
+            labels.reverse()
+            self.stacks[";".join(labels)] += 1
+        self.samples += 1
+
+    def _run(self) -> None:
+        start = time.perf_counter()
+        next_at = start
+        while not self._stop.is_set():
+            names = {t.ident: t.name for t in threading.enumerate()}
+            self._sample(names)
+            next_at += self.interval
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                self._stop.wait(delay)
+            else:
+                next_at = time.perf_counter()  # fell behind - don't burst
+        self.duration = time.perf_counter() - start
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def collapsed(self) -> str:
+        """Flamegraph collapsed-stack text, heaviest stacks first."""
+        return "".join(f"{stack} {n}\n" for stack, n in self.stacks.most_common())
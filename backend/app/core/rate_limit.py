@@ -0,0 +1,210 @@
+"""
+Priority-aware token bucket for upstream API budgets.
+
+Tokens refill continuously at the configured rate up to `capacity`. A caller
+that finds no token waits in a priority queue instead of failing: when a
+token becomes available it goes to the highest-priority waiter (FIFO within
+a priority). Each wait has a deadline; a caller still queued at its deadline
+gets RateLimitTimeout.
+
+Lower priorities also can't spend the last few tokens (`reserve`), so a
+backfill job running flat out still leaves headroom for live refreshes.
+
+With share(), the tokens live in a SharedState record instead of the
+process, so every uvicorn worker spends from one budget.
+"""
+
+import asyncio
+import heapq
+import itertools
+import struct
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from enum import IntEnum
+from types import EllipsisType
+
+from app.core.logging import get_logger
+from app.core.shared_state import SharedState
+
+logger = get_logger(__name__)
+
+# A shared bucket's record: tokens, and the time.monotonic() they were
+# counted at (the same clock in every process on the host)
+_RECORD = struct.Struct("<dd")
+
+
+class Priority(IntEnum):
+    """Lower value = served first."""
+
+    LIVE = 0  # live score refresh - what viewers are watching right now
+    SCHEDULE = 1  # schedule / pregame refresh
+    BACKFILL = 2  # historical ingestion, batch jobs
+
+
+class RateLimitTimeout(Exception):
+    """A caller's deadline passed while it was queued for a token."""
+
+
+class TokenBucket:
+    """Async token bucket with priority queueing and per-call deadlines."""
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        capacity: float,
+        reserve: dict[Priority, float] | None = None,
+        default_timeouts: dict[Priority, float | None] | None = None,
+    ):
+        self.rate = rate_per_minute / 60.0  # tokens per second
+        self.capacity = capacity
+        self._reserve = reserve or {}
+        self._default_timeouts = default_timeouts or {}
+        self._tokens = capacity
+        self._updated: float | None = None  # time.monotonic() of last refill
+        self._shared: tuple[SharedState, str] | None = None
+        # (priority, seq, future) - seq keeps FIFO order within a priority
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+
+        self.granted = {p: 0 for p in Priority}
+        self.timeouts = {p: 0 for p in Priority}
+
+    def _refill(self, now: float) -> None:
+        if self._updated is not None:
+            elapsed = now - self._updated
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def share(self, shared: SharedState, name: str) -> None:
+        """
+        Spend from one budget with every worker sharing `shared`.
+
+        From now on the tokens are read from and written back to the record
+        `name` around every take, under its flock, so N workers together
+        stay within the rate and a drain after a 429 stops them all. Queues
+        stay per worker: priorities order this worker's waiters, and the
+        reserve keeps every worker's lower priorities off the last tokens.
+        """
+        self._shared = (shared, name)
+
+    @contextmanager
+    def _synced(self) -> Iterator[None]:
+        """Refill the tokens (the shared ones, if shared) for a read-modify-write."""
+        if self._shared is None:
+            self._refill(time.monotonic())
+            yield
+            return
+        shared, name = self._shared
+        with shared.record(name, _RECORD.size) as record:
+            if any(record):  # a new record starts full, like a new bucket
+                self._tokens, self._updated = _RECORD.unpack(record)
+            self._refill(time.monotonic())
+            yield
+            record[:] = _RECORD.pack(self._tokens, self._updated)
+
+    def _can_take(self, priority: Priority) -> bool:
+        return self._tokens >= 1 + self._reserve.get(priority, 0)
+
+    async def acquire(
+        self,
+        priority: Priority = Priority.SCHEDULE,
+        timeout: float | None | EllipsisType = ...,
+    ) -> None:
+        """
+        Take one token, waiting behind higher-priority callers if needed.
+
+        `timeout` defaults to the priority's configured deadline (None waits
+        indefinitely). Raises RateLimitTimeout if the deadline passes.
+        """
+        if timeout is ...:
+            timeout = self._default_timeouts.get(priority)
+
+        loop = asyncio.get_running_loop()
+        while self._waiters and self._waiters[0][2].done():
+            heapq.heappop(self._waiters)
+
+        # Fast path: nobody queued ahead and a token is available
+        with self._synced():
+            if not self._waiters and self._can_take(priority):
+                self._tokens -= 1
+                self.granted[priority] += 1
+                return
+
+        future = loop.create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        self._schedule(loop)
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except TimeoutError:
+            if future.done() and not future.cancelled():
+                # Granted in the same tick the deadline fired - keep it
+                return
+            future.cancel()
+            self.timeouts[priority] += 1
+            logger.warning(
+                "rate_limit_timeout",
+                priority=priority.name,
+                waited_seconds=timeout,
+                tokens_remaining=round(self._tokens, 2),
+            )
+            raise RateLimitTimeout(
+                f"No upstream budget within {timeout}s for {priority.name} call"
+            ) from None
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+
+    def _schedule(self, loop: asyncio.AbstractEventLoop) -> None:
+        """(Re)arm the timer for when the head waiter can next be served."""
+        if self._timer is not None:
+            self._timer.cancel()
+        priority = self._waiters[0][0]
+        needed = 1 + self._reserve.get(priority, 0) - self._tokens
+        delay = max(needed / self.rate, 0.0)
+        self._timer = loop.call_later(delay, self._dispatch, loop)
+
+    def _dispatch(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._timer = None
+        with self._synced():
+            while self._waiters:
+                priority, _, future = self._waiters[0]
+                if future.done():  # timed out or cancelled while queued
+                    heapq.heappop(self._waiters)
+                    continue
+                if not self._can_take(priority):
+                    break
+                heapq.heappop(self._waiters)
+                self._tokens -= 1
+                self.granted[priority] += 1
+                future.set_result(None)
+        # Other workers may take what we were waiting for - then this just
+        # re-arms the timer
+        if self._waiters:
+            self._schedule(loop)
+
+    def drain(self) -> None:
+        """Empty the bucket, e.g. after upstream answered 429."""
+        with self._synced():
+            self._tokens = 0.0
+
+    def remaining(self) -> float:
+        """Tokens available right now (may be fractional)."""
+        with self._synced():
+            return self._tokens
+
+    def stats(self) -> dict[str, object]:
+        """Budget and queue state for logging/monitoring."""
+        waiting = {p.name: 0 for p in Priority}
+        for priority, _, future in self._waiters:
+            if not future.done():
+                waiting[Priority(priority).name] += 1
+        return {
+            "remaining": round(self.remaining(), 2),
+            "capacity": self.capacity,
+            "rate_per_minute": self.rate * 60,
+            "waiting": waiting,
+            "granted": {p.name: n for p, n in self.granted.items()},
+            "timeouts": {p.name: n for p, n in self.timeouts.items()},
+        }
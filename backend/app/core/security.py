@@ -68,6 +68,47 @@ async def verify_api_key(
 # Type alias for dependency injection
 ApiKeyDep = Annotated[str, Depends(verify_api_key)]
 
+admin_key_header = APIKeyHeader(
+    name="X-Admin-Key",
+    auto_error=False,
+    description="Operator key for the /api/admin endpoints",
+)
+
+
+async def verify_admin_key(
+    admin_key: str | None = Security(admin_key_header),
+) -> str:
+    """
+    Verify the X-Admin-Key header against ADMIN_API_KEY_HASH.
+
+    There is no dev-mode bypass: with no hash configured the admin
+    endpoints are disabled, so a deploy that forgets the setting doesn't
+    expose the profiler.
+    """
+    if not settings.admin_api_key_hash:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not Found",
+        )
+
+    if not admin_key:
+        logger.warning("admin_key_missing")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Missing admin key",
+            headers={"WWW-Authenticate": "ApiKey"},
+        )
+
+    incoming_hash = _hash_key(admin_key)
+    if not secrets.compare_digest(incoming_hash, settings.admin_api_key_hash):
+        logger.warning("admin_key_invalid", provided_hash_prefix=incoming_hash[:8])
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid admin key",
+        )
+
+    return admin_key
+
 
 def generate_api_key_and_hash() -> tuple[str, str]:
     """
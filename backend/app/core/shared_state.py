@@ -0,0 +1,201 @@
+"""
+State shared by the worker processes of one deployment (uvicorn --workers).
+
+Every worker is a separate process with its own module globals, so without
+this each one would poll upstream and fill its own caches: N workers, N
+times the upstream calls. Everything here lives as files in one directory,
+meant to be on tmpfs (/dev/shm), so a write is a memory copy:
+
+- LeaderLock: an exclusive flock on <dir>/leader.lock. One process holds it
+  at a time; the kernel releases it when the holder exits or crashes, so
+  the next follower to retry takes over.
+- entries: named blobs, written to a temp file and renamed into place, so a
+  reader sees the old entry or the new one, never a torn write. Each write
+  is a new inode, so changes are detected with one stat() and no read.
+- lock(name): a cross-process mutex per name (single-flight across workers).
+- record(name): a few bytes every worker reads and rewrites in place under
+  a blocking flock, for state they all update (the upstream rate budget).
+
+An entry packs a JSON header and named binary parts (see pack/unpack).
+"""
+
+import asyncio
+import fcntl
+import json
+import os
+import struct
+import tempfile
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import Any
+
+from app.core.http_cache import PreparedJSON
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# How often a waiter retries a held lock (non-blocking, so it's cancellable)
+LOCK_POLL_SECONDS = 0.05
+
+# Identifies a version of an entry: (inode, mtime in ns)
+Stamp = tuple[int, int]
+
+_HEADER_SIZE = struct.Struct("<I")
+
+
+def pack(header: dict[str, Any], parts: dict[str, bytes] | None = None) -> bytes:
+    """A JSON header plus named binary parts, as one blob."""
+    parts = parts or {}
+    meta = json.dumps(
+        {"header": header, "parts": {name: len(p) for name, p in parts.items()}},
+        separators=(",", ":"),
+    ).encode()
+    return b"".join([_HEADER_SIZE.pack(len(meta)), meta, *parts.values()])
+
+
+def unpack(blob: bytes) -> tuple[dict[str, Any], dict[str, bytes]]:
+    """The header and parts of a packed blob."""
+    (size,) = _HEADER_SIZE.unpack_from(blob)
+    offset = _HEADER_SIZE.size + size
+    meta = json.loads(blob[_HEADER_SIZE.size : offset])
+    parts = {}
+    view = memoryview(blob)
+    for name, length in meta["parts"].items():
+        parts[name] = bytes(view[offset : offset + length])
+        offset += length
+    return meta["header"], parts
+
+
+def body_parts(body: PreparedJSON) -> tuple[dict[str, str], dict[str, bytes]]:
+    """A prepared body as (etag per encoding, bytes per encoding)."""
+    return (
+        {encoding: etag for encoding, (_, etag) in body.variants.items()},
+        {encoding: content for encoding, (content, _) in body.variants.items()},
+    )
+
+
+def body_from_parts(etags: dict[str, str], parts: dict[str, bytes]) -> PreparedJSON:
+    """Rebuild a prepared body without re-serializing or re-compressing it."""
+    return PreparedJSON.from_variants(
+        {encoding: (parts[encoding], etag) for encoding, etag in etags.items()}
+    )
+
+
+class SharedState:
+    """Named entries and locks in a directory every worker can reach."""
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, name: str) -> Path:
+        return self.directory / f"{name}.bin"
+
+    def write(self, name: str, blob: bytes) -> None:
+        """Atomically replace an entry."""
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=f".{name}.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(blob)
+            os.replace(tmp, self._path(name))
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def stamp(self, name: str) -> Stamp | None:
+        """Current version of an entry, None if it doesn't exist."""
+        try:
+            st = os.stat(self._path(name))
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_mtime_ns
+
+    def read(self, name: str, since: Stamp | None = None) -> tuple[Stamp, bytes] | None:
+        """
+        An entry and its stamp. None if it doesn't exist, or if `since` is
+        given and the entry hasn't changed from it.
+        """
+        if since is not None and self.stamp(name) == since:
+            return None
+        try:
+            with open(self._path(name), "rb") as f:
+                st = os.fstat(f.fileno())
+                return (st.st_ino, st.st_mtime_ns), f.read()
+        except FileNotFoundError:
+            return None
+
+    @asynccontextmanager
+    async def lock(self, name: str, timeout: float) -> AsyncIterator[bool]:
+        """
+        Hold the cross-process lock `name`; yields False if it couldn't be
+        taken within `timeout` seconds (the caller decides whether to go on).
+        """
+        fd = os.open(self.directory / f"{name}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + timeout
+            acquired = False
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    acquired = True
+                    break
+                except BlockingIOError:
+                    if loop.time() >= deadline:
+                        break
+                    await asyncio.sleep(LOCK_POLL_SECONDS)
+            yield acquired
+        finally:
+            os.close(fd)  # also releases the lock
+
+    @contextmanager
+    def record(self, name: str, size: int) -> Iterator[bytearray]:
+        """
+        Read-modify-write the `size`-byte record `name` (zeros if new) under
+        its flock. The buffer is written back when the block exits cleanly.
+
+        The lock blocks the event loop while held, so the block must be a
+        few lines of plain Python - never await inside it.
+        """
+        fd = os.open(self.directory / f"{name}.rec", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            record = bytearray(os.pread(fd, size, 0).ljust(size, b"\0"))
+            yield record
+            os.pwrite(fd, record, 0)
+        finally:
+            os.close(fd)  # also releases the lock
+
+
+class LeaderLock:
+    """Exclusive, crash-safe leadership among the processes sharing a directory."""
+
+    def __init__(self, state: SharedState):
+        self._path = state.directory / "leader.lock"
+        self._fd: int | None = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def try_acquire(self) -> bool:
+        """Take leadership if nobody holds it. Never blocks."""
+        if self._fd is not None:
+            return True
+        fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        # Holder's pid, for operators (the lock itself is the flock)
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        if self._fd is not None:
+            fd, self._fd = self._fd, None
+            os.close(fd)
@@ -0,0 +1,57 @@
+"""
+Single-flight coalescing for concurrent async calls.
+
+While a call for a key is in flight, every other caller asking for the same
+key awaits that call instead of starting its own, and gets the same result
+(or the same exception). Once it settles the key is forgotten, so the next
+caller starts a fresh call - this is de-duplication, not caching.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one in-flight call."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self.flights = 0  # calls actually started
+        self.coalesced = 0  # callers that joined an existing call
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fn() for key, or join the call already in flight for key."""
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            logger.debug("singleflight_coalesced", flight=self.name, key=str(key))
+        else:
+            # Run as its own task so one caller being cancelled (client
+            # disconnect, timeout) doesn't cancel the call for everyone else
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+            self.flights += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception retrieved - if every waiter was cancelled nobody
+        # else will, and asyncio would log "exception was never retrieved"
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict[str, int]:
+        """Counters for logging/monitoring."""
+        return {
+            "flights": self.flights,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+        }
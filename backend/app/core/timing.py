@@ -0,0 +1,139 @@
+"""
+Per-stage timing of hot paths, kept in a rolling buffer.
+
+A trace times one pass through a path (a slate refresh, a /today request)
+as a sequence of laps: each lap() call closes the stage that started at the
+previous lap (or at the trace start). Code deep in the call stack marks
+stages without being passed anything - the current trace lives in a
+contextvar, and lap() is a no-op when no trace is active.
+
+    with trace("refresh"):
+        response = await fetch()
+        lap("upstream")
+        games = [transform(g) for g in response.data]
+        lap("transform")
+
+Finished traces go into a per-name ring buffer (the last TRACE_BUFFER_SIZE)
+that /api/admin/timings summarizes, and each stage is also observed in the
+stage_duration_seconds histogram on /metrics. The cost is one perf_counter()
+call and a list append per stage.
+"""
+
+import statistics
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import UTC, datetime
+
+from app.core.metrics import registry
+
+TRACE_BUFFER_SIZE = 256
+
+stage_duration = registry.histogram(
+    "stage_duration_seconds",
+    "Time per stage of a traced hot path",
+    labels=("trace", "stage"),
+)
+
+
+class Trace:
+    """Laps of one pass through a traced path."""
+
+    __slots__ = ("name", "started_at", "start", "last", "stages", "total", "error")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = time.time()
+        self.start = self.last = time.perf_counter()
+        self.stages: list[tuple[str, float]] = []
+        self.total = 0.0
+        self.error: str | None = None
+
+    def lap(self, stage: str) -> None:
+        now = time.perf_counter()
+        self.stages.append((stage, now - self.last))
+        self.last = now
+
+    def as_dict(self) -> dict[str, object]:
+        stages: dict[str, float] = {}
+        for stage, seconds in self.stages:  # a stage can repeat (fallbacks)
+            stages[stage] = stages.get(stage, 0.0) + seconds
+        return {
+            "started_at": datetime.fromtimestamp(self.started_at, UTC).isoformat(),
+            "total_ms": round(self.total * 1000, 3),
+            "stages_ms": {stage: round(s * 1000, 3) for stage, s in stages.items()},
+            "error": self.error,
+        }
+
+
+_current: ContextVar[Trace | None] = ContextVar("current_trace", default=None)
+_buffers: dict[str, deque[Trace]] = {}
+
+
+def lap(stage: str) -> None:
+    """Close `stage` in the current trace, if there is one."""
+    current = _current.get()
+    if current is not None:
+        current.lap(stage)
+
+
+@contextmanager
+def trace(name: str) -> Iterator[Trace]:
+    """Time the block as trace `name`; time after the last lap is "other"."""
+    current = Trace(name)
+    token = _current.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = type(e).__name__
+        raise
+    finally:
+        _current.reset(token)
+        now = time.perf_counter()
+        if now - current.last > 0 and current.stages:
+            current.lap("other")
+        current.total = now - current.start
+        for stage, seconds in current.stages:
+            stage_duration.observe(seconds, name, stage)
+        buffer = _buffers.get(name)
+        if buffer is None:
+            buffer = _buffers[name] = deque(maxlen=TRACE_BUFFER_SIZE)
+        buffer.append(current)
+
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    values = sorted(values)
+    if len(values) > 1:
+        cuts = statistics.quantiles(values, n=100, method="inclusive")
+        p50, p95 = cuts[49], cuts[94]
+    else:
+        p50 = p95 = values[0]
+    return {
+        "p50_ms": round(p50 * 1000, 3),
+        "p95_ms": round(p95 * 1000, 3),
+        "max_ms": round(values[-1] * 1000, 3),
+    }
+
+
+def timing_summary(recent: int = 5) -> dict[str, object]:
+    """Per-stage percentiles over each buffer, plus the latest traces."""
+    summary = {}
+    for name, buffer in _buffers.items():
+        traces = list(buffer)
+        by_stage: dict[str, list[float]] = {}
+        for t in traces:
+            for stage, seconds in t.stages:
+                by_stage.setdefault(stage, []).append(seconds)
+        summary[name] = {
+            "traces": len(traces),
+            "errors": sum(1 for t in traces if t.error),
+            "total": _percentiles([t.total for t in traces]),
+            "stages": {
+                stage: {"count": len(v), **_percentiles(v)}
+                for stage, v in by_stage.items()
+            },
+            "recent": [t.as_dict() for t in traces[-recent:]],
+        }
+    return summary
@@ -1,12 +1,42 @@
 import time
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Request, Response
+from fastapi import Depends, FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from app.settings import settings
 from app.core.logging import get_logger, setup_logging
-from app.routers import games
+from app.core.metrics import EventLoopLagMonitor, http_duration, registry
+from app.core.security import verify_admin_key
+from app.core.shared_state import LeaderLock, SharedState
+from app.providers.balldontlie_provider import (
+    disable_recording,
+    enable_recording,
+    get_balldontlie_provider,
+    rate_limiter,
+)
+from app.providers.failover_provider import get_game_provider
+from app.providers.nba_cdn_provider import cdn_rate_limiter
+from app.providers.replay_provider import ReplayProvider
+from app.routers import admin, games, teams
+from app.services.game_poller import GamePoller, SlatePrefetcher, WorkerCoordinator
+from app.services.game_service import (
+    GameService,
+    disable_persistence,
+    disable_sharing,
+    enable_persistence,
+    enable_predictions,
+    enable_sharing,
+)
+from app.services.nba_api import (
+    close_nba_api_service,
+    get_nba_api_service,
+    open_nba_api_service,
+    open_nba_cdn_service,
+)
+from app.services.prediction_service import ModelReloader, PredictionService
+from app.services.snapshot_store import SnapshotStore
 
 # Initialize structured logging before app creation
 setup_logging()
@@ -22,7 +52,93 @@ async def lifespan(app: FastAPI):
         debug=settings.debug,
         version="0.1.0",
     )
+
+    lag_monitor = EventLoopLagMonitor()
+    lag_monitor.start()
+
+    # With several workers (uvicorn --workers), only the elected leader polls
+    # upstream; the others serve what it shares. Set up before the restore
+    # below so a follower doesn't share its copy of the saved slate.
+    shared_state = None
+    if settings.shared_state_dir:
+        shared_state = SharedState(settings.shared_state_dir)
+        enable_sharing(shared_state)
+        # Followers still call upstream on cache misses: one budget for all
+        # workers, not one each
+        rate_limiter.share(shared_state, "balldontlie_budget")
+        cdn_rate_limiter.share(shared_state, "cdn_budget")
+
+    # Restore the last saved slate before taking traffic, so a restart
+    # serves scores immediately instead of waiting on upstream
+    snapshot_store = None
+    if settings.snapshot_db_path:
+        snapshot_store = SnapshotStore(settings.snapshot_db_path)
+        enable_persistence(snapshot_store)
+
+    # Model and feature history load before the first refresh, so the first
+    # published slate already carries predictions
+    predictions = PredictionService.load(
+        settings.models_dir,
+        settings.game_store_path,
+        model_version=settings.model_version or None,
+    )
+    enable_predictions(predictions)
+    model_reloader = None
+    if not settings.model_version:
+        model_reloader = ModelReloader(predictions, settings.models_dir)
+        model_reloader.start()
+
+    replay = None
+    if settings.provider_replay_path:
+        # A recorded night stands in for upstream, for the poller and for
+        # every BalldontlieProviderDep
+        replay = ReplayProvider.load(
+            settings.provider_replay_path, settings.provider_replay_speed
+        )
+        app.dependency_overrides[get_balldontlie_provider] = lambda: replay
+    else:
+        # One pooled upstream client for the whole app, plus one for the
+        # NBA CDN that today's scoreboard fails over to
+        open_nba_api_service()
+        open_nba_cdn_service()
+        if settings.provider_record_path:
+            enable_recording(settings.provider_record_path)
+
+    def game_service() -> GameService:
+        return GameService(
+            get_game_provider(replay or get_balldontlie_provider(get_nba_api_service()))
+        )
+
+    # Single background refresher for today's slate - requests only read
+    # the snapshot it publishes
+    poller = GamePoller(game_service)
+    app.state.game_poller = poller
+    # Tomorrow's slate is in the date cache before anyone asks for it
+    prefetcher = SlatePrefetcher(game_service)
+    coordinator = None
+    if shared_state is not None:
+        coordinator = WorkerCoordinator(LeaderLock(shared_state), [poller, prefetcher])
+        coordinator.start()
+    else:
+        poller.start()
+        prefetcher.start()
+
     yield
+
+    if coordinator is not None:
+        await coordinator.stop()
+        disable_sharing()
+    await poller.stop()
+    await prefetcher.stop()
+    if model_reloader is not None:
+        await model_reloader.stop()
+    await close_nba_api_service()
+    disable_recording()
+    app.dependency_overrides.pop(get_balldontlie_provider, None)
+    if snapshot_store is not None:
+        await disable_persistence()
+        snapshot_store.close()
+    await lag_monitor.stop()
     logger.info("app_shutdown")
 
 
@@ -47,13 +163,23 @@ async def logging_middleware(request: Request, call_next) -> Response:
     """Log all HTTP requests with timing and status."""
     start_time = time.perf_counter()
 
-    # Skip logging for health checks (too noisy)
-    if request.url.path == "/health":
-        return await call_next(request)
-
     response = await call_next(request)
 
-    duration_ms = (time.perf_counter() - start_time) * 1000
+    duration = time.perf_counter() - start_time
+    # Route template, not the raw path, so ids don't explode the label set
+    route = request.scope.get("route")
+    http_duration.observe(
+        duration,
+        request.method,
+        route.path if route is not None else "unmatched",
+        str(response.status_code),
+    )
+
+    # Skip logging for health checks and scrapes (too noisy)
+    if request.url.path in ("/health", "/metrics"):
+        return response
+
+    duration_ms = duration * 1000
 
     logger.info(
         "http_request",
@@ -68,6 +194,8 @@ async def logging_middleware(request: Request, call_next) -> Response:
 
 
 app.include_router(games.router, prefix="/api/games", tags=["games"])
+app.include_router(teams.router, prefix="/api/teams", tags=["teams"])
+app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
 
 
 @app.get("/")
@@ -91,3 +219,15 @@ async def favicon():
 async def health_check():
     """Health check endpoint for monitoring and load balancers."""
     return {"status": "healthy", "environment": settings.api_env}
+
+
+@app.get("/metrics", include_in_schema=False, dependencies=[Depends(verify_admin_key)])
+async def metrics():
+    """
+    Prometheus scrape endpoint (see app/core/metrics.py).
+
+    Admin-only like /api/admin: the series expose upstream error rates, the
+    rate-limit budget and leader state, and prod is reachable from the
+    internet. Scrape with an X-Admin-Key header; 404 when no key is set.
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 from enum import Enum
 
 from pydantic import BaseModel
@@ -29,17 +29,63 @@ class Game(BaseModel):
     start_time: datetime | None
 
 
+class Prediction(BaseModel):
+    winner_id: int
+    confidence: float  # probability the predicted winner wins, 0.5-1.0
+    spread: float  # expected home margin in points (negative: away favored)
+
+
+class GameWithPrediction(Game):
+    prediction: Prediction | None = None  # None when no model is loaded
+    # In-progress games only: P(home team wins) from the score and clock
+    live_home_win_probability: float | None = None
+
+
 class GameListResponse(BaseModel):
-    games: list[Game]
+    games: list[GameWithPrediction]
     last_updated: datetime
+    version: int = 0  # monotonic; pass back as ?since= to get only changes
 
 
-# For predictions later
-class Prediction(BaseModel):
-    winner_id: int
-    confidence: float
-    spread: float
+class GameRangeResponse(BaseModel):
+    """Slates for a span of dates (/range), keyed by ISO date."""
 
+    dates: dict[date, GameListResponse]
 
-class GameWithPrediction(Game):
-    prediction: Prediction | None = None
+
+class GameDeltaResponse(BaseModel):
+    """Games changed since a client-supplied version (/today?since=)."""
+
+    games: list[GameWithPrediction]
+    removed_ids: list[int]
+    full: bool  # True: `since` was too old - replace the slate, don't merge
+    version: int
+    last_updated: datetime
+
+
+class GameUpdateEvent(BaseModel):
+    """Pushed on /api/games/stream: only the games that changed."""
+
+    games: list[GameWithPrediction]
+    removed_ids: list[int]
+    version: int
+    last_updated: datetime
+
+
+class TeamGamesResponse(BaseModel):
+    """A team's games this season (/api/teams/{id}/games), oldest first."""
+
+    team_id: int
+    season: int
+    games: list[GameWithPrediction]
+
+
+class TeamRating(BaseModel):
+    team_id: int
+    rating: float  # Elo; league average is about 1505
+    rank: int
+    games: int  # finals counted
+
+
+class TeamRatingsResponse(BaseModel):
+    ratings: list[TeamRating]  # best first
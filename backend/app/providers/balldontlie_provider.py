@@ -5,32 +5,167 @@ Handles raw API communication only - no business logic.
 Rate Limits (as of 2024):
 - Free tier: 60 requests/minute
 - Paid tiers: higher limits available
+
+Every call first takes a token from one shared, priority-aware bucket
+(RATE_LIMIT_PER_MINUTE), so bursts queue instead of tripping 429s and live
+refreshes are served ahead of schedule refreshes and backfills.
+
+Calls are native async over the shared pooled client in
+app/services/nba_api.py. Responses are validated into the balldontlie SDK's
+models, so callers see the same objects the blocking SDK used to return.
+The *_raw methods return the JSON body as bytes instead, for the refresh
+path's SDK-free decoder (app/services/game_decoder.py).
+
+With recording enabled, every raw response is also captured for offline
+replay (see recording.py and replay_provider.py).
 """
 
 import time
 from datetime import date
-from functools import lru_cache
-from typing import Annotated
+from typing import Annotated, Any
 
-from balldontlie import BalldontlieAPI
+from balldontlie.base import ListResponse, PaginatedListResponse
+from balldontlie.exceptions import RateLimitError
+from balldontlie.nba.models import NBABoxScore, NBAGame
 from fastapi import Depends
 
-from app.settings import settings
 from app.core.logging import get_logger
+from app.core.metrics import (
+    Family,
+    rate_limit_wait,
+    registry,
+    upstream_duration,
+    upstream_requests,
+)
+from app.core.rate_limit import Priority, TokenBucket
+from app.providers.base import upstream_timing
+from app.providers.recording import ProviderRecorder
+from app.services.nba_api import NBAApiService, get_nba_api_service
 
 logger = get_logger(__name__)
 
-# Rate limit tracking (for visibility, not enforcement)
+# Enforced upstream budget, shared by every provider instance and method
 RATE_LIMIT_PER_MINUTE = 60
+RATE_LIMIT_BURST = 10
+
+rate_limiter = TokenBucket(
+    rate_per_minute=RATE_LIMIT_PER_MINUTE,
+    capacity=RATE_LIMIT_BURST,
+    # Tokens lower priorities must leave in the bucket for live refreshes
+    reserve={Priority.SCHEDULE: 2, Priority.BACKFILL: 5},
+    # How long each class queues before giving up. A live score older than
+    # one poll interval is worthless; backfills can wait as long as it takes.
+    default_timeouts={
+        Priority.LIVE: 5.0,
+        Priority.SCHEDULE: 30.0,
+        Priority.BACKFILL: None,
+    },
+)
+
+# Captures every upstream response while set (see recording.py)
+_recorder: ProviderRecorder | None = None
+
+
+def enable_recording(path: str) -> None:
+    """Append every upstream response from now on to the recording at `path`."""
+    global _recorder
+    if _recorder is None:
+        _recorder = ProviderRecorder(path)
+        logger.info("provider_recording_started", path=path)
+
+
+def disable_recording() -> None:
+    global _recorder
+    if _recorder is not None:
+        recorder, _recorder = _recorder, None
+        recorder.close()
 
 
 class BalldontlieProvider:
     """Low-level API client for balldontlie.io with comprehensive logging."""
 
-    def __init__(self, api: BalldontlieAPI):
+    name = "balldontlie"
+    endpoints = None  # serves every GameProvider endpoint
+
+    def __init__(self, api: NBAApiService, limiter: TokenBucket = rate_limiter):
         self._api = api
+        self._limiter = limiter
+
+    async def _get_raw(
+        self, path: str, params: dict[str, Any] | None, priority: Priority
+    ) -> bytes:
+        """Spend one token of the shared budget, then make the call."""
+        queued = time.perf_counter()
+        await self._limiter.acquire(priority)
+        start = time.perf_counter()
+        rate_limit_wait.observe(start - queued, priority.name)
+        timing = upstream_timing.get()
+        if timing is not None and timing.sent_at is None:
+            timing.sent_at = start
+        try:
+            content = await self._api.get_bytes(path, params=params)
+        except Exception as e:
+            elapsed = time.perf_counter() - start
+            if timing is not None:
+                timing.seconds += elapsed
+            upstream_duration.observe(elapsed, path)
+            upstream_requests.inc(path, type(e).__name__)
+            if _recorder is not None:
+                _recorder.record(path, params, error=e)
+            if isinstance(e, RateLimitError):
+                # Upstream disagrees with our accounting - stop spending until
+                # the bucket refills
+                self._limiter.drain()
+            raise
+        elapsed = time.perf_counter() - start
+        if timing is not None:
+            timing.seconds += elapsed
+        upstream_duration.observe(elapsed, path)
+        upstream_requests.inc(path, "ok")
+        if _recorder is not None:
+            _recorder.record(path, params, content)
+        return content
+
+    async def _fetch_raw(
+        self,
+        endpoint: str,
+        path: str,
+        params: dict[str, Any] | None,
+        priority: Priority,
+        **context: Any,
+    ) -> bytes:
+        """_get_raw with the same request logging as the SDK-model methods."""
+        start_time = time.perf_counter()
+        logger.debug(
+            "api_request_start", provider=self.name, endpoint=endpoint, **context
+        )
+        try:
+            content = await self._get_raw(path, params, priority)
+        except Exception as e:
+            logger.error(
+                "api_request_failed",
+                provider=self.name,
+                endpoint=endpoint,
+                duration_ms=round((time.perf_counter() - start_time) * 1000, 2),
+                error_type=type(e).__name__,
+                error_message=str(e),
+                **context,
+            )
+            raise
+        logger.info(
+            "api_request_success",
+            provider=self.name,
+            endpoint=endpoint,
+            duration_ms=round((time.perf_counter() - start_time) * 1000, 2),
+            response_bytes=len(content),
+            rate_budget_remaining=round(self._limiter.remaining(), 1),
+            **context,
+        )
+        return content
 
-    def fetch_games_by_date(self, game_date: date):
+    async def fetch_games_by_date(
+        self, game_date: date, priority: Priority = Priority.SCHEDULE
+    ):
         """Fetch scheduled games for a specific date."""
         start_time = time.perf_counter()
         endpoint = "games.list"
@@ -42,7 +177,12 @@ class BalldontlieProvider:
         )
 
         try:
-            response = self._api.nba.games.list(dates=[game_date.isoformat()])
+            content = await self._get_raw(
+                "nba/v1/games",
+                {"dates[]": game_date.isoformat(), "per_page": 100},
+                priority,
+            )
+            response = PaginatedListResponse[NBAGame].model_validate_json(content)
             duration_ms = (time.perf_counter() - start_time) * 1000
             game_count = len(response.data) if hasattr(response, "data") else 0
 
@@ -52,6 +192,7 @@ class BalldontlieProvider:
                 date=game_date.isoformat(),
                 duration_ms=round(duration_ms, 2),
                 game_count=game_count,
+                rate_budget_remaining=round(self._limiter.remaining(), 1),
             )
             return response
 
@@ -69,7 +210,55 @@ class BalldontlieProvider:
             )
             raise
 
-    def fetch_box_scores_by_date(self, game_date: date):
+    async def fetch_games_page(
+        self,
+        *,
+        seasons: list[int] | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        cursor: int | None = None,
+        per_page: int = 100,
+        priority: Priority = Priority.BACKFILL,
+    ):
+        """Fetch one page of games (historical ingestion). Follow meta.next_cursor."""
+        start_time = time.perf_counter()
+        endpoint = "games.list"
+        params = _games_page_params(seasons, start_date, end_date, cursor, per_page)
+
+        logger.debug("api_request_start", endpoint=endpoint, cursor=cursor)
+
+        try:
+            content = await self._get_raw("nba/v1/games", params, priority)
+            response = PaginatedListResponse[NBAGame].model_validate_json(content)
+            duration_ms = (time.perf_counter() - start_time) * 1000
+
+            logger.info(
+                "api_request_success",
+                endpoint=endpoint,
+                cursor=cursor,
+                duration_ms=round(duration_ms, 2),
+                game_count=len(response.data),
+                rate_budget_remaining=round(self._limiter.remaining(), 1),
+            )
+            return response
+
+        except Exception as e:
+            duration_ms = (time.perf_counter() - start_time) * 1000
+            error_type = type(e).__name__
+
+            logger.error(
+                "api_request_failed",
+                endpoint=endpoint,
+                cursor=cursor,
+                duration_ms=round(duration_ms, 2),
+                error_type=error_type,
+                error_message=str(e),
+            )
+            raise
+
+    async def fetch_box_scores_by_date(
+        self, game_date: date, priority: Priority = Priority.SCHEDULE
+    ):
         """Fetch box scores for a specific date (includes live scores)."""
         start_time = time.perf_counter()
         endpoint = "box_scores.get_by_date"
@@ -81,7 +270,10 @@ class BalldontlieProvider:
         )
 
         try:
-            response = self._api.nba.box_scores.get_by_date(date=game_date.isoformat())
+            content = await self._get_raw(
+                "nba/v1/box_scores", {"date": game_date.isoformat()}, priority
+            )
+            response = ListResponse[NBABoxScore].model_validate_json(content)
             duration_ms = (time.perf_counter() - start_time) * 1000
             game_count = len(response.data) if hasattr(response, "data") else 0
 
@@ -91,6 +283,7 @@ class BalldontlieProvider:
                 date=game_date.isoformat(),
                 duration_ms=round(duration_ms, 2),
                 game_count=game_count,
+                rate_budget_remaining=round(self._limiter.remaining(), 1),
             )
             return response
 
@@ -108,7 +301,7 @@ class BalldontlieProvider:
             )
             raise
 
-    def fetch_live_box_scores(self):
+    async def fetch_live_box_scores(self, priority: Priority = Priority.LIVE):
         """Fetch live box scores for games currently in progress."""
         start_time = time.perf_counter()
         endpoint = "box_scores.get_live"
@@ -116,7 +309,8 @@ class BalldontlieProvider:
         logger.debug("api_request_start", endpoint=endpoint)
 
         try:
-            response = self._api.nba.box_scores.get_live()
+            content = await self._get_raw("nba/v1/box_scores/live", None, priority)
+            response = ListResponse[NBABoxScore].model_validate_json(content)
             duration_ms = (time.perf_counter() - start_time) * 1000
             game_count = len(response.data) if hasattr(response, "data") else 0
 
@@ -125,6 +319,7 @@ class BalldontlieProvider:
                 endpoint=endpoint,
                 duration_ms=round(duration_ms, 2),
                 game_count=game_count,
+                rate_budget_remaining=round(self._limiter.remaining(), 1),
             )
             return response
 
@@ -141,28 +336,113 @@ class BalldontlieProvider:
             )
             raise
 
+    async def fetch_games_by_date_raw(
+        self, game_date: date, priority: Priority = Priority.SCHEDULE
+    ) -> bytes:
+        """fetch_games_by_date's JSON body, undecoded."""
+        return await self._fetch_raw(
+            "games.list",
+            "nba/v1/games",
+            {"dates[]": game_date.isoformat(), "per_page": 100},
+            priority,
+            date=game_date.isoformat(),
+        )
+
+    async def fetch_box_scores_by_date_raw(
+        self, game_date: date, priority: Priority = Priority.SCHEDULE
+    ) -> bytes:
+        """fetch_box_scores_by_date's JSON body, undecoded."""
+        return await self._fetch_raw(
+            "box_scores.get_by_date",
+            "nba/v1/box_scores",
+            {"date": game_date.isoformat()},
+            priority,
+            date=game_date.isoformat(),
+        )
+
+    async def fetch_games_page_raw(
+        self,
+        *,
+        seasons: list[int] | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        cursor: int | None = None,
+        per_page: int = 100,
+        priority: Priority = Priority.BACKFILL,
+    ) -> bytes:
+        """fetch_games_page's JSON body, undecoded."""
+        return await self._fetch_raw(
+            "games.list",
+            "nba/v1/games",
+            _games_page_params(seasons, start_date, end_date, cursor, per_page),
+            priority,
+            cursor=cursor,
+        )
 
-@lru_cache
-def get_balldontlie_api() -> BalldontlieAPI:
-    """
-    App-wide singleton for the balldontlie API client.
-    Cached to reuse HTTP connection pool across requests.
-    """
-    if not settings.balldontlie_api_key:
-        raise ValueError(
-            "BALLDONTLIE_API_KEY not set. "
-            "Add it to 1Password (local section) and run 'task env'"
+    async def fetch_live_box_scores_raw(
+        self, priority: Priority = Priority.LIVE
+    ) -> bytes:
+        """fetch_live_box_scores's JSON body, undecoded."""
+        return await self._fetch_raw(
+            "box_scores.get_live", "nba/v1/box_scores/live", None, priority
         )
-    return BalldontlieAPI(api_key=settings.balldontlie_api_key)
+
+
+def _games_page_params(
+    seasons: list[int] | None,
+    start_date: date | None,
+    end_date: date | None,
+    cursor: int | None,
+    per_page: int,
+) -> dict[str, Any]:
+    params: dict[str, Any] = {"per_page": per_page}
+    if seasons:
+        params["seasons[]"] = [str(s) for s in seasons]
+    if start_date:
+        params["start_date"] = start_date.isoformat()
+    if end_date:
+        params["end_date"] = end_date.isoformat()
+    if cursor is not None:
+        params["cursor"] = cursor
+    return params
 
 
 def get_balldontlie_provider(
-    api: Annotated[BalldontlieAPI, Depends(get_balldontlie_api)],
+    api: Annotated[NBAApiService, Depends(get_nba_api_service)],
 ) -> BalldontlieProvider:
-    """Factory for BalldontlieProvider with injected API client."""
+    """Factory for BalldontlieProvider with the shared async API client."""
     return BalldontlieProvider(api)
 
 
+def get_rate_limit_stats() -> dict[str, object]:
+    """Remaining upstream budget and queue state, for monitoring."""
+    return rate_limiter.stats()
+
+
+@registry.collector
+def _rate_limit_metrics():
+    stats = rate_limiter.stats()
+    yield Family(
+        "rate_limit_tokens_remaining", "gauge", "Upstream budget tokens available"
+    ).add(stats["remaining"])
+    yield Family("rate_limit_capacity", "gauge", "Upstream budget burst capacity").add(
+        stats["capacity"]
+    )
+    for name, kind, help in (
+        ("granted", "counter", "Upstream budget tokens spent, by priority"),
+        ("timeouts", "counter", "Callers that gave up waiting for a token"),
+        ("waiting", "gauge", "Callers queued for a token right now"),
+    ):
+        family = Family(
+            f"rate_limit_{name}_total" if kind == "counter" else f"rate_limit_{name}",
+            kind,
+            help,
+        )
+        for priority, value in stats[name].items():
+            family.add(value, priority=priority)
+        yield family
+
+
 # Type alias for cleaner router signatures
 BalldontlieProviderDep = Annotated[
     BalldontlieProvider, Depends(get_balldontlie_provider)
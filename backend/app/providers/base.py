@@ -0,0 +1,71 @@
+"""
+The interface GameService fetches through.
+
+Every backend returns balldontlie-shaped JSON bytes, whatever its real
+upstream looks like, so the decoder, the derived box score ids and the
+live merge don't care which provider answered (see nba_cdn_provider.py).
+"""
+
+from contextvars import ContextVar
+from datetime import date
+from typing import Protocol
+
+from app.core.rate_limit import Priority
+
+
+class UnsupportedRequestError(Exception):
+    """A provider can't serve this request at all - not an upstream failure."""
+
+
+class UpstreamTiming:
+    """
+    When a call left our own rate limiter, and how long it then spent on the
+    wire - so hedging and latency windows measure the upstream, not queueing
+    for our budget. Filled in by BalldontlieProvider._get_raw (and so every
+    provider built on it) for whoever set `upstream_timing` in the task.
+    """
+
+    def __init__(self):
+        self.sent_at: float | None = None  # time.perf_counter()
+        self.seconds = 0.0
+
+
+upstream_timing: ContextVar[UpstreamTiming | None] = ContextVar(
+    "upstream_timing", default=None
+)
+
+
+# Endpoints, as named in failover metrics and GameProvider.endpoints
+BOX_SCORES = "box_scores.get_by_date"
+LIVE_BOX_SCORES = "box_scores.get_live"
+GAMES = "games.list"
+GAMES_PAGE = "games.page"
+
+
+class GameProvider(Protocol):
+    name: str
+    # Endpoints this provider can serve at all (None = every one)
+    endpoints: frozenset[str] | None
+
+    async def fetch_box_scores_by_date_raw(
+        self, game_date: date, priority: Priority = Priority.SCHEDULE
+    ) -> bytes: ...
+
+    async def fetch_live_box_scores_raw(
+        self, priority: Priority = Priority.LIVE
+    ) -> bytes: ...
+
+    async def fetch_games_by_date_raw(
+        self, game_date: date, priority: Priority = Priority.SCHEDULE
+    ) -> bytes: ...
+
+    async def fetch_games_page_raw(
+        self,
+        *,
+        seasons: list[int] | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        cursor: int | None = None,
+        per_page: int = 100,
+        priority: Priority = Priority.BACKFILL,
+    ) -> bytes: ...
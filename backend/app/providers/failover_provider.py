@@ -0,0 +1,397 @@
+"""
+Failover across game providers, with hedged requests and circuit breakers.
+
+Backends are tried in order (balldontlie, then the NBA CDN):
+- a call goes to the first backend whose circuit isn't open; if that call
+  fails, the next backend is called straight away
+- if it's only slow - still waiting on the upstream past that backend's
+  p95 latency for the endpoint - the same call also goes to the next
+  backend and the first answer wins (the other call is cancelled). The tail
+  is then about p95 plus the secondary's latency, instead of the primary's
+  full read timeout followed by a serial fallback
+- each backend has a circuit breaker per endpoint (see
+  core/circuit_breaker.py): after CIRCUIT_FAILURE_THRESHOLD consecutive
+  failures it isn't called for CIRCUIT_RESET_SECONDS, so a dead upstream
+  costs no budget and no timeouts. One endpoint failing (say /box_scores on
+  a plan without it) leaves the backend's other endpoints alone
+
+Latencies and the hedge clock only count time on the wire: a call queued in
+our own rate limiter isn't slow upstream, and hedging it would spend the
+secondary's budget for nothing (see UpstreamTiming in base.py).
+
+Only backends offering the endpoint are tried (the CDN has no /games), and
+one raising UnsupportedRequestError is skipped, not counted as a failure;
+neither are 4xx answers, which say the upstream is up but won't serve this
+request (a 401 from /box_scores is a plan-tier restriction, not an outage).
+Breakers and latency windows live at module level, like the rate limiters,
+because providers are built per request.
+"""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from datetime import date
+from typing import Annotated
+
+from balldontlie.exceptions import (
+    AuthenticationError,
+    BallDontLieException,
+    NotFoundError,
+    RateLimitError,
+    ValidationError,
+)
+from fastapi import Depends
+
+from app.core.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.core.logging import get_logger
+from app.core.metrics import Family, registry
+from app.core.rate_limit import Priority, RateLimitTimeout
+from app.providers.balldontlie_provider import (
+    BalldontlieProvider,
+    get_balldontlie_provider,
+)
+from app.providers.base import (
+    BOX_SCORES,
+    GAMES,
+    GAMES_PAGE,
+    LIVE_BOX_SCORES,
+    GameProvider,
+    UnsupportedRequestError,
+    UpstreamTiming,
+    upstream_timing,
+)
+from app.providers.nba_cdn_provider import NBACdnProvider
+from app.services.nba_api import get_nba_cdn_service
+
+logger = get_logger(__name__)
+
+# Hedge once a call has run longer than this quantile of the backend's
+# recent successful calls to the same endpoint
+HEDGE_QUANTILE = 0.95
+LATENCY_WINDOW_SIZE = 200
+# Until a window has this many samples, hedge after HEDGE_DEFAULT_SECONDS
+HEDGE_MIN_SAMPLES = 20
+HEDGE_DEFAULT_SECONDS = 1.0
+# Floor on the hedge delay, so a very fast p95 doesn't double every call
+HEDGE_MIN_SECONDS = 0.05
+
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_SECONDS = 30.0
+
+# Errors that say nothing about the upstream's health: requests a backend
+# can't serve, our own budget queue, and 4xx answers - the upstream is up,
+# it just won't serve this request
+_NOT_FAILURES = (
+    UnsupportedRequestError,
+    RateLimitTimeout,
+    AuthenticationError,
+    NotFoundError,
+    RateLimitError,
+    ValidationError,
+)
+
+
+def _is_failure(error: Exception) -> bool:
+    """Whether `error` counts against the endpoint's circuit."""
+    if isinstance(error, _NOT_FAILURES):
+        return False
+    # Any other 4xx (403, 422, ...) comes back as the SDK's base exception
+    status = getattr(error, "status_code", None)
+    return not (
+        isinstance(error, BallDontLieException)
+        and status is not None
+        and 400 <= status < 500
+    )
+
+
+provider_requests = registry.counter(
+    "provider_requests_total",
+    "Calls per game provider: ok, error, unsupported, or cancelled (lost a "
+    "hedged race)",
+    labels=("provider", "result"),
+)
+provider_hedges = registry.counter(
+    "provider_hedged_total",
+    "Calls also sent to the next provider because the first ran past its p95",
+    labels=("endpoint",),
+)
+provider_failovers = registry.counter(
+    "provider_failovers_total",
+    "Calls retried on the next provider after the first one failed",
+    labels=("endpoint",),
+)
+
+
+class LatencyWindow:
+    """Latencies of the last LATENCY_WINDOW_SIZE successful calls."""
+
+    def __init__(self, size: int = LATENCY_WINDOW_SIZE):
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def quantile(self, q: float) -> float | None:
+        """None until there are HEDGE_MIN_SAMPLES samples."""
+        if len(self._samples) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+_breakers: dict[tuple[str, str], CircuitBreaker] = {}
+_latencies: dict[tuple[str, str], LatencyWindow] = {}
+
+
+def get_breaker(provider: str, endpoint: str) -> CircuitBreaker:
+    breaker = _breakers.get((provider, endpoint))
+    if breaker is None:
+        breaker = _breakers[(provider, endpoint)] = CircuitBreaker(
+            f"{provider}:{endpoint}", CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_SECONDS
+        )
+    return breaker
+
+
+def hedge_delay(provider: str, endpoint: str) -> float:
+    """Seconds to wait on `provider` before also asking the next one."""
+    window = _latencies.get((provider, endpoint))
+    p95 = window.quantile(HEDGE_QUANTILE) if window is not None else None
+    return HEDGE_DEFAULT_SECONDS if p95 is None else max(p95, HEDGE_MIN_SECONDS)
+
+
+class FailoverProvider:
+    """GameProvider over several backends, in order of preference."""
+
+    endpoints = None
+
+    def __init__(self, backends: list[GameProvider]):
+        self.backends = backends
+        self.name = "+".join(b.name for b in backends)
+
+    async def fetch_box_scores_by_date_raw(
+        self, game_date: date, priority: Priority = Priority.SCHEDULE
+    ) -> bytes:
+        return await self._call(
+            BOX_SCORES, lambda p: p.fetch_box_scores_by_date_raw(game_date, priority)
+        )
+
+    async def fetch_live_box_scores_raw(
+        self, priority: Priority = Priority.LIVE
+    ) -> bytes:
+        return await self._call(
+            LIVE_BOX_SCORES, lambda p: p.fetch_live_box_scores_raw(priority)
+        )
+
+    async def fetch_games_by_date_raw(
+        self, game_date: date, priority: Priority = Priority.SCHEDULE
+    ) -> bytes:
+        return await self._call(
+            GAMES, lambda p: p.fetch_games_by_date_raw(game_date, priority)
+        )
+
+    async def fetch_games_page_raw(
+        self,
+        *,
+        seasons: list[int] | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        cursor: int | None = None,
+        per_page: int = 100,
+        priority: Priority = Priority.BACKFILL,
+    ) -> bytes:
+        return await self._call(
+            GAMES_PAGE,
+            lambda p: p.fetch_games_page_raw(
+                seasons=seasons,
+                start_date=start_date,
+                end_date=end_date,
+                cursor=cursor,
+                per_page=per_page,
+                priority=priority,
+            ),
+        )
+
+    async def _call(
+        self, endpoint: str, fetch: Callable[[GameProvider], Awaitable[bytes]]
+    ) -> bytes:
+        """
+        First successful answer from the backends, hedging a slow call once
+        and failing over on errors. Raises the first real upstream error if
+        every backend fails.
+        """
+        waiting = deque(
+            b for b in self.backends if b.endpoints is None or endpoint in b.endpoints
+        )
+        if not waiting:
+            raise UnsupportedRequestError(f"No provider serves {endpoint}")
+
+        running: dict[asyncio.Task, tuple[GameProvider, UpstreamTiming]] = {}
+        errors: list[Exception] = []
+        hedged = False
+
+        def launch() -> GameProvider | None:
+            """Start the next backend whose circuit admits the call."""
+            while waiting:
+                backend = waiting.popleft()
+                # Asked only at launch: a half-open circuit admits one probe
+                breaker = get_breaker(backend.name, endpoint)
+                if breaker.allow():
+                    timing = UpstreamTiming()
+                    task = asyncio.ensure_future(
+                        self._attempt(backend, endpoint, fetch, timing)
+                    )
+                    # Cancelled (even before it started): no verdict either way
+                    task.add_done_callback(
+                        lambda t, b=breaker: b.release() if t.cancelled() else None
+                    )
+                    running[task] = (backend, timing)
+                    return backend
+            return None
+
+        if launch() is None:
+            raise CircuitOpenError(f"Every provider's circuit is open ({self.name})")
+        try:
+            while running:
+                timeout = None
+                if waiting and not hedged:
+                    backend, timing = next(iter(running.values()))
+                    delay = hedge_delay(backend.name, endpoint)
+                    # The hedge clock starts once the call is on the wire
+                    timeout = delay
+                    if timing.sent_at is not None:
+                        timeout -= time.perf_counter() - timing.sent_at
+                done, _ = await asyncio.wait(
+                    running,
+                    timeout=max(timeout, 0) if timeout is not None else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    if (
+                        timing.sent_at is None
+                        or time.perf_counter() - timing.sent_at < delay
+                    ):
+                        continue  # still queued for our own budget
+                    hedged = True
+                    if launch() is not None:
+                        provider_hedges.inc(endpoint)
+                        logger.info(
+                            "provider_hedged",
+                            endpoint=endpoint,
+                            slow_provider=backend.name,
+                            after_ms=round(delay * 1000, 1),
+                        )
+                    continue
+
+                winner = None
+                for task in done:
+                    running.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        winner = winner or task
+                    else:
+                        errors.append(error)
+                if winner is not None:
+                    return winner.result()
+                if not running and (backend := launch()) is not None:
+                    provider_failovers.inc(endpoint)
+                    logger.warning(
+                        "provider_failover",
+                        endpoint=endpoint,
+                        error_type=type(errors[-1]).__name__,
+                        next_provider=backend.name,
+                    )
+        finally:
+            for task in running:
+                task.cancel()
+
+        raise next(
+            (e for e in errors if not isinstance(e, UnsupportedRequestError)),
+            errors[0],
+        )
+
+    async def _attempt(
+        self,
+        backend: GameProvider,
+        endpoint: str,
+        fetch: Callable[[GameProvider], Awaitable[bytes]],
+        timing: UpstreamTiming,
+    ) -> bytes:
+        """
+        One backend call (in its own task), feeding the endpoint's breaker
+        and latency window.
+        """
+        upstream_timing.set(timing)
+        breaker = get_breaker(backend.name, endpoint)
+        try:
+            content = await fetch(backend)
+        except asyncio.CancelledError:
+            provider_requests.inc(backend.name, "cancelled")
+            raise
+        except UnsupportedRequestError:
+            provider_requests.inc(backend.name, "unsupported")
+            breaker.release()
+            raise
+        except Exception as e:
+            provider_requests.inc(backend.name, "error")
+            if _is_failure(e):
+                breaker.record_failure()
+            else:
+                breaker.release()
+            raise
+        window = _latencies.get((backend.name, endpoint))
+        if window is None:
+            window = _latencies[(backend.name, endpoint)] = LatencyWindow()
+        window.observe(timing.seconds)
+        breaker.record_success()
+        provider_requests.inc(backend.name, "ok")
+        return content
+
+
+def get_provider_stats() -> dict[str, object]:
+    """Circuit state and hedge delay per provider and endpoint, for monitoring."""
+    return {
+        "circuits": {
+            f"{provider}:{endpoint}": b.stats()
+            for (provider, endpoint), b in _breakers.items()
+        },
+        "hedge_delay_ms": {
+            f"{provider}:{endpoint}": round(hedge_delay(provider, endpoint) * 1000, 1)
+            for provider, endpoint in _latencies
+        },
+    }
+
+
+@registry.collector
+def _provider_metrics():
+    circuits = Family(
+        "provider_circuit_state", "gauge", "0 closed, 1 half-open, 2 open"
+    )
+    for (provider, endpoint), breaker in _breakers.items():
+        circuits.add(int(breaker.state), provider=provider, endpoint=endpoint)
+    yield circuits
+    delays = Family(
+        "provider_hedge_delay_seconds",
+        "gauge",
+        "How long a call waits before being hedged (recent p95)",
+    )
+    for provider, endpoint in _latencies:
+        delays.add(
+            hedge_delay(provider, endpoint), provider=provider, endpoint=endpoint
+        )
+    yield delays
+
+
+def get_game_provider(
+    balldontlie: Annotated[BalldontlieProvider, Depends(get_balldontlie_provider)],
+) -> GameProvider:
+    """balldontlie, failing over to the NBA CDN unless that's disabled."""
+    backends: list[GameProvider] = [balldontlie]
+    cdn = get_nba_cdn_service()
+    if cdn is not None:
+        backends.append(NBACdnProvider(cdn))
+    return FailoverProvider(backends)
+
+
+# Type alias for cleaner router signatures
+GameProviderDep = Annotated[GameProvider, Depends(get_game_provider)]
@@ -0,0 +1,213 @@
+"""
+Provider for the NBA live CDN (cdn.nba.com), the failover for balldontlie.
+
+The CDN has one endpoint we can use: today's scoreboard, a keyless JSON
+file with every game on the current slate and its status, clock and score.
+Both box score calls are served from it, translated into balldontlie's box
+score shape:
+- teams are mapped by tricode onto balldontlie's ids, cities and names, so
+  the derived box score ids (date + team ids) and the Games built from them
+  are identical whichever provider answered, and failing over mid-game
+  doesn't look like every game changed
+- status, period and clock are rewritten as balldontlie's status strings
+
+/games and season pages aren't offered at all (`endpoints`). Box scores
+for any date but the scoreboard's raise UnsupportedRequestError, which the
+failover provider skips instead of counting as a failure. The scoreboard
+rolls over to the new day some time after midnight Eastern, and until then
+the new date is unsupported too.
+
+Calls go through BalldontlieProvider's request path (budget, metrics,
+logging, recording) under the scoreboard's own path and a separate budget.
+"""
+
+import json
+import re
+from typing import Any, NotRequired, TypedDict
+
+from pydantic import TypeAdapter
+
+from app.core.logging import get_logger
+from app.core.rate_limit import Priority, TokenBucket
+from app.providers.balldontlie_provider import BalldontlieProvider
+from app.providers.base import BOX_SCORES, LIVE_BOX_SCORES, UnsupportedRequestError
+from app.services.game_decoder import period_name
+from app.services.nba_api import NBAApiService
+
+logger = get_logger(__name__)
+
+SCOREBOARD_PATH = "static/json/liveData/scoreboard/todaysScoreboard_00.json"
+
+# The CDN's limits are generous; this only keeps hedged calls in check
+CDN_RATE_LIMIT_PER_MINUTE = 120
+CDN_RATE_LIMIT_BURST = 10
+
+cdn_rate_limiter = TokenBucket(
+    rate_per_minute=CDN_RATE_LIMIT_PER_MINUTE,
+    capacity=CDN_RATE_LIMIT_BURST,
+    default_timeouts={
+        Priority.LIVE: 5.0,
+        Priority.SCHEDULE: 30.0,
+        Priority.BACKFILL: None,
+    },
+)
+
+# CDN gameStatus values
+SCHEDULED, IN_PROGRESS, FINAL = 1, 2, 3
+
+# Tricode -> balldontlie (team id, city, name)
+TEAMS: dict[str, tuple[int, str, str]] = {
+    "ATL": (1, "Atlanta", "Hawks"),
+    "BOS": (2, "Boston", "Celtics"),
+    "BKN": (3, "Brooklyn", "Nets"),
+    "CHA": (4, "Charlotte", "Hornets"),
+    "CHI": (5, "Chicago", "Bulls"),
+    "CLE": (6, "Cleveland", "Cavaliers"),
+    "DAL": (7, "Dallas", "Mavericks"),
+    "DEN": (8, "Denver", "Nuggets"),
+    "DET": (9, "Detroit", "Pistons"),
+    "GSW": (10, "Golden State", "Warriors"),
+    "HOU": (11, "Houston", "Rockets"),
+    "IND": (12, "Indiana", "Pacers"),
+    "LAC": (13, "LA", "Clippers"),
+    "LAL": (14, "Los Angeles", "Lakers"),
+    "MEM": (15, "Memphis", "Grizzlies"),
+    "MIA": (16, "Miami", "Heat"),
+    "MIL": (17, "Milwaukee", "Bucks"),
+    "MIN": (18, "Minnesota", "Timberwolves"),
+    "NOP": (19, "New Orleans", "Pelicans"),
+    "NYK": (20, "New York", "Knicks"),
+    "OKC": (21, "Oklahoma City", "Thunder"),
+    "ORL": (22, "Orlando", "Magic"),
+    "PHI": (23, "Philadelphia", "76ers"),
+    "PHX": (24, "Phoenix", "Suns"),
+    "POR": (25, "Portland", "Trail Blazers"),
+    "SAC": (26, "Sacramento", "Kings"),
+    "SAS": (27, "San Antonio", "Spurs"),
+    "TOR": (28, "Toronto", "Raptors"),
+    "UTA": (29, "Utah", "Jazz"),
+    "WAS": (30, "Washington", "Wizards"),
+}
+
+# Game clock as an ISO 8601 duration, e.g. "PT05M23.00S"
+_CLOCK = re.compile(r"PT(\d+)M(\d+)(?:\.\d+)?S")
+
+
+class CdnTeam(TypedDict):
+    teamTricode: str
+    score: NotRequired[int | None]
+
+
+class CdnGame(TypedDict):
+    gameStatus: int
+    gameStatusText: NotRequired[str | None]
+    period: NotRequired[int | None]
+    gameClock: NotRequired[str | None]
+    gameTimeUTC: NotRequired[str | None]
+    homeTeam: CdnTeam
+    awayTeam: CdnTeam
+
+
+class Scoreboard(TypedDict):
+    gameDate: str
+    games: list[CdnGame]
+
+
+class _ScoreboardBody(TypedDict):
+    scoreboard: Scoreboard
+
+
+_scoreboard_adapter = TypeAdapter(_ScoreboardBody)
+
+
+def decode_scoreboard(raw: bytes) -> Scoreboard:
+    """Validate a todaysScoreboard body, keeping only the fields we map."""
+    return _scoreboard_adapter.validate_json(raw)["scoreboard"]
+
+
+def box_score_from_cdn(game: CdnGame, game_date: str) -> dict[str, Any] | None:
+    """A scoreboard game as a balldontlie box score (None: unknown team)."""
+    home = _team(game["homeTeam"])
+    visitor = _team(game["awayTeam"])
+    if home is None or visitor is None:
+        return None  # All-Star and exhibition teams aren't in balldontlie
+
+    period = game.get("period") or 0
+    if game["gameStatus"] == FINAL:
+        status, clock = "Final", "Final"
+    elif game["gameStatus"] == IN_PROGRESS:
+        if "half" in (game.get("gameStatusText") or "").lower():
+            status = "Halftime"
+        elif period > 4:
+            status = period_name(period)
+        else:
+            status = f"{period_name(period)} Qtr"
+        clock = _clock(game.get("gameClock"))
+    else:
+        # Scheduled: balldontlie carries the tipoff in the status field
+        status, period, clock = game.get("gameTimeUTC") or "", 0, None
+
+    live = game["gameStatus"] != SCHEDULED
+    return {
+        "date": game_date,
+        "status": status,
+        "period": period,
+        "time": clock,
+        "home_team_score": (game["homeTeam"].get("score") or 0) if live else 0,
+        "visitor_team_score": (game["awayTeam"].get("score") or 0) if live else 0,
+        "home_team": home,
+        "visitor_team": visitor,
+    }
+
+
+def _team(team: CdnTeam) -> dict[str, Any] | None:
+    known = TEAMS.get(team["teamTricode"])
+    if known is None:
+        return None
+    team_id, city, name = known
+    return {
+        "id": team_id,
+        "city": city,
+        "name": name,
+        "abbreviation": team["teamTricode"],
+    }
+
+
+def _clock(raw: str | None) -> str:
+    match = _CLOCK.fullmatch(raw or "")
+    return f"{int(match[1])}:{match[2]}" if match else ""
+
+
+class NBACdnProvider(BalldontlieProvider):
+    """Today's box scores from the NBA CDN scoreboard, in balldontlie's shape."""
+
+    name = "nba_cdn"
+    endpoints = frozenset({BOX_SCORES, LIVE_BOX_SCORES})
+
+    def __init__(self, api: NBAApiService, limiter: TokenBucket = cdn_rate_limiter):
+        super().__init__(api, limiter)
+
+    async def _get_raw(
+        self, path: str, params: dict[str, Any] | None, priority: Priority
+    ) -> bytes:
+        if path == "nba/v1/box_scores/live":
+            game_date, live_only = None, True
+        elif path == "nba/v1/box_scores" and params:
+            game_date, live_only = params["date"], False
+        else:
+            raise UnsupportedRequestError(f"The NBA CDN has no equivalent of {path}")
+
+        scoreboard = decode_scoreboard(
+            await super()._get_raw(SCOREBOARD_PATH, None, priority)
+        )
+        if game_date is not None and scoreboard["gameDate"] != game_date:
+            raise UnsupportedRequestError(
+                f"The NBA CDN scoreboard is for {scoreboard['gameDate']}, "
+                f"not {game_date}"
+            )
+        box_scores = [
+            box_score_from_cdn(game, scoreboard["gameDate"])
+            for game in scoreboard["games"]
+            if not live_only or game["gameStatus"] == IN_PROGRESS
+        ]
+        return json.dumps({"data": [b for b in box_scores if b is not None]}).encode()
@@ -0,0 +1,125 @@
+"""
+Recordings of upstream traffic, for replaying a game night offline.
+
+A recording is a JSON lines file (gzip-compressed if the name ends in .gz).
+Each process that records appends a header line followed by one line per
+upstream call:
+
+    {"format": 1, "started_at": "2025-01-14T00:02:11+00:00"}
+    {"t": 0.0, "path": "nba/v1/box_scores", "params": {...}, "body": {...}}
+    {"t": 5.013, "path": "nba/v1/box_scores/live", "params": null,
+     "error": {"type": "ServerError", "message": "...", "status_code": 502}}
+
+`t` is seconds since that process's header, so a restart mid-recording
+just starts a new segment and the gap is kept on replay. Writes are
+synchronous on the event loop; a few ms per call is fine at poll rates.
+"""
+
+import gzip
+import json
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, TextIO
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+RECORDING_FORMAT = 1
+
+
+def _open(path: Path, mode: str) -> TextIO:
+    if path.suffix == ".gz":
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class ProviderRecorder:
+    """Appends every upstream response (or error) to a recording file."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = _open(self.path, "a")
+        self._started = time.monotonic()
+        self.calls = 0
+        self._write(
+            {"format": RECORDING_FORMAT, "started_at": datetime.now(UTC).isoformat()}
+        )
+
+    def _write(self, entry: dict[str, Any]) -> None:
+        self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self._file.flush()
+
+    def record(
+        self,
+        path: str,
+        params: dict[str, Any] | None,
+        body: bytes | dict[str, Any] | None = None,
+        error: Exception | None = None,
+    ) -> None:
+        entry: dict[str, Any] = {
+            "t": round(time.monotonic() - self._started, 3),
+            "path": path,
+            "params": params,
+        }
+        if error is not None:
+            entry["error"] = {
+                "type": type(error).__name__,
+                "message": str(error),
+                "status_code": getattr(error, "status_code", None),
+            }
+        try:
+            if error is None:
+                entry["body"] = json.loads(body) if isinstance(body, bytes) else body
+            self._write(entry)
+            self.calls += 1
+        except (OSError, TypeError, ValueError) as e:
+            # Never let a full disk break live refreshes
+            logger.warning("provider_record_failed", path=path, error_message=str(e))
+
+    def close(self) -> None:
+        self._file.close()
+        logger.info("provider_recording_closed", path=str(self.path), calls=self.calls)
+
+
+@dataclass(frozen=True, slots=True)
+class RecordedCall:
+    at: float  # seconds since the first recorded call
+    path: str
+    params: dict[str, Any] | None
+    body: dict[str, Any] | None
+    error: dict[str, Any] | None
+
+
+def load_recording(path: str | Path) -> list[RecordedCall]:
+    """Every call in a recording, in time order across segments."""
+    raw: list[tuple[float, dict[str, Any]]] = []
+    segment_start = 0.0
+    with _open(Path(path), "r") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if "format" in entry:
+                if entry["format"] != RECORDING_FORMAT:
+                    raise ValueError(f"Unsupported recording format {entry['format']}")
+                segment_start = datetime.fromisoformat(entry["started_at"]).timestamp()
+                continue
+            raw.append((segment_start + entry["t"], entry))
+    if not raw:
+        return []
+    raw.sort(key=lambda item: item[0])
+    first = raw[0][0]
+    return [
+        RecordedCall(
+            at=at - first,
+            path=entry["path"],
+            params=entry.get("params"),
+            body=entry.get("body"),
+            error=entry.get("error"),
+        )
+        for at, entry in raw
+    ]
@@ -0,0 +1,125 @@
+"""
+Provider that serves a recorded game night instead of calling balldontlie.
+
+Set PROVIDER_REPLAY_PATH to a recording (made with PROVIDER_RECORD_PATH,
+see recording.py) and the app resolves BalldontlieProviderDep and the
+poller's provider to a ReplayProvider. The cache, coalescing, live-merge
+and push paths then run against a real night's score changes, offline.
+
+The replay clock starts at the first upstream call and runs
+PROVIDER_REPLAY_SPEED times real time (1x-100x is the useful range; the
+poller still sleeps real seconds, so at 60x a 5 s live poll skips 5 min of
+the recording). Each call gets the latest response recorded for its
+endpoint at or before the replay clock. Request params such as the date
+are ignored, since the recorded night isn't today. Recorded errors are
+raised again as the same exception types. After the last recorded call the
+final responses keep being served.
+"""
+
+import bisect
+import json
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import balldontlie.exceptions as upstream_errors
+from balldontlie.exceptions import BallDontLieException, NotFoundError
+
+from app.core.logging import get_logger
+from app.core.rate_limit import Priority, TokenBucket
+from app.providers.balldontlie_provider import (
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_PER_MINUTE,
+    BalldontlieProvider,
+)
+from app.providers.recording import RecordedCall, load_recording
+
+logger = get_logger(__name__)
+
+
+class ReplayProvider(BalldontlieProvider):
+    """BalldontlieProvider whose upstream is a recording."""
+
+    def __init__(
+        self,
+        calls: list[RecordedCall],
+        speed: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if speed <= 0:
+            raise ValueError("Replay speed must be positive")
+        # Never touches the network, and mustn't spend the shared budget
+        super().__init__(
+            api=None,
+            limiter=TokenBucket(RATE_LIMIT_PER_MINUTE, RATE_LIMIT_BURST),
+        )
+        self.speed = speed
+        self._clock = clock
+        self._started: float | None = None
+        self._finished_logged = False
+        self.served = 0
+        self.duration = calls[-1].at if calls else 0.0
+        self._times: dict[str, list[float]] = {}
+        self._calls: dict[str, list[RecordedCall]] = {}
+        # Last body served per path, encoded once (bodies repeat for many polls)
+        self._encoded: dict[str, tuple[RecordedCall, bytes]] = {}
+        for call in calls:
+            self._times.setdefault(call.path, []).append(call.at)
+            self._calls.setdefault(call.path, []).append(call)
+
+    @classmethod
+    def load(cls, path: str | Path, speed: float = 1.0) -> "ReplayProvider":
+        calls = load_recording(path)
+        logger.info(
+            "provider_replay_loaded",
+            path=str(path),
+            calls=len(calls),
+            duration_seconds=round(calls[-1].at, 1) if calls else 0,
+            speed=speed,
+        )
+        return cls(calls, speed)
+
+    def position(self) -> float:
+        """Seconds into the recording (0 until the first call)."""
+        if self._started is None:
+            return 0.0
+        return (self._clock() - self._started) * self.speed
+
+    async def _get_raw(
+        self, path: str, params: dict[str, Any] | None, priority: Priority
+    ) -> bytes:
+        if self._started is None:
+            self._started = self._clock()
+        position = self.position()
+        times = self._times.get(path)
+        if not times:
+            raise NotFoundError(f"No recorded responses for {path}", 404, {})
+        call = self._calls[path][max(bisect.bisect_right(times, position) - 1, 0)]
+        self.served += 1
+
+        if position > self.duration and not self._finished_logged:
+            self._finished_logged = True
+            logger.info("provider_replay_finished", served=self.served)
+
+        if call.error is not None:
+            error_cls = getattr(upstream_errors, call.error["type"], None)
+            if not (
+                isinstance(error_cls, type)
+                and issubclass(error_cls, BallDontLieException)
+            ):
+                error_cls = BallDontLieException
+            raise error_cls(call.error["message"], call.error.get("status_code"), {})
+        cached = self._encoded.get(path)
+        if cached is None or cached[0] is not call:
+            cached = self._encoded[path] = (call, json.dumps(call.body).encode())
+        return cached[1]
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "speed": self.speed,
+            "position_seconds": round(self.position(), 1),
+            "duration_seconds": round(self.duration, 1),
+            "served": self.served,
+            "finished": self.position() > self.duration,
+        }
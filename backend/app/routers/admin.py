@@ -0,0 +1,90 @@
+"""
+Admin router - operator endpoints for diagnosing slow requests in production.
+
+Authenticated with X-Admin-Key (see verify_admin_key); disabled when
+ADMIN_API_KEY_HASH isn't set.
+"""
+
+import asyncio
+import threading
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from app.core.logging import get_logger
+from app.core.profiler import (
+    DEFAULT_INTERVAL_SECONDS,
+    MAX_DURATION_SECONDS,
+    SamplingProfiler,
+)
+from app.core.security import verify_admin_key
+from app.core.timing import timing_summary
+
+logger = get_logger(__name__)
+
+router = APIRouter(
+    dependencies=[Depends(verify_admin_key)],
+)
+
+# One profile at a time: concurrent samplers would skew each other's numbers
+_profile_lock = asyncio.Lock()
+
+
+@router.get("/timings")
+async def get_timings(recent: int = Query(5, ge=0, le=100)):
+    """
+    Per-stage timings of the traced hot paths.
+
+    `refresh` is the background slate refresh (upstream, decode, transform,
+    sort, predict, build, publish); `games_today` is GET /api/games/today
+    (snapshot, respond). Percentiles cover the last 256 traces of each;
+    `recent` returns that many of the latest traces in full.
+    """
+    return timing_summary(recent)
+
+
+@router.post("/profile", response_class=PlainTextResponse)
+async def profile(
+    seconds: float = Query(10.0, gt=0, le=MAX_DURATION_SECONDS),
+    interval_ms: float = Query(DEFAULT_INTERVAL_SECONDS * 1000, ge=1, le=1000),
+    all_threads: bool = False,
+    line_numbers: bool = False,
+):
+    """
+    Sample the running app's stacks for `seconds` and return them collapsed.
+
+    The body is flamegraph.pl / speedscope "collapsed stack" text. By
+    default only the event loop thread is sampled (that's where request
+    handling and refreshes run); `all_threads` includes the worker threads
+    too (persistence writes, model loads). Returns 409 while another
+    profile is running.
+    """
+    if _profile_lock.locked():
+        raise HTTPException(status_code=409, detail="A profile is already running")
+
+    async with _profile_lock:
+        profiler = SamplingProfiler(
+            interval=interval_ms / 1000,
+            thread_ids=None if all_threads else {threading.get_ident()},
+            line_numbers=line_numbers,
+        )
+        logger.info("profile_started", seconds=seconds, interval_ms=interval_ms)
+        profiler.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            await asyncio.to_thread(profiler.stop)
+        logger.info(
+            "profile_finished",
+            samples=profiler.samples,
+            stacks=len(profiler.stacks),
+            duration_seconds=round(profiler.duration, 3),
+        )
+
+    return PlainTextResponse(
+        profiler.collapsed(),
+        headers={
+            "X-Profile-Samples": str(profiler.samples),
+            "X-Profile-Duration": f"{profiler.duration:.3f}",
+        },
+    )
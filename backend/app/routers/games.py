@@ -2,11 +2,22 @@
 Games router - HTTP endpoints for game data.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 
 from app.core.security import verify_api_key
-from app.models.schemas import GameListResponse
-from app.services.game_service import GameServiceDep
+from app.core.timing import lap, trace
+from app.models.schemas import GameDeltaResponse, GameListResponse, GameRangeResponse
+from app.services.game_broadcaster import broadcaster
+from app.services.game_service import (
+    RANGE_MAX_DAYS,
+    GameServiceDep,
+    GamesUnavailableError,
+    get_games_since,
+    get_snapshot,
+)
 
 # All routes in this router require API key authentication
 router = APIRouter(
@@ -14,21 +25,132 @@ router = APIRouter(
 )
 
 
-@router.get("/today", response_model=GameListResponse)
-async def get_todays_games(service: GameServiceDep):
+@router.get("/today", response_model=GameListResponse | GameDeltaResponse)
+async def get_todays_games(
+    request: Request,
+    service: GameServiceDep,
+    since: int | None = None,
+):
     """
     Get today's NBA games with live scores.
 
     Returns games sorted by status: live first, then scheduled, then final.
-    Scores update on each request - frontend should poll every 30 seconds.
+    Served from the background poller's latest snapshot (refreshed every 5s
+    while games are live), so polling faster than that gains nothing.
+
+    The body is pre-serialized and pre-compressed per snapshot. Send the last
+    ETag in If-None-Match to get a 304 when nothing has changed.
+
+    Pass the last seen `version` as `since` to get a GameDeltaResponse with
+    only the games changed after it (empty when nothing changed). If `full`
+    is true the client's version was too old and it gets the whole slate.
+    """
+    with trace("games_today"):
+        try:
+            snapshot = await service.get_todays_snapshot()
+        except (ValueError, GamesUnavailableError) as e:
+            # Missing API key, or no snapshot published yet
+            raise HTTPException(status_code=503, detail=str(e))
+        except Exception as e:
+            raise HTTPException(
+                status_code=502,
+                detail=f"Failed to fetch games from NBA API: {e!s}",
+            )
+        lap("snapshot")
+        if since is not None:
+            body = get_games_since(snapshot, since)
+            lap("delta")
+        else:
+            body = snapshot.body
+        response = body.respond(request)
+        lap("respond")
+        return response
+
+
+@router.get("", response_model=GameListResponse)
+async def get_games_by_date(
+    request: Request,
+    service: GameServiceDep,
+    game_date: date | None = Query(None, alias="date"),
+):
+    """
+    NBA games for any date (YYYY-MM-DD, US Eastern; default today).
+
+    Today is the same slate as /today. Other dates are cached per date:
+    past dates whose games are all final are cached for good (and kept
+    across restarts), other dates for up to a few hours, so browsing the
+    schedule doesn't call upstream per viewer. Past dates carry no
+    predictions. Send If-None-Match to get a 304 when nothing changed.
     """
     try:
-        return service.get_todays_games()
-    except ValueError as e:
-        # Missing API key
+        if game_date is None:
+            body = (await service.get_todays_snapshot()).body
+        else:
+            body = await service.get_date_body(game_date)
+    except (ValueError, GamesUnavailableError) as e:
         raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=502,
             detail=f"Failed to fetch games from NBA API: {e!s}",
         )
+    return body.respond(request)
+
+
+@router.get("/range", response_model=GameRangeResponse)
+async def get_games_range(
+    request: Request,
+    service: GameServiceDep,
+    start: date,
+    end: date,
+):
+    """
+    Games for every date from `start` to `end` inclusive, keyed by date.
+
+    At most RANGE_MAX_DAYS (14) dates per call. Each date is served and
+    cached exactly as in /api/games?date=.
+    """
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    if (end - start).days + 1 > RANGE_MAX_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {RANGE_MAX_DAYS} dates per request",
+        )
+    try:
+        body = await service.get_range_body(start, end)
+    except (ValueError, GamesUnavailableError) as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=502,
+            detail=f"Failed to fetch games from NBA API: {e!s}",
+        )
+    return body.respond(request)
+
+
+@router.get("/stream")
+async def stream_games(service: GameServiceDep):
+    """
+    Live score updates as Server-Sent Events.
+
+    Sends the full slate once on connect ("slate" event, same body as
+    /today), then a "games" event with only the changed games each time the
+    poller publishes new scores. Idle connections get a heartbeat comment.
+    Clients that fall too far behind are disconnected and should reconnect.
+    """
+    try:
+        # Only waits for the first snapshot after startup
+        await service.get_todays_snapshot()
+    except (ValueError, GamesUnavailableError) as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    return StreamingResponse(
+        broadcaster.stream(lambda: get_snapshot().body.content),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Disable proxy buffering so events are flushed immediately
+            "X-Accel-Buffering": "no",
+        },
+    )
@@ -0,0 +1,70 @@
+"""
+Teams router - HTTP endpoints for team data.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+
+from app.core.security import verify_api_key
+from app.models.schemas import (
+    GameWithPrediction,
+    TeamGamesResponse,
+    TeamRating,
+    TeamRatingsResponse,
+)
+from app.services.game_service import (
+    GamesUnavailableError,
+    get_next_game,
+    get_team_games_body,
+    get_team_ratings,
+)
+
+# All routes in this router require API key authentication
+router = APIRouter(
+    dependencies=[Depends(verify_api_key)],
+)
+
+
+@router.get("/ratings", response_model=TeamRatingsResponse)
+async def list_team_ratings():
+    """Elo rating of every team, best first."""
+    return TeamRatingsResponse(ratings=get_team_ratings())
+
+
+@router.get("/{team_id}/rating", response_model=TeamRating)
+async def get_team_rating(team_id: int):
+    """Elo rating and league rank of one team."""
+    for rating in get_team_ratings():
+        if rating.team_id == team_id:
+            return rating
+    raise HTTPException(status_code=404, detail="No rating for this team yet")
+
+
+@router.get("/{team_id}/games", response_model=TeamGamesResponse)
+async def list_team_games(request: Request, team_id: int, opponent: int | None = None):
+    """
+    A team's games this season, oldest first (only those against
+    `opponent`, if given).
+
+    Served from the in-memory season schedule; today's games carry live
+    scores and predictions, the others none. Send If-None-Match to get a
+    304 when nothing changed.
+    """
+    try:
+        body = get_team_games_body(team_id, opponent)
+    except GamesUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    if body is None:
+        raise HTTPException(status_code=404, detail="Team is not on the schedule")
+    return body.respond(request)
+
+
+@router.get("/{team_id}/next-game", response_model=GameWithPrediction)
+async def get_team_next_game(team_id: int):
+    """The team's next game (or the one in progress), with its prediction."""
+    try:
+        game = get_next_game(team_id)
+    except GamesUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    if game is None:
+        raise HTTPException(status_code=404, detail="No upcoming game this season")
+    return game
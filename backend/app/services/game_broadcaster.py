@@ -0,0 +1,143 @@
+"""
+Fan-out of live score updates to Server-Sent Events subscribers.
+
+The poller is the single producer: each time it publishes a snapshot whose
+games changed, the broadcaster diffs it against the previous one, encodes one
+SSE event holding only the changed games, and hands the same bytes to every
+subscriber. Per-subscriber work is a single put_nowait.
+
+Backpressure: each subscriber has a small bounded queue. A client that falls
+that many updates behind is disconnected rather than buffered without limit;
+EventSource reconnects on its own and gets a fresh full slate.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Callable
+
+from app.core.logging import get_logger
+from app.models.schemas import Game, GameListResponse, GameUpdateEvent
+
+logger = get_logger(__name__)
+
+# Updates a subscriber may lag behind before it is dropped
+SUBSCRIBER_QUEUE_SIZE = 8
+
+# Comment line sent when idle, keeping proxies (Cloudflare) from closing
+# the connection and letting the server notice dead clients
+HEARTBEAT_SECONDS = 15
+
+# Tells EventSource how long to wait before reconnecting
+RETRY_MS = 3000
+
+_HEARTBEAT = b": heartbeat\n\n"
+_DROPPED = b""  # sentinel (never a real frame) queued to a dropped subscriber
+
+
+def format_sse(event: str, data: bytes, event_id: int | None = None) -> bytes:
+    """Encode one SSE frame. JSON bodies never contain raw newlines."""
+    frame = b"event: " + event.encode() + b"\ndata: " + data + b"\n\n"
+    if event_id is not None:
+        frame = b"id: " + str(event_id).encode() + b"\n" + frame
+    return frame
+
+
+def diff_games(
+    previous: list[Game], current: list[Game]
+) -> tuple[list[Game], list[int]]:
+    """Games that were added or changed, plus ids that disappeared."""
+    before = {g.id: g for g in previous}
+    changed = [g for g in current if before.get(g.id) != g]
+    current_ids = {g.id for g in current}
+    removed = [game_id for game_id in before if game_id not in current_ids]
+    return changed, removed
+
+
+class _Subscriber:
+    __slots__ = ("queue", "dropped")
+
+    def __init__(self):
+        self.queue: asyncio.Queue[bytes] = asyncio.Queue(SUBSCRIBER_QUEUE_SIZE)
+        self.dropped = False
+
+
+class GameBroadcaster:
+    """Single-producer, many-consumer broadcast of slate changes."""
+
+    def __init__(self):
+        self._subscribers: set[_Subscriber] = set()
+        self.dropped_total = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, previous: GameListResponse | None, current: GameListResponse):
+        """Push the diff between two published slates to every subscriber."""
+        if not self._subscribers:
+            return
+
+        changed, removed = diff_games(previous.games if previous else [], current.games)
+        if not changed and not removed:
+            return
+        update = GameUpdateEvent(
+            games=changed,
+            removed_ids=removed,
+            version=current.version,
+            last_updated=current.last_updated,
+        )
+
+        # Encoded once, shared by every subscriber
+        frame = format_sse(
+            "games", update.model_dump_json().encode(), event_id=current.version
+        )
+
+        for sub in list(self._subscribers):
+            if sub.dropped:
+                continue
+            try:
+                sub.queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                self._drop(sub)
+
+    def _drop(self, sub: _Subscriber) -> None:
+        sub.dropped = True
+        self._subscribers.discard(sub)
+        self.dropped_total += 1
+        # Make room for the sentinel so the consumer wakes up and exits
+        while not sub.queue.empty():
+            sub.queue.get_nowait()
+        sub.queue.put_nowait(_DROPPED)
+        logger.info("sse_subscriber_dropped", reason="slow_consumer")
+
+    async def stream(self, get_initial: Callable[[], bytes]) -> AsyncIterator[bytes]:
+        """
+        Yield SSE frames for one client: the full slate, then changes only.
+
+        `get_initial` returns the pre-serialized GameListResponse of the
+        current snapshot, sent as a "slate" event. It is read right after
+        subscribing (no await in between), so no update can fall in the gap.
+        """
+        sub = _Subscriber()
+        self._subscribers.add(sub)
+        try:
+            initial = get_initial()
+            logger.debug("sse_subscribed", subscribers=len(self._subscribers))
+            yield f"retry: {RETRY_MS}\n".encode() + format_sse("slate", initial)
+            while True:
+                try:
+                    frame = await asyncio.wait_for(
+                        sub.queue.get(), timeout=HEARTBEAT_SECONDS
+                    )
+                except TimeoutError:
+                    yield _HEARTBEAT
+                    continue
+                if frame == _DROPPED:
+                    return
+                yield frame
+        finally:
+            self._subscribers.discard(sub)
+            logger.debug("sse_unsubscribed", subscribers=len(self._subscribers))
+
+
+# App-wide broadcaster fed by GameService when a snapshot is published
+broadcaster = GameBroadcaster()
@@ -0,0 +1,204 @@
+"""
+Decode raw balldontlie JSON straight into Game models.
+
+The refresh path used to validate every response into the SDK's models
+(NBABoxScore carries ~15 players per team with ~25 stats each) and then
+walk those objects with getattr to build a Game, re-parsing the tipoff and
+re-formatting the status text for every game on every tick. Here one
+precompiled TypeAdapter validates the bytes into plain dicts holding only
+the fields a Game needs - pydantic-core never builds Python objects for the
+player stats - and each Game is validated from a plain dict in one call
+(faster than model_construct, which runs in Python, for models this small).
+
+Status, status text and start time depend only on (status, period, clock),
+which repeat across games and ticks, so they're computed once per
+combination and memoized.
+
+The wire types mirror exactly the fields the SDK models exposed, so output
+matches the old path: box scores have no upstream id and no start time, and
+/games entries take their tipoff from the status field. Both get their id
+from box_score_id, so a game keeps one id whichever endpoint served it.
+"""
+
+from datetime import datetime
+from functools import lru_cache
+from typing import NotRequired, TypedDict
+from zoneinfo import ZoneInfo
+
+from pydantic import TypeAdapter
+
+from app.models.schemas import Game, GameStatus
+
+# NBA schedules use US Eastern time
+US_EASTERN = ZoneInfo("America/New_York")
+
+# (status, period, clock) combinations kept. A night has a few hundred.
+STATUS_CACHE_SIZE = 4096
+
+
+class WireTeam(TypedDict):
+    id: int
+    name: str
+    city: str
+    abbreviation: str
+
+
+class WireBoxScore(TypedDict):
+    """The fields of a /box_scores entry that make up a Game."""
+
+    date: NotRequired[str | None]
+    status: NotRequired[str | None]
+    period: NotRequired[int | None]
+    time: NotRequired[str | None]
+    home_team_score: NotRequired[int | None]
+    visitor_team_score: NotRequired[int | None]
+    home_team: WireTeam
+    visitor_team: WireTeam
+
+
+class WireGame(WireBoxScore):
+    """The fields of a /games entry that make up a Game."""
+
+    id: int
+
+
+class _BoxScoreList(TypedDict):
+    data: list[WireBoxScore]
+
+
+class _GameList(TypedDict):
+    data: list[WireGame]
+
+
+_box_scores_adapter = TypeAdapter(_BoxScoreList)
+_games_adapter = TypeAdapter(_GameList)
+
+
+def decode_box_scores(raw: bytes) -> list[WireBoxScore]:
+    """Validate a /box_scores or /box_scores/live body."""
+    return _box_scores_adapter.validate_json(raw)["data"]
+
+
+def decode_games(raw: bytes) -> list[WireGame]:
+    """Validate a /games body."""
+    return _games_adapter.validate_json(raw)["data"]
+
+
+def box_score_id(box_score: WireBoxScore) -> int:
+    """
+    Stable id for a box score or /games entry.
+
+    Box scores carry no game id, so derive one from the date and the two
+    teams. Deterministic (unlike hash()), so ids match across ticks,
+    restarts and worker processes. Fits in a JS safe integer. /games
+    entries use it too, rather than their upstream id: a tick that falls
+    back to /games must not rename the slate's games.
+    """
+    game_day = (box_score.get("date") or "")[:10]
+    day = int(game_day.replace("-", "")) if game_day else 0
+    return (
+        day * 10_000
+        + box_score["home_team"]["id"] * 100
+        + box_score["visitor_team"]["id"]
+    )
+
+
+def game_from_box_score(box_score: WireBoxScore) -> Game:
+    """Build a Game (with live scores) from a box score."""
+    period = box_score.get("period") or 0
+    status, status_text, _ = game_status(
+        box_score.get("status") or "", period, box_score.get("time") or ""
+    )
+    return _game(box_score_id(box_score), box_score, status, status_text, None)
+
+
+def game_from_game(game: WireGame) -> Game:
+    """Build a Game from a /games entry (the fallback when box scores fail)."""
+    period = game.get("period") or 0
+    status, status_text, start_time = game_status(
+        game.get("status") or "", period, game.get("time") or ""
+    )
+    return _game(box_score_id(game), game, status, status_text, start_time)
+
+
+def _game(
+    game_id: int,
+    wire: WireBoxScore,
+    status: GameStatus,
+    status_text: str,
+    start_time: datetime | None,
+) -> Game:
+    home = wire["home_team"]
+    visitor = wire["visitor_team"]
+    return Game.model_validate(
+        {
+            "id": game_id,
+            "status": status,
+            "status_text": status_text,
+            "period": wire.get("period") or 0,
+            "time_remaining": wire.get("time"),
+            "home_team": {**home, "score": wire.get("home_team_score") or 0},
+            "away_team": {**visitor, "score": wire.get("visitor_team_score") or 0},
+            "start_time": start_time,
+        }
+    )
+
+
+@lru_cache(maxsize=STATUS_CACHE_SIZE)
+def game_status(
+    raw_status: str, period: int, clock: str
+) -> tuple[GameStatus, str, datetime | None]:
+    """
+    Status, display text and tipoff for an upstream (status, period, clock).
+
+    Scheduled games carry their tipoff as an ISO datetime in the status
+    field; it's shown in US Eastern time.
+    """
+    status = parse_status(raw_status)
+    tipoff = parse_datetime(raw_status)
+    if status == GameStatus.FINAL:
+        text = "Final"
+    elif status == GameStatus.IN_PROGRESS:
+        text = f"{period_name(period)} {clock}".strip()
+    else:
+        text = tipoff_text(tipoff)
+    return status, text, tipoff
+
+
+def tipoff_text(tipoff: datetime | None) -> str:
+    """A scheduled game's status text: its tipoff in US Eastern time."""
+    if tipoff is None:
+        return "TBD"
+    return tipoff.astimezone(US_EASTERN).strftime("%-I:%M %p ET")
+
+
+def parse_status(status_str: str) -> GameStatus:
+    """Parse API status string to our enum."""
+    status_lower = status_str.lower()
+    if "final" in status_lower:
+        return GameStatus.FINAL
+    elif "qtr" in status_lower or "half" in status_lower or "ot" in status_lower:
+        return GameStatus.IN_PROGRESS
+    else:
+        # Scheduled games may have datetime in status field or "scheduled" text
+        return GameStatus.SCHEDULED
+
+
+def period_name(period: int) -> str:
+    """Convert period number to display name."""
+    if period <= 4:
+        suffixes = {1: "1st", 2: "2nd", 3: "3rd", 4: "4th"}
+        return suffixes.get(period, f"{period}th")
+    else:
+        ot_num = period - 4
+        return f"OT{ot_num}" if ot_num > 1 else "OT"
+
+
+def parse_datetime(value: str | None) -> datetime | None:
+    """Parse an ISO datetime from the API, None if it isn't one."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
@@ -0,0 +1,322 @@
+"""
+Background poller - the only thing that talks to balldontlie for today's slate.
+
+Polling cadence adapts to what is on the slate (mirrors the frontend's
+useGames intervals so the backend never refreshes slower than viewers poll):
+- 5s while any game is in progress
+- 30s when a game tips off within 30 minutes (or is late starting)
+- otherwise, once tipoff times are known (from the slate or the season
+  schedule index), nothing can change until the next game starts: sleep
+  until 30 minutes before it, waking at least hourly and just after
+  midnight Eastern to roll the slate over
+- without known tipoffs: 60s when only scheduled games remain, 5min when
+  every game is final or there are no games today
+
+Upstream failures back off exponentially from the live interval, capped at
+POLL_ERROR_BACKOFF_MAX_SECONDS. The previous snapshot stays published.
+
+SlatePrefetcher rebuilds the season schedule index and fills the date cache
+with tomorrow's slate at startup and again shortly after every midnight
+Eastern, so the first viewer to look ahead doesn't wait on upstream.
+
+With several worker processes, WorkerCoordinator runs both in the elected
+leader only; the other workers mirror its shared state.
+"""
+
+import asyncio
+import os
+from collections.abc import Callable
+from datetime import UTC, datetime, time, timedelta
+
+from app.core.logging import get_logger
+from app.core.shared_state import LeaderLock
+from app.models.schemas import Game, GameStatus
+from app.services.game_decoder import US_EASTERN
+from app.services.game_service import (
+    GameService,
+    get_schedule,
+    promote_to_leader,
+    sync_shared_state,
+)
+from app.services.schedule_index import ScheduleIndex
+
+logger = get_logger(__name__)
+
+POLL_LIVE_SECONDS = 5
+POLL_STARTING_SOON_SECONDS = 30
+POLL_SCHEDULED_SECONDS = 60
+POLL_ALL_FINAL_SECONDS = 300
+POLL_ERROR_BACKOFF_MAX_SECONDS = 60
+# Longest sleep while waiting on a known tipoff (catches schedule changes)
+POLL_IDLE_MAX_SECONDS = 3600
+
+STARTING_SOON_WINDOW = timedelta(minutes=30)
+# Wake this long after midnight Eastern to start serving the new day
+ROLLOVER_AFTER_MIDNIGHT = timedelta(minutes=1)
+
+# Upstream rolls its schedule over a little after midnight Eastern
+PREFETCH_AFTER_MIDNIGHT = timedelta(minutes=10)
+PREFETCH_RETRY_SECONDS = 300
+
+# How often followers pick up the leader's shared state and retry the
+# leader lock (so a dead leader is replaced within a tick)
+FOLLOW_INTERVAL_SECONDS = 0.25
+
+
+def next_poll_interval(
+    games: list[Game],
+    now: datetime | None = None,
+    schedule: ScheduleIndex | None = None,
+) -> float:
+    """Pick the refresh interval (seconds) for the current slate."""
+    if any(g.status == GameStatus.IN_PROGRESS for g in games):
+        return POLL_LIVE_SECONDS
+
+    now = now or datetime.now(UTC)
+    scheduled = [g for g in games if g.status == GameStatus.SCHEDULED]
+    # Box scores carry no tipoff - the schedule index knows it
+    tipoffs = [
+        g.start_time or (schedule.tipoff(g.id) if schedule is not None else None)
+        for g in scheduled
+    ]
+
+    # Late tipoffs still read "scheduled" - treat them as starting soon so we
+    # pick up the first live score quickly
+    if any(t is not None and t - now <= STARTING_SOON_WINDOW for t in tipoffs):
+        return POLL_STARTING_SOON_SECONDS
+
+    if None in tipoffs:
+        return POLL_SCHEDULED_SECONDS
+
+    # Nothing starts soon, so nothing can change: sleep until shortly before
+    # the next tipoff
+    if tipoffs:
+        upcoming = min(tipoffs)
+    elif schedule is not None:
+        upcoming = schedule.next_tipoff(now)
+    else:
+        upcoming = None
+    if upcoming is None:
+        # All final, or an empty slate (off day / offseason)
+        return POLL_ALL_FINAL_SECONDS
+    wait = (upcoming - STARTING_SOON_WINDOW - now).total_seconds()
+    return max(
+        POLL_STARTING_SOON_SECONDS,
+        min(
+            wait,
+            POLL_IDLE_MAX_SECONDS,
+            seconds_until(now, ROLLOVER_AFTER_MIDNIGHT),
+        ),
+    )
+
+
+class GamePoller:
+    """Long-lived task that refreshes today's games on an adaptive schedule."""
+
+    def __init__(self, service_factory: Callable[[], GameService]):
+        self._service_factory = service_factory
+        self._task: asyncio.Task | None = None
+        self._consecutive_failures = 0
+
+    def start(self) -> None:
+        """Start polling. Call once from the app lifespan."""
+        if self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run(), name="game-poller")
+        logger.info("game_poller_started")
+
+    async def stop(self) -> None:
+        """Cancel the polling task and wait for it to exit."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("game_poller_stopped")
+
+    async def _run(self) -> None:
+        service: GameService | None = None
+
+        while True:
+            try:
+                # Built lazily so a missing API key is logged and retried
+                # instead of crashing startup
+                if service is None:
+                    service = self._service_factory()
+                snapshot = await service.refresh_todays_games()
+                self._consecutive_failures = 0
+                interval = next_poll_interval(
+                    snapshot.response.games, schedule=get_schedule()
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._consecutive_failures += 1
+                interval = min(
+                    POLL_LIVE_SECONDS * 2**self._consecutive_failures,
+                    POLL_ERROR_BACKOFF_MAX_SECONDS,
+                )
+                logger.warning(
+                    "game_poll_failed",
+                    error_type=type(e).__name__,
+                    error_message=str(e),
+                    consecutive_failures=self._consecutive_failures,
+                    retry_in_seconds=interval,
+                )
+
+            logger.debug("game_poll_scheduled", next_poll_seconds=interval)
+            await asyncio.sleep(interval)
+
+
+def seconds_until(now: datetime, after_midnight: timedelta) -> float:
+    """Seconds from `now` (aware) to the next `after_midnight` past midnight Eastern."""
+    eastern = now.astimezone(US_EASTERN)
+    target = datetime.combine(eastern.date(), time(), US_EASTERN) + after_midnight
+    if target <= eastern:
+        target = datetime.combine(
+            eastern.date() + timedelta(days=1), time(), US_EASTERN
+        )
+        target += after_midnight
+    # Via timestamps: subtracting same-zone datetimes ignores DST shifts
+    return target.timestamp() - now.timestamp()
+
+
+class SlatePrefetcher:
+    """Rebuilds the schedule index and tomorrow's date slate once a day."""
+
+    def __init__(self, service_factory: Callable[[], GameService]):
+        self._service_factory = service_factory
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="slate-prefetcher")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        service: GameService | None = None
+
+        while True:
+            tomorrow = datetime.now(US_EASTERN).date() + timedelta(days=1)
+            try:
+                if service is None:
+                    service = self._service_factory()
+                # First, so tomorrow's slate is built from the fresh index
+                indexed = await self._refresh_schedule(service)
+                slate = await service.refresh_date(tomorrow)
+                delay = (
+                    seconds_until(datetime.now(UTC), PREFETCH_AFTER_MIDNIGHT)
+                    if indexed
+                    else PREFETCH_RETRY_SECONDS
+                )
+                logger.info(
+                    "slate_prefetched",
+                    date=tomorrow.isoformat(),
+                    game_count=len(slate.response.games),
+                    data_source=slate.source,
+                    next_prefetch_seconds=round(delay),
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                delay = PREFETCH_RETRY_SECONDS
+                logger.warning(
+                    "slate_prefetch_failed",
+                    date=tomorrow.isoformat(),
+                    error_type=type(e).__name__,
+                    error_message=str(e),
+                    retry_in_seconds=delay,
+                )
+            await asyncio.sleep(delay)
+
+    async def _refresh_schedule(self, service: GameService) -> bool:
+        """Rebuild the season schedule index; False (logged) if that failed."""
+        schedule = get_schedule()
+        today = datetime.now(US_EASTERN).date()
+        if (
+            schedule is not None
+            and schedule.fetched_at.astimezone(US_EASTERN).date() == today
+        ):
+            # Already rebuilt today (by the previous leader, if we just took over)
+            return True
+        try:
+            await service.refresh_schedule()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(
+                "schedule_index_refresh_failed",
+                error_type=type(e).__name__,
+                error_message=str(e),
+            )
+            return False
+        return True
+
+
+class WorkerCoordinator:
+    """
+    Runs the pollers in exactly one of the app's worker processes.
+
+    Every worker tries the leader lock at startup. The winner starts the
+    pollers; the others follow, syncing shared state every
+    FOLLOW_INTERVAL_SECONDS and retrying the lock on each tick. The lock
+    dies with its process, so if the leader exits a follower takes over.
+    """
+
+    def __init__(self, lock: LeaderLock, pollers: list[GamePoller | SlatePrefetcher]):
+        self._lock = lock
+        self._pollers = pollers
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._lock.try_acquire():
+            self._lead()
+        else:
+            logger.info("worker_following", pid=os.getpid())
+            self._task = asyncio.create_task(self._follow(), name="worker-follower")
+
+    async def stop(self) -> None:
+        """Stop following or polling, and give up the lock."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for poller in self._pollers:
+            await poller.stop()
+        self._lock.release()
+
+    def _lead(self) -> None:
+        promote_to_leader()
+        for poller in self._pollers:
+            poller.start()
+        logger.info("worker_elected_leader", pid=os.getpid())
+
+    async def _follow(self) -> None:
+        while True:
+            try:
+                sync_shared_state()
+            except Exception as e:
+                logger.warning(
+                    "shared_state_sync_failed",
+                    error_type=type(e).__name__,
+                    error_message=str(e),
+                )
+            if self._lock.try_acquire():
+                self._lead()
+                return
+            await asyncio.sleep(FOLLOW_INTERVAL_SECONDS)
@@ -2,283 +2,1275 @@
 Game service - business logic for fetching and transforming game data.
 
 Caching Strategy:
-- 5 second TTL balances freshness with API efficiency
-- 60 req/min limit = 1 req/sec max, so 5s TTL uses only 12 req/min (20% of limit)
-- Stale cache returned on API errors for resilience
+- A background poller (see game_poller.py) owns every upstream refresh;
+  requests only ever read the last published snapshot, so request latency
+  and upstream call volume are independent of how many viewers we have
+- Snapshots are immutable and swapped in with a single assignment, so a
+  read is O(1) and never observes a half-built slate
+- On API errors the previous snapshot stays published (stale-but-available)
+- Upstream fetches are single-flight per (endpoint, date): concurrent
+  refreshes share one call, so bursts can't eat the 60 req/min budget
+- Changed games are pushed to /api/games/stream subscribers as each new
+  snapshot is published (see game_broadcaster.py)
+- Each snapshot is serialized and compressed once at publish time (see
+  core/http_cache.py). A refresh that changes nothing keeps the previous
+  body, ETag and last_updated, so polling clients get 304s between changes
+- Refreshes are incremental while games are live: the full day is fetched
+  once, then each tick pulls only /box_scores/live and merges those games
+  by id. Finals are pinned (never re-transformed), and a full reconcile
+  runs every FULL_RECONCILE_SECONDS or whenever the live feed and the
+  slate disagree (a game finished, or one we don't know about appeared)
+- Published snapshots are persisted to SQLite off the request path and the
+  day's slate is restored at startup (see snapshot_store.py), so a
+  redeploy serves the last known scores immediately instead of starting cold
+- Each game carries its pregame prediction, attached on the refresh path
+  from a cache (see prediction_service.py), so a tick that changes only
+  live scores scores no models. In-progress games also get a live win
+  probability, recomputed only for games whose score or clock moved (see
+  live_probability.py)
+- Every changed snapshot gets a new monotonic version and each game records
+  the version it last changed in, so ?since=<version> answers with only
+  the changed games (see get_games_since)
+- Upstream bodies are decoded from bytes straight into Games, without the
+  SDK's models, and status text is memoized (see game_decoder.py)
+- Other dates (/api/games?date=, /range) come from a per-date LRU with
+  TTLs by how settled the date is; fully-final past dates are kept for
+  good and persisted, and yesterday's last snapshot is handed over at
+  midnight (see schedule_cache.py)
+- The season's schedule is indexed in memory as columns (see
+  schedule_index.py), refreshed once a day and kept current with every
+  final the poller publishes. Team schedules, next games and future date
+  slates are answered from it without upstream calls, and the poller uses
+  its tipoffs to sleep until just before the first game
+- With several worker processes (uvicorn --workers), one of them is elected
+  leader and is the only one that polls and persists. It writes every
+  snapshot, its prepared bodies and the schedule index to shared state;
+  the followers mirror them without re-serializing, and a date slate is
+  built once across all workers (see core/shared_state.py)
+- Upstream calls go through a failover provider: balldontlie first, the
+  NBA CDN scoreboard for today's box scores when balldontlie fails, is
+  slower than its p95 (hedged), or has its circuit open (see
+  providers/failover_provider.py)
 """
 
-from datetime import UTC, datetime
+import asyncio
+import time
+from dataclasses import dataclass, replace
+from datetime import UTC, date, datetime, timedelta
 from typing import Annotated
-from zoneinfo import ZoneInfo
 
+from balldontlie.exceptions import RateLimitError
 from fastapi import Depends
 
+from app.core.http_cache import PreparedJSON
 from app.core.logging import get_logger
-from app.models.schemas import Game, GameListResponse, GameStatus, Team
-from app.providers.balldontlie_provider import (
-    BalldontlieProvider,
-    BalldontlieProviderDep,
+from app.core.metrics import (
+    Family,
+    date_cache,
+    delta_cache,
+    refresh_duration,
+    refresh_failures,
+    registry,
+    snapshot_reads,
 )
+from app.core.rate_limit import Priority, RateLimitTimeout
+from app.core.shared_state import (
+    SharedState,
+    Stamp,
+    body_from_parts,
+    body_parts,
+    pack,
+    unpack,
+)
+from app.core.singleflight import SingleFlight
+from app.core.timing import lap, trace
+from app.models.schemas import (
+    Game,
+    GameDeltaResponse,
+    GameListResponse,
+    GameStatus,
+    GameWithPrediction,
+    TeamGamesResponse,
+    TeamRating,
+)
+from app.providers.base import GameProvider
+from app.providers.failover_provider import GameProviderDep
+from app.services.game_broadcaster import broadcaster
+from app.services.game_decoder import (
+    US_EASTERN,
+    box_score_id,
+    decode_box_scores,
+    decode_games,
+    game_from_box_score,
+    game_from_game,
+)
+from app.services.live_probability import LiveProbabilityEngine
+from app.services.prediction_service import PredictionService, unscored
+from app.services.schedule_cache import DateSlate, DateSlateCache
+from app.services.schedule_index import ScheduleIndex, decode_schedule_page
+from app.services.snapshot_store import SnapshotStore, SnapshotWriter
+from ml.features import FeatureEngine
+from ml.game_store import current_season
 
 logger = get_logger(__name__)
 
-# NBA schedules use US Eastern time
-US_EASTERN = ZoneInfo("America/New_York")
 
-# Cache configuration
-# With 60 req/min limit, 5s TTL = 12 req/min max (20% of limit) - plenty of headroom
-_games_cache: GameListResponse | None = None
-_cache_timestamp: datetime | None = None
-CACHE_TTL_SECONDS = 5
+# Max age of the last full-day fetch before an incremental tick is replaced
+# by a full reconcile (catches anything the live feed doesn't report)
+FULL_RECONCILE_SECONDS = 60
+
+# Distinct ?since= values whose delta bodies are kept per snapshot. Clients
+# polling in step all send the same version, so this is almost always 1-2.
+DELTA_CACHE_SIZE = 32
+
+# How long a request waits for the poller's first snapshot after startup
+# before giving up with a 503
+FIRST_SNAPSHOT_TIMEOUT_SECONDS = 10
+
+# Longest span /api/games/range serves in one call (inclusive)
+RANGE_MAX_DAYS = 14
+
+# /api/teams/{id}/games bodies kept per schedule index (30 teams plus some
+# matchups)
+TEAM_CACHE_SIZE = 128
+
+# How long a worker waits for another worker building the same date slate
+# before building it itself (an upstream call can queue for rate budget)
+SHARED_DATE_LOCK_SECONDS = 30
+
+# Shared state entry names
+SNAPSHOT_ENTRY = "snapshot"
+SCHEDULE_ENTRY = "schedule"
+
+
+class GamesUnavailableError(Exception):
+    """No snapshot has been published yet (cold start or upstream down)."""
+
+
+@dataclass(frozen=True, slots=True)
+class GamesSnapshot:
+    """An immutable, fully-built view of today's slate."""
+
+    response: GameListResponse
+    body: PreparedJSON  # response serialized once, with gzip/br variants
+    game_date: date
+    data_source: str
+    fetched_at: datetime  # last successful upstream check (>= last_updated)
+    reconciled_at: datetime  # last full-day fetch (incremental ticks excluded)
+    version: int
+    # Version at which this date's slate started; older `since` values get
+    # the full slate back
+    base_version: int
+    # game id -> version it last changed in (score, period, clock, status)
+    game_versions: dict[int, int]
+    # game id -> version it disappeared from the slate in
+    removed_versions: dict[int, int]
+
+
+# Published snapshot - replaced wholesale by the poller, never mutated
+_snapshot: GamesSnapshot | None = None
+_snapshot_ready = asyncio.Event()
+_last_refresh_error: str | None = None
+
+# Delta bodies for the current snapshot, keyed by `since`
+_delta_cache: dict[int, PreparedJSON] = {}
+_delta_cache_version = 0
+
+# Slates for dates other than the poller's, see schedule_cache.py
+_dates = DateSlateCache()
+
+# The current season's schedule (None until first loaded), see
+# schedule_index.py. Replaced wholesale, never mutated.
+_schedule: ScheduleIndex | None = None
+
+# Team schedule bodies for _team_cache_index, keyed by (team, opponent,
+# snapshot version if the team plays on the poller's date)
+_team_cache: dict[tuple[int, int | None, int], PreparedJSON] = {}
+_team_cache_index: ScheduleIndex | None = None
+
+# Cross-worker sharing (None = single process). Only the leader refreshes
+# from upstream, persists and writes the snapshot; followers mirror it.
+_shared: SharedState | None = None
+_leader = True
+_shared_stamps: dict[str, Stamp] = {}
+
+# Persistence (None = disabled) and warm-start measurement
+_store: SnapshotStore | None = None
+_writer: SnapshotWriter | None = None
+_background: set[asyncio.Task] = set()
+_process_started = time.perf_counter()
+_first_response_served = False
+
+# Attaches predictions on every refresh; model-less until enable_predictions
+_predictions = PredictionService(None, FeatureEngine())
+_live_probability = LiveProbabilityEngine()
+
+# One in-flight upstream call per endpoint+date, shared by all callers
+_box_scores_flight = SingleFlight("box_scores")
+_games_flight = SingleFlight("games")
+_live_flight = SingleFlight("box_scores_live")
+# One build per date slate, however many viewers miss the cache at once
+_date_flight = SingleFlight("date_slate")
+
+
+def get_snapshot() -> GamesSnapshot | None:
+    """Return the currently published snapshot (None before the first refresh)."""
+    return _snapshot
+
+
+def get_schedule() -> ScheduleIndex | None:
+    """Return the season schedule index (None until it's first loaded)."""
+    return _schedule
+
+
+def get_coalescing_stats() -> dict[str, dict[str, int]]:
+    """How many upstream calls were made vs. joined by concurrent callers."""
+    return {
+        _box_scores_flight.name: _box_scores_flight.stats(),
+        _games_flight.name: _games_flight.stats(),
+        _live_flight.name: _live_flight.stats(),
+        _date_flight.name: _date_flight.stats(),
+    }
+
+
+def _next_version(previous: GamesSnapshot | None, now: datetime) -> int:
+    """
+    Monotonic snapshot version.
+
+    Seeded from the wall clock (ms) so versions keep increasing across
+    restarts, and a client's `since` from a previous process is never
+    mistaken for a current version.
+    """
+    clock = int(now.timestamp() * 1000)
+    return max(clock, previous.version + 1) if previous else clock
+
+
+def _build_snapshot(
+    previous: GamesSnapshot | None,
+    games: list[Game],
+    game_date: date,
+    data_source: str,
+    now: datetime,
+    reconciled_at: datetime,
+) -> GamesSnapshot:
+    """Build (but don't publish) a snapshot, tracking which games changed."""
+    version = _next_version(previous, now)
+
+    if previous is None or previous.game_date != game_date:
+        # New day (or first snapshot) - every game is new
+        base_version = version
+        game_versions = {g.id: version for g in games}
+        removed_versions: dict[int, int] = {}
+    else:
+        base_version = previous.base_version
+        before = {g.id: g for g in previous.response.games}
+        game_versions = {
+            g.id: previous.game_versions[g.id] if before.get(g.id) == g else version
+            for g in games
+        }
+        removed_versions = {
+            game_id: v
+            for game_id, v in previous.removed_versions.items()
+            if game_id not in game_versions
+        }
+        for game_id in before:
+            if game_id not in game_versions:
+                removed_versions[game_id] = version
+
+    response = GameListResponse(games=games, last_updated=now, version=version)
+    return GamesSnapshot(
+        response=response,
+        body=PreparedJSON.from_model(response),
+        game_date=game_date,
+        data_source=data_source,
+        fetched_at=now,
+        reconciled_at=reconciled_at,
+        version=version,
+        base_version=base_version,
+        game_versions=game_versions,
+        removed_versions=removed_versions,
+    )
+
+
+def _publish_snapshot(snapshot: GamesSnapshot) -> None:
+    global _snapshot, _last_refresh_error
+    previous = _snapshot
+    _snapshot = snapshot
+    _last_refresh_error = None
+    _snapshot_ready.set()
+    if _leader:
+        _share_snapshot(snapshot)
+    if previous is None or snapshot.body is not previous.body:
+        broadcaster.publish(previous.response if previous else None, snapshot.response)
+        _apply_results(snapshot.response.games)
+        if _writer is not None and _leader:
+            _writer.schedule(
+                snapshot.game_date, snapshot.version, snapshot.body.content
+            )
+    if previous is not None and previous.game_date < snapshot.game_date:
+        # Day rolled over: yesterday's last snapshot (with its pregame
+        # predictions) becomes a date slate instead of being refetched
+        slate = _dates.build(
+            previous.game_date,
+            snapshot.game_date,
+            previous.response,
+            previous.body,
+            "snapshot",
+        )
+        _dates.put(slate)
+        if slate.final and _leader:
+            _spawn(_save_final_slate(slate))
+
+
+def _apply_results(games: list[Game]) -> None:
+    """Fold newly final games into the schedule index."""
+    global _schedule
+    schedule = _schedule
+    if schedule is not None:
+        updated = schedule.with_results(games)
+        if updated is not None:
+            _schedule = updated
+
+
+def enable_sharing(shared: SharedState) -> None:
+    """
+    Share state with the other workers through `shared`, starting as a
+    follower: nothing is written until promote_to_leader.
+
+    Call from the lifespan before enable_persistence, so a follower's
+    restored snapshot isn't shared.
+    """
+    global _shared, _leader
+    _shared = shared
+    _leader = False
+
+
+def disable_sharing() -> None:
+    global _shared, _leader
+    _shared = None
+    _leader = True
+    _shared_stamps.clear()
+
+
+def promote_to_leader() -> None:
+    """This worker won the election: refresh, persist and share from now on."""
+    global _leader
+    _leader = True
+    snapshot = _snapshot
+    if snapshot is not None:
+        _share_snapshot(snapshot)
+
+
+def is_leader() -> bool:
+    return _leader
+
+
+def _share(name: str, blob: bytes) -> None:
+    """Write a shared entry; a failure is logged, never raised to the poller."""
+    if _shared is None:
+        return
+    try:
+        _shared.write(name, blob)
+    except OSError as e:
+        logger.error(
+            "shared_state_write_failed",
+            entry=name,
+            error_type=type(e).__name__,
+            error_message=str(e),
+        )
+
+
+def _share_snapshot(snapshot: GamesSnapshot) -> None:
+    """Write the snapshot, its prepared bodies and the refresh error."""
+    if _shared is None:
+        return
+    etags, parts = body_parts(snapshot.body)
+    header = {
+        "game_date": snapshot.game_date.isoformat(),
+        "data_source": snapshot.data_source,
+        "fetched_at": snapshot.fetched_at.isoformat(),
+        "reconciled_at": snapshot.reconciled_at.isoformat(),
+        "version": snapshot.version,
+        "base_version": snapshot.base_version,
+        "game_versions": list(snapshot.game_versions.items()),
+        "removed_versions": list(snapshot.removed_versions.items()),
+        "etags": etags,
+        "error": _last_refresh_error,
+    }
+    _share(SNAPSHOT_ENTRY, pack(header, parts))
+
+
+def sync_shared_state() -> None:
+    """
+    Follower: pick up whatever the leader shared since the last call.
+
+    Cheap when nothing changed (one stat() per entry). A changed snapshot
+    is published here as if this worker had fetched it: same version, body
+    and ETag as the leader's, so clients can hop between workers and still
+    get 304s and consistent ?since= deltas.
+    """
+    if _shared is None or _leader:
+        return
+    _sync_entry(SNAPSHOT_ENTRY, _load_shared_snapshot)
+    _sync_entry(SCHEDULE_ENTRY, _load_shared_schedule)
+
+
+def _sync_entry(name: str, load) -> None:
+    read = _shared.read(name, _shared_stamps.get(name))
+    if read is None:
+        return
+    stamp, blob = read
+    # Stamp first: a blob that fails to load is skipped, not retried forever
+    _shared_stamps[name] = stamp
+    try:
+        load(blob)
+    except Exception as e:
+        logger.error(
+            "shared_state_read_failed",
+            entry=name,
+            error_type=type(e).__name__,
+            error_message=str(e),
+        )
+
+
+def _load_shared_snapshot(blob: bytes) -> None:
+    global _last_refresh_error
+    header, parts = unpack(blob)
+    previous = _snapshot
+    fetched_at = datetime.fromisoformat(header["fetched_at"])
+    reconciled_at = datetime.fromisoformat(header["reconciled_at"])
+    if previous is not None and previous.version == header["version"]:
+        snapshot = replace(
+            previous,
+            data_source=header["data_source"],
+            fetched_at=fetched_at,
+            reconciled_at=reconciled_at,
+        )
+    else:
+        body = body_from_parts(header["etags"], parts)
+        response = GameListResponse.model_validate_json(body.content)
+        game_date = date.fromisoformat(header["game_date"])
+        snapshot = GamesSnapshot(
+            response=response,
+            body=body,
+            game_date=game_date,
+            data_source=header["data_source"],
+            fetched_at=fetched_at,
+            reconciled_at=reconciled_at,
+            version=header["version"],
+            base_version=header["base_version"],
+            game_versions=dict(header["game_versions"]),
+            removed_versions=dict(header["removed_versions"]),
+        )
+        # Keep this worker's Elo and feature state in step with the leader's
+        _predictions.record_finals(response.games, game_date)
+    _publish_snapshot(snapshot)
+    _last_refresh_error = header["error"]
+
+
+def _load_shared_schedule(blob: bytes) -> None:
+    global _schedule
+    schedule = ScheduleIndex.from_bytes(blob)
+    snapshot = _snapshot
+    if snapshot is not None:
+        schedule = schedule.with_results(snapshot.response.games) or schedule
+    _schedule = schedule
+
+
+def _date_entry(game_date: date) -> str:
+    return f"date-{game_date.isoformat()}"
+
+
+def _share_date(slate: DateSlate) -> None:
+    """Write a date slate with its wall-clock expiry (None = final)."""
+    if _shared is None:
+        return
+    expires_in = _dates.expires_in(slate)
+    etags, parts = body_parts(slate.body)
+    header = {
+        "expires_at": None if slate.final else time.time() + expires_in,
+        "etags": etags,
+    }
+    _share(_date_entry(slate.game_date), pack(header, parts))
+
+
+def _load_shared_date(game_date: date, today: date) -> DateSlate | None:
+    """A date slate another worker built, if it's still fresh."""
+    if _shared is None:
+        return None
+    read = _shared.read(_date_entry(game_date))
+    if read is None:
+        return None
+    header, parts = unpack(read[1])
+    expires_in = (
+        None if header["expires_at"] is None else header["expires_at"] - time.time()
+    )
+    if expires_in is not None and expires_in <= 0:
+        return None
+    body = body_from_parts(header["etags"], parts)
+    return _dates.build(
+        game_date,
+        today,
+        GameListResponse.model_validate_json(body.content),
+        body,
+        "shared",
+        expires_in=expires_in,
+    )
+
+
+def _sort_slate(games: list[Game]) -> None:
+    """
+    Live games first, then scheduled, then final. Tie-break on tipoff and
+    id so full and incremental refreshes order identically.
+    """
+    games.sort(
+        key=lambda g: (
+            0
+            if g.status == GameStatus.IN_PROGRESS
+            else 1
+            if g.status == GameStatus.SCHEDULED
+            else 2,
+            g.start_time.timestamp() if g.start_time else float("inf"),
+            g.id,
+        )
+    )
+
+
+def _spawn(coro) -> None:
+    """Run a fire-and-forget task, keeping a reference until it finishes."""
+    task = asyncio.create_task(coro)
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+
+
+async def _save_final_slate(slate: DateSlate) -> None:
+    """Persist a final date so it's never fetched from upstream again."""
+    if _store is None:
+        return
+    try:
+        await asyncio.to_thread(
+            _store.save_slate,
+            slate.game_date,
+            slate.response.version,
+            slate.body.content,
+        )
+    except Exception as e:
+        logger.error(
+            "date_slate_save_failed",
+            date=slate.game_date.isoformat(),
+            error_type=type(e).__name__,
+            error_message=str(e),
+        )
+
+
+def enable_persistence(store: SnapshotStore) -> None:
+    """
+    Restore today's slate from disk, then persist every new snapshot (and
+    every fully-final date slate).
+
+    Call from the lifespan before the app takes traffic. The restored
+    snapshot is served immediately; its reconciled_at is unset so the
+    poller's first tick does a full upstream fetch.
+    """
+    global _store, _writer
+
+    start = time.perf_counter()
+    today = datetime.now(US_EASTERN).date()
+    saved = store.load_slate(today)
+    if saved is not None and _snapshot is None:
+        response, version = saved
+        _publish_snapshot(
+            GamesSnapshot(
+                response=response,
+                body=PreparedJSON.from_model(response),
+                game_date=today,
+                data_source="disk",
+                fetched_at=response.last_updated,
+                reconciled_at=datetime.min.replace(tzinfo=UTC),
+                version=version,
+                base_version=version,
+                game_versions={g.id: version for g in response.games},
+                removed_versions={},
+            )
+        )
+    logger.info(
+        "snapshot_restore",
+        date=today.isoformat(),
+        restored=saved is not None,
+        game_count=len(saved[0].games) if saved else 0,
+        duration_ms=round((time.perf_counter() - start) * 1000, 2),
+    )
+    _store = store
+    _writer = SnapshotWriter(store)
+
+
+def enable_predictions(service: PredictionService) -> None:
+    """Use `service` to attach predictions from the next refresh on."""
+    global _predictions
+    _predictions = service
+
+
+def get_team_ratings() -> list[TeamRating]:
+    """Current Elo ratings, best first (updated as finals come in)."""
+    return [
+        TeamRating(team_id=team_id, rating=round(rating, 1), rank=rank, games=games)
+        for rank, (team_id, rating, games) in enumerate(
+            _predictions.elo.table(), start=1
+        )
+    ]
+
+
+def get_team_games_body(
+    team_id: int, opponent_id: int | None = None
+) -> PreparedJSON | None:
+    """
+    A team's games this season as a prepared TeamGamesResponse body, or
+    None if the team isn't on the schedule.
+
+    Built from the schedule index. Games on the poller's date are taken
+    from its snapshot instead, with live scores and predictions; the others
+    carry no prediction. Bodies are cached until the index changes, or
+    until the snapshot changes for a team playing on the poller's date.
+    """
+    global _team_cache_index
+
+    schedule = _require_schedule()
+    if _team_cache_index is not schedule:
+        _team_cache.clear()
+        _team_cache_index = schedule
+
+    snapshot = _snapshot
+    playing = [
+        g
+        for g in (snapshot.response.games if snapshot is not None else [])
+        if team_id in (g.home_team.id, g.away_team.id)
+    ]
+    key = (team_id, opponent_id, snapshot.version if playing else 0)
+    cached = _team_cache.get(key)
+    if cached is not None:
+        return cached
+
+    games = schedule.team_games(team_id, opponent_id)
+    if games is None:
+        return None
+    if playing:
+        current = {g.id: g for g in playing}
+        games = [current.get(g.id, g) for g in games]
+    body = PreparedJSON.from_model(
+        TeamGamesResponse(team_id=team_id, season=schedule.season, games=games),
+        fast=True,
+    )
+    if len(_team_cache) >= TEAM_CACHE_SIZE:
+        _team_cache.clear()  # live snapshots retire keys faster than LRU pays off
+    _team_cache[key] = body
+    return body
+
+
+def get_next_game(team_id: int) -> GameWithPrediction | None:
+    """A team's next (or in-progress) game, with its pregame prediction."""
+    schedule = _require_schedule()
+    today = datetime.now(US_EASTERN).date()
+    game = schedule.next_game(team_id, today)
+    if game is None:
+        return None
+    snapshot = _snapshot
+    if snapshot is not None:
+        for current in snapshot.response.games:
+            if current.id == game.id:
+                return current
+    return _predictions.attach([game], schedule.game_date(game.id) or today)[0]
+
+
+def _require_schedule() -> ScheduleIndex:
+    schedule = _schedule
+    if schedule is None:
+        raise GamesUnavailableError("The season schedule is not loaded yet")
+    return schedule
+
+
+def get_prediction_stats() -> dict[str, object]:
+    return {**_predictions.stats(), "live": _live_probability.stats()}
+
+
+@registry.collector
+def _slate_metrics():
+    snapshot = _snapshot
+    if snapshot is not None:
+        age = (datetime.now(UTC) - snapshot.fetched_at).total_seconds()
+        yield Family(
+            "snapshot_age_seconds", "gauge", "Since the last successful upstream check"
+        ).add(age)
+        yield Family("snapshot_games", "gauge", "Games in the published slate").add(
+            len(snapshot.response.games)
+        )
+    yield Family(
+        "upstream_failing", "gauge", "1 while the last refresh attempt failed"
+    ).add(1 if _last_refresh_error else 0)
+    yield Family("poller_leader", "gauge", "1 in the worker that polls upstream").add(
+        1 if _leader else 0
+    )
+
+    flights = Family(
+        "singleflight_calls_total",
+        "counter",
+        "Upstream fetches made (flight) vs joined by a concurrent caller",
+    )
+    for name, stats in get_coalescing_stats().items():
+        flights.add(stats["flights"], name=name, result="flight")
+        flights.add(stats["coalesced"], name=name, result="coalesced")
+    yield flights
+
+    predictions = _predictions.stats()
+    yield (
+        Family("prediction_cache_requests_total", "counter", "Pregame prediction cache")
+        .add(predictions["cache_hits"], result="hit")
+        .add(predictions["cache_misses"], result="miss")
+    )
+    live = _live_probability.stats()
+    yield (
+        Family(
+            "live_probability_updates_total",
+            "counter",
+            "Live win probabilities recomputed vs reused (score/clock unchanged)",
+        )
+        .add(live["computed"], result="computed")
+        .add(live["skipped"], result="skipped")
+    )
+
+    schedule = _schedule
+    if schedule is not None:
+        yield Family("schedule_index_games", "gauge", "Games in the season index").add(
+            len(schedule)
+        )
+        yield Family(
+            "schedule_index_age_seconds", "gauge", "Since the index was last rebuilt"
+        ).add((datetime.now(UTC) - schedule.fetched_at).total_seconds())
+
+    dates = _dates.stats()
+    yield (
+        Family("date_cache_entries", "gauge", "Cached slates for other dates")
+        .add(dates["dates"], kind="date")
+        .add(dates["final_dates"], kind="final_date")
+        .add(dates["ranges"], kind="range")
+    )
+
+    yield Family("sse_subscribers", "gauge", "Connected /stream clients").add(
+        broadcaster.subscriber_count
+    )
+    yield Family(
+        "sse_dropped_total", "counter", "Slow /stream clients disconnected"
+    ).add(broadcaster.dropped_total)
+
+
+async def disable_persistence() -> None:
+    """Stop persisting and wait for the last write (called at shutdown)."""
+    global _store, _writer
+    if _background:
+        await asyncio.gather(*_background, return_exceptions=True)
+    _store = None
+    if _writer is not None:
+        writer, _writer = _writer, None
+        await writer.flush()
+
+
+def _log_first_response(snapshot: GamesSnapshot) -> None:
+    """Time from process start to the first request served from a snapshot."""
+    global _first_response_served
+    _first_response_served = True
+    logger.info(
+        "first_warm_response",
+        since_startup_ms=round((time.perf_counter() - _process_started) * 1000, 2),
+        data_source=snapshot.data_source,
+    )
+
+
+def get_games_since(snapshot: GamesSnapshot, since: int) -> PreparedJSON:
+    """
+    Pre-serialized delta of the games that changed after version `since`.
+
+    - since >= current version: empty "no change" delta
+    - since older than today's slate (or unknown): full=True, every game
+    - otherwise: only games whose last change is newer than `since`
+    Bodies are cached per `since` until the next snapshot version, so
+    clients polling in step share one serialization.
+    """
+    global _delta_cache_version
+
+    if _delta_cache_version != snapshot.version:
+        _delta_cache.clear()
+        _delta_cache_version = snapshot.version
+
+    since = min(since, snapshot.version)
+    cached = _delta_cache.get(since)
+    if cached is not None:
+        delta_cache.inc("hit")
+        return cached
+    delta_cache.inc("miss")
+
+    games = snapshot.response.games
+    if since < snapshot.base_version:
+        delta = GameDeltaResponse(
+            games=games,
+            removed_ids=[],
+            full=True,
+            version=snapshot.version,
+            last_updated=snapshot.response.last_updated,
+        )
+    else:
+        delta = GameDeltaResponse(
+            games=[g for g in games if snapshot.game_versions[g.id] > since],
+            removed_ids=[
+                game_id for game_id, v in snapshot.removed_versions.items() if v > since
+            ],
+            full=False,
+            version=snapshot.version,
+            last_updated=snapshot.response.last_updated,
+        )
+
+    body = PreparedJSON.from_model(delta, fast=True)
+    if len(_delta_cache) < DELTA_CACHE_SIZE:
+        _delta_cache[since] = body
+    return body
 
 
 class GameService:
     """Handles game-related business logic."""
 
-    def __init__(self, provider: BalldontlieProvider):
+    def __init__(self, provider: GameProvider):
         self._provider = provider
 
-    def get_todays_games(self) -> GameListResponse:
-        """Get all games scheduled for today with current scores."""
-        global _games_cache, _cache_timestamp
+    async def get_todays_games(self) -> GameListResponse:
+        """Get today's games from the published snapshot."""
+        return (await self.get_todays_snapshot()).response
 
-        now = datetime.now(UTC)
+    async def get_todays_snapshot(self) -> GamesSnapshot:
+        """
+        Get the published snapshot for today.
 
-        # Return cached data if still valid
-        if (
-            _games_cache is not None
-            and _cache_timestamp is not None
-            and (now - _cache_timestamp).total_seconds() < CACHE_TTL_SECONDS
-        ):
-            cache_age_ms = (now - _cache_timestamp).total_seconds() * 1000
-            logger.debug(
-                "cache_hit",
-                cache_age_ms=round(cache_age_ms, 2),
-                game_count=len(_games_cache.games),
+        Never calls upstream. Only the very first requests after startup can
+        wait, and only until the poller publishes its first snapshot.
+        """
+        snapshot = _snapshot
+        if snapshot is not None:
+            # Stale = upstream failed since this snapshot was published
+            snapshot_reads.inc("stale" if _last_refresh_error else "hit")
+            if not _first_response_served:
+                _log_first_response(snapshot)
+            return snapshot
+
+        snapshot_reads.inc("miss")
+        logger.info("waiting_for_first_snapshot")
+        try:
+            await asyncio.wait_for(
+                _snapshot_ready.wait(), timeout=FIRST_SNAPSHOT_TIMEOUT_SECONDS
             )
-            return _games_cache
+        except TimeoutError:
+            raise GamesUnavailableError(
+                _last_refresh_error or "Game data is not available yet"
+            ) from None
+        if not _first_response_served:
+            _log_first_response(_snapshot)
+        return _snapshot
 
-        # Use US Eastern time for date (NBA schedule timezone)
-        eastern_now = datetime.now(US_EASTERN)
-        today = eastern_now.date()
+    async def get_date_body(self, game_date: date) -> PreparedJSON:
+        """
+        The slate for any date, as a prepared GameListResponse body.
 
-        logger.info(
-            "fetching_games",
-            date=today.isoformat(),
-            eastern_time=eastern_now.strftime("%H:%M:%S"),
+        The poller's date is served from its snapshot; any other date from
+        the date cache, fetching from upstream only when the cached slate
+        has expired (see schedule_cache.py).
+        """
+        snapshot = _snapshot
+        if snapshot is None and game_date == datetime.now(US_EASTERN).date():
+            snapshot = await self.get_todays_snapshot()
+        if snapshot is not None and snapshot.game_date == game_date:
+            return snapshot.body
+
+        slate = _dates.get(game_date)
+        if slate is not None and _dates.is_fresh(slate):
+            date_cache.inc("hit")
+            return slate.body
+        return (
+            await _date_flight.do(game_date, lambda: self._load_date(game_date))
+        ).body
+
+    async def get_range_body(self, start: date, end: date) -> PreparedJSON:
+        """Slates for start..end inclusive: {"dates": {"<date>": slate}}."""
+        days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        bodies = await asyncio.gather(*(self.get_date_body(day) for day in days))
+        return _dates.range_body(list(zip(days, bodies, strict=True)))
+
+    async def refresh_date(self, game_date: date) -> DateSlate:
+        """Re-fetch a date into the date cache, fresh or not (prefetching)."""
+        return await _date_flight.do(
+            game_date, lambda: self._load_date(game_date, force=True)
         )
 
-        # Try to fetch fresh data
-        try:
-            # Try box scores first (has live scores), fall back to games
+    async def _load_date(self, game_date: date, force: bool = False) -> DateSlate:
+        """
+        Build a date slate: a saved final date from disk, a future date from
+        the schedule index, anything else from upstream.
+
+        With several workers, one builds it while the others wait on the
+        date's shared lock and then take its slate.
+        """
+        today = datetime.now(US_EASTERN).date()
+        cached = _dates.get(game_date)
+        if cached is not None and (
+            cached.final or (not force and _dates.is_fresh(cached))
+        ):
+            # Final, or refreshed by a flight that finished since our check
+            date_cache.inc("hit")
+            return cached
+
+        if _shared is None:
+            return await self._build_date(game_date, today, cached)
+        async with _shared.lock(_date_entry(game_date), SHARED_DATE_LOCK_SECONDS):
+            # The lock is best effort: on timeout, build it anyway
+            shared = None if force else _load_shared_date(game_date, today)
+            if shared is not None:
+                date_cache.inc("shared")
+                _dates.put(shared)
+                return shared
+            slate = await self._build_date(game_date, today, cached)
+            if slate is not cached:
+                _share_date(slate)
+            return slate
+
+    async def _build_date(
+        self, game_date: date, today: date, cached: DateSlate | None
+    ) -> DateSlate:
+        if cached is None and _store is not None and game_date < today:
+            saved = await asyncio.to_thread(_store.load_slate, game_date)
+            if saved is not None:
+                response = saved[0]
+                slate = _dates.build(
+                    game_date,
+                    today,
+                    response,
+                    PreparedJSON.from_model(response),
+                    "disk",
+                )
+                if slate.final:
+                    date_cache.inc("disk")
+                    _dates.put(slate)
+                    return slate
+
+        now = datetime.now(UTC)
+        schedule = _schedule
+        if game_date > today and schedule is not None and schedule.covers(game_date):
+            # Nothing has happened on a future date yet - the index has it all
+            games, data_source = schedule.games_on(game_date), "schedule"
+            date_cache.inc("schedule")
+        else:
             try:
-                response = self._provider.fetch_box_scores_by_date(today)
-                games = [self._transform_box_score(g) for g in response.data]
-                data_source = "box_scores"
-            except Exception as box_err:
+                games, data_source = await self._fetch_full_day(game_date, None)
+            except Exception as e:
+                if cached is None:
+                    raise
+                date_cache.inc("stale")
                 logger.warning(
-                    "box_scores_fallback",
-                    error_type=type(box_err).__name__,
-                    error_message=str(box_err),
+                    "serving_stale_date_slate",
+                    date=game_date.isoformat(),
+                    error_type=type(e).__name__,
+                    error_message=str(e),
                 )
-                # Fall back to games endpoint
-                response = self._provider.fetch_games_by_date(today)
-                games = [self._transform_game(g) for g in response.data]
-                data_source = "games"
-
-            # Count game statuses for logging
-            live_count = sum(1 for g in games if g.status == GameStatus.IN_PROGRESS)
-            scheduled_count = sum(1 for g in games if g.status == GameStatus.SCHEDULED)
-            final_count = sum(1 for g in games if g.status == GameStatus.FINAL)
-
-            # Sort: live games first, then scheduled, then final
-            games.sort(
-                key=lambda g: (
-                    0
-                    if g.status == GameStatus.IN_PROGRESS
-                    else 1
-                    if g.status == GameStatus.SCHEDULED
-                    else 2
-                )
-            )
+                return cached
+            date_cache.inc("miss")
+
+        _sort_slate(games)
+        # Past dates stay unscored: the feature state already includes their
+        # results, so a "prediction" now would be hindsight
+        response = GameListResponse(
+            games=(
+                _predictions.attach(games, game_date)
+                if game_date >= today
+                else unscored(games)
+            ),
+            last_updated=now,
+            version=_next_version(None, now),
+        )
+        slate = _dates.build(
+            game_date,
+            today,
+            response,
+            PreparedJSON.from_model(response),
+            "schedule" if data_source == "schedule" else "upstream",
+        )
+        _dates.put(slate)
+        if slate.final:
+            await _save_final_slate(slate)
 
-            result = GameListResponse(games=games, last_updated=now)
+        logger.info(
+            "date_slate_fetched",
+            date=game_date.isoformat(),
+            data_source=data_source,
+            game_count=len(games),
+            final=slate.final,
+        )
+        return slate
 
-            # Update cache
-            _games_cache = result
-            _cache_timestamp = now
+    async def refresh_schedule(self, season: int | None = None) -> ScheduleIndex:
+        """
+        Page through a season's games (default: the current season) and
+        swap in a freshly built schedule index.
 
-            logger.info(
-                "games_fetched",
-                data_source=data_source,
-                total_games=len(games),
-                live_games=live_count,
-                scheduled_games=scheduled_count,
-                final_games=final_count,
+        Pages are fetched at backfill priority, so a rebuild never delays a
+        live refresh. On failure the previous index stays in place.
+        """
+        global _schedule
+
+        season = season or current_season(datetime.now(US_EASTERN).date())
+        start = time.perf_counter()
+        games = []
+        pages = 0
+        cursor = None
+        while True:
+            raw = await self._provider.fetch_games_page_raw(
+                seasons=[season], cursor=cursor, priority=Priority.BACKFILL
             )
+            page, next_cursor = decode_schedule_page(raw)
+            games.extend(page)
+            pages += 1
+            if next_cursor is None or next_cursor == cursor or not page:
+                break
+            cursor = next_cursor
 
-            return result
+        schedule = ScheduleIndex.build(season, games, datetime.now(UTC))
+        # Finals the poller published since these pages were read
+        snapshot = _snapshot
+        if snapshot is not None:
+            schedule = schedule.with_results(snapshot.response.games) or schedule
+        _schedule = schedule
+        _share(SCHEDULE_ENTRY, schedule.to_bytes())
 
+        logger.info(
+            "schedule_index_built",
+            season=season,
+            pages=pages,
+            games=len(schedule),
+            teams=len(schedule.teams),
+            index_bytes=schedule.nbytes,
+            duration_ms=round((time.perf_counter() - start) * 1000, 2),
+        )
+        return schedule
+
+    async def refresh_todays_games(self) -> GamesSnapshot:
+        """
+        Fetch today's games from upstream and publish a new snapshot.
+
+        Called by the background poller only. On failure the previous
+        snapshot stays published and the error is re-raised so the poller
+        can back off. Each stage is timed into the "refresh" trace.
+        """
+        with trace("refresh"):
+            return await self._refresh_todays_games()
+
+    async def _refresh_todays_games(self) -> GamesSnapshot:
+        global _last_refresh_error
+
+        now = datetime.now(UTC)
+
+        # Use US Eastern time for date (NBA schedule timezone)
+        eastern_now = datetime.now(US_EASTERN)
+        today = eastern_now.date()
+
+        logger.info(
+            "fetching_games",
+            date=today.isoformat(),
+            eastern_time=eastern_now.strftime("%H:%M:%S"),
+        )
+
+        previous = _snapshot
+        started = time.perf_counter()
+
+        try:
+            games, data_source = None, "box_scores_live"
+            if self._can_refresh_incrementally(previous, today, now):
+                games = await self._fetch_live_merge(previous)
+            if games is None:
+                games, data_source = await self._fetch_full_day(today, previous)
         except Exception as e:
             error_type = type(e).__name__
+            refresh_failures.inc(error_type)
+            _last_refresh_error = f"Failed to fetch games from NBA API: {e!s}"
             logger.error(
                 "fetch_games_failed",
                 error_type=error_type,
                 error_message=str(e),
-                has_cache=_games_cache is not None,
+                has_cache=previous is not None,
             )
-            # Return stale cache if available
-            if _games_cache is not None:
-                cache_age_s = (
-                    (now - _cache_timestamp).total_seconds()
-                    if _cache_timestamp
-                    else None
-                )
+            if previous is not None:
+                _share_snapshot(previous)  # so followers report it stale too
+                cache_age_s = (now - previous.fetched_at).total_seconds()
                 logger.warning(
-                    "returning_stale_cache",
-                    cache_age_seconds=round(cache_age_s, 1) if cache_age_s else None,
-                    game_count=len(_games_cache.games),
+                    "serving_stale_snapshot",
+                    cache_age_seconds=round(cache_age_s, 1),
+                    game_count=len(previous.response.games),
                 )
-                return _games_cache
-            # Re-raise if no cache available
             raise
 
-    def _transform_box_score(self, box_score) -> Game:
-        """Transform box score object to our Game model (has live scores)."""
-        status = self._parse_status(getattr(box_score, "status", "") or "")
-
-        # Box scores have home_team and visitor_team with nested data
-        home = box_score.home_team
-        visitor = box_score.visitor_team
-
-        return Game(
-            id=getattr(box_score, "id", 0) or hash(f"{home.id}-{visitor.id}"),
-            status=status,
-            status_text=self._format_box_score_status(box_score, status),
-            period=getattr(box_score, "period", 0) or 0,
-            time_remaining=getattr(box_score, "time", None),
-            home_team=Team(
-                id=home.id,
-                name=home.name,
-                city=home.city,
-                abbreviation=home.abbreviation,
-                score=getattr(box_score, "home_team_score", 0) or 0,
-            ),
-            away_team=Team(
-                id=visitor.id,
-                name=visitor.name,
-                city=visitor.city,
-                abbreviation=visitor.abbreviation,
-                score=getattr(box_score, "visitor_team_score", 0) or 0,
-            ),
-            start_time=self._parse_datetime(getattr(box_score, "datetime", None)),
+        reconciled_at = (
+            previous.reconciled_at if data_source == "box_scores_live" else now
         )
 
-    def _format_box_score_status(self, box_score, status: GameStatus) -> str:
-        """Format status text for box score data."""
-        if status == GameStatus.FINAL:
-            return "Final"
-        elif status == GameStatus.IN_PROGRESS:
-            period = getattr(box_score, "period", 0) or 0
-            time_remaining = getattr(box_score, "time", "") or ""
-            period_name = self._get_period_name(period)
-            return f"{period_name} {time_remaining}".strip()
+        # Count game statuses for logging
+        live_count = sum(1 for g in games if g.status == GameStatus.IN_PROGRESS)
+        scheduled_count = sum(1 for g in games if g.status == GameStatus.SCHEDULED)
+        final_count = sum(1 for g in games if g.status == GameStatus.FINAL)
+
+        _sort_slate(games)
+        lap("sort")
+
+        games = _live_probability.apply(_predictions.attach(games, today))
+        lap("predict")
+
+        if (
+            previous is not None
+            and previous.game_date == today
+            and previous.response.games == games
+        ):
+            # Nothing changed - keep the serialized body and ETag so clients
+            # revalidate with a 304 instead of downloading the same slate
+            snapshot = replace(
+                previous,
+                data_source=data_source,
+                fetched_at=now,
+                reconciled_at=reconciled_at,
+            )
         else:
-            # Scheduled
-            raw_status = getattr(box_score, "status", "")
-            dt = self._parse_datetime(raw_status)
-            if dt:
-                # Convert to Eastern time for display
-                et_time = dt.astimezone(US_EASTERN)
-                return et_time.strftime("%-I:%M %p ET")
-            return "TBD"
-
-    def _transform_game(self, game) -> Game:
-        """Transform SDK game object to our Game model."""
-        status = self._parse_status(getattr(game, "status", "") or "")
-
-        return Game(
-            id=game.id,
-            status=status,
-            status_text=self._format_status_text(game, status),
-            period=getattr(game, "period", 0) or 0,
-            time_remaining=getattr(game, "time", None),
-            home_team=Team(
-                id=game.home_team.id,
-                name=game.home_team.name,
-                city=game.home_team.city,
-                abbreviation=game.home_team.abbreviation,
-                score=getattr(game, "home_team_score", 0) or 0,
-            ),
-            away_team=Team(
-                id=game.visitor_team.id,
-                name=game.visitor_team.name,
-                city=game.visitor_team.city,
-                abbreviation=game.visitor_team.abbreviation,
-                score=getattr(game, "visitor_team_score", 0) or 0,
-            ),
-            start_time=self._parse_datetime(getattr(game, "datetime", None))
-            or self._parse_datetime(getattr(game, "status", None)),
+            snapshot = _build_snapshot(
+                previous, games, today, data_source, now, reconciled_at
+            )
+        lap("build")
+        _publish_snapshot(snapshot)
+        lap("publish")
+        refresh_duration.observe(time.perf_counter() - started, data_source)
+
+        logger.info(
+            "games_fetched",
+            data_source=data_source,
+            upstream_calls=get_coalescing_stats(),
+            total_games=len(games),
+            live_games=live_count,
+            scheduled_games=scheduled_count,
+            final_games=final_count,
         )
 
-    def _parse_status(self, status_str: str) -> GameStatus:
-        """Parse API status string to our enum."""
-        status_lower = status_str.lower()
-        if "final" in status_lower:
-            return GameStatus.FINAL
-        elif "qtr" in status_lower or "half" in status_lower or "ot" in status_lower:
-            return GameStatus.IN_PROGRESS
-        else:
-            # Scheduled games may have datetime in status field or "scheduled" text
-            return GameStatus.SCHEDULED
-
-    def _format_status_text(self, game, status: GameStatus) -> str:
-        """Format human-readable status text."""
-        if status == GameStatus.FINAL:
-            return "Final"
-        elif status == GameStatus.IN_PROGRESS:
-            period = getattr(game, "period", 0) or 0
-            time_remaining = getattr(game, "time", "") or ""
-            period_name = self._get_period_name(period)
-            return f"{period_name} {time_remaining}".strip()
-        else:
-            # Scheduled - try datetime field first, then status field (API returns datetime there)
-            dt = self._parse_datetime(getattr(game, "datetime", None))
-            if not dt:
-                # API sometimes puts datetime in status field for scheduled games
-                dt = self._parse_datetime(getattr(game, "status", None))
-            if dt:
-                # Convert to Eastern time for display
-                et_time = dt.astimezone(US_EASTERN)
-                return et_time.strftime("%-I:%M %p ET")
-            return "TBD"
-
-    def _get_period_name(self, period: int) -> str:
-        """Convert period number to display name."""
-        if period <= 4:
-            suffixes = {1: "1st", 2: "2nd", 3: "3rd", 4: "4th"}
-            return suffixes.get(period, f"{period}th")
-        else:
-            ot_num = period - 4
-            return f"OT{ot_num}" if ot_num > 1 else "OT"
+        return snapshot
 
-    def _parse_datetime(self, dt_value) -> datetime | None:
-        """Parse datetime from API - handles both string and datetime objects."""
-        if dt_value is None:
-            return None
-        # SDK might return datetime object directly
-        if isinstance(dt_value, datetime):
-            return dt_value
-        # Or it might be a string
-        if isinstance(dt_value, str):
-            try:
-                return datetime.fromisoformat(dt_value.replace("Z", "+00:00"))
-            except (ValueError, AttributeError):
+    def _can_refresh_incrementally(
+        self, previous: GamesSnapshot | None, today: date, now: datetime
+    ) -> bool:
+        """Live-only ticks are valid while today's slate has live games."""
+        return (
+            previous is not None
+            and previous.game_date == today
+            and (now - previous.reconciled_at).total_seconds() < FULL_RECONCILE_SECONDS
+            and any(g.status == GameStatus.IN_PROGRESS for g in previous.response.games)
+        )
+
+    async def _fetch_live_merge(self, previous: GamesSnapshot) -> list[Game] | None:
+        """
+        Merge /box_scores/live into the previous slate by game id.
+
+        Returns None when the live feed doesn't line up with the slate and a
+        full fetch is needed instead: a game we think is live is missing
+        from the feed (it just ended - we need its final score), or the feed
+        has a game that isn't on today's slate.
+        """
+        raw = await _live_flight.do(
+            "live",
+            lambda: self._provider.fetch_live_box_scores_raw(Priority.LIVE),
+        )
+        lap("upstream")
+        box_scores = decode_box_scores(raw)
+        lap("decode")
+
+        games_by_id = {g.id: g for g in previous.response.games}
+        live_ids = set()
+        for box_score in box_scores:
+            game_id = box_score_id(box_score)
+            current = games_by_id.get(game_id)
+            if current is None:
+                logger.info("live_merge_unknown_game", game_id=game_id)
                 return None
-        return None
+            live_ids.add(game_id)
+            if current.status == GameStatus.FINAL:
+                continue  # pinned - finals never change
+            games_by_id[game_id] = game_from_box_score(box_score)
+
+        ended = [
+            g.id
+            for g in previous.response.games
+            if g.status == GameStatus.IN_PROGRESS and g.id not in live_ids
+        ]
+        if ended:
+            logger.info("live_merge_games_left_feed", game_ids=ended)
+            return None
+
+        lap("transform")
+        logger.debug("live_merge", merged_games=len(live_ids))
+        return list(games_by_id.values())
+
+    async def _fetch_full_day(
+        self, today: date, previous: GamesSnapshot | None
+    ) -> tuple[list[Game], str]:
+        """Fetch every game for the date, reusing already-final games as-is."""
+        # Live refreshes jump the upstream budget queue
+        priority = (
+            Priority.LIVE
+            if previous is not None
+            and any(g.status == GameStatus.IN_PROGRESS for g in previous.response.games)
+            else Priority.SCHEDULE
+        )
+        pinned: dict[int, Game] = {}
+        if previous is not None and previous.game_date == today:
+            pinned = {
+                g.id: g for g in previous.response.games if g.status == GameStatus.FINAL
+            }
+
+        # Try box scores first (has live scores), fall back to games
+        try:
+            raw = await _box_scores_flight.do(
+                today,
+                lambda: self._provider.fetch_box_scores_by_date_raw(today, priority),
+            )
+            lap("upstream")
+            box_scores = decode_box_scores(raw)
+            lap("decode")
+            games = [
+                pinned.get(box_score_id(b)) or game_from_box_score(b)
+                for b in box_scores
+            ]
+            lap("transform")
+            return games, "box_scores"
+        except (RateLimitError, RateLimitTimeout):
+            # Out of budget - a fallback call would only spend more of it.
+            # Open box score circuits still fall back: /games has its own.
+            raise
+        except Exception as box_err:
+            lap("upstream")
+            logger.warning(
+                "box_scores_fallback",
+                error_type=type(box_err).__name__,
+                error_message=str(box_err),
+            )
+
+        # Fall back to games endpoint
+        raw = await _games_flight.do(
+            today,
+            lambda: self._provider.fetch_games_by_date_raw(today, priority),
+        )
+        lap("upstream_fallback")
+        wire_games = decode_games(raw)
+        lap("decode")
+        games = [pinned.get(box_score_id(g)) or game_from_game(g) for g in wire_games]
+        lap("transform")
+        return games, "games"
 
 
-def get_game_service(provider: BalldontlieProviderDep) -> GameService:
+def get_game_service(provider: GameProviderDep) -> GameService:
     """Factory for GameService with injected provider."""
     return GameService(provider)
 
@@ -1,17 +1,160 @@
+"""
+Async HTTP transport for the balldontlie.io API.
+
+The balldontlie SDK is synchronous and opens a fresh requests.Session per
+call, so every upstream call paid a TCP+TLS handshake and blocked the event
+loop. This wraps one long-lived httpx.AsyncClient instead:
+- Shared connection pool with keep-alive (handshake paid once, not per call)
+- HTTP/2, so concurrent calls multiplex over a single connection
+- Strict connect/read timeouts - a hung upstream fails fast instead of
+  stalling the refresh loop
+
+One instance is created and closed in the app lifespan (see app/main.py),
+plus a second, keyless one for the NBA CDN scoreboard that the failover
+provider falls back to (see app/providers/nba_cdn_provider.py). Error
+status codes map onto the SDK's exception types so callers and logs see
+the same errors as before.
+"""
+
+from typing import Any
+
 import httpx
+from balldontlie.exceptions import (
+    AuthenticationError,
+    BallDontLieException,
+    NotFoundError,
+    RateLimitError,
+    ServerError,
+    ValidationError,
+)
+
+from app.settings import settings
+
+BALLDONTLIE_BASE_URL = "https://api.balldontlie.io"
+
+# Timeouts (seconds). Read covers the slowest observed box_scores responses
+# with margin; anything slower is treated as a failure and retried next poll.
+CONNECT_TIMEOUT_SECONDS = 3.0
+READ_TIMEOUT_SECONDS = 8.0
+POOL_TIMEOUT_SECONDS = 2.0
+
+# Connection pool. We make at most a handful of concurrent upstream calls.
+MAX_CONNECTIONS = 10
+MAX_KEEPALIVE_CONNECTIONS = 5
+KEEPALIVE_EXPIRY_SECONDS = 60.0
+
+_STATUS_ERRORS: dict[int, type[BallDontLieException]] = {
+    400: ValidationError,
+    401: AuthenticationError,
+    404: NotFoundError,
+    429: RateLimitError,
+}
 
 
 class NBAApiService:
-    """Service for fetching NBA data from external APIs."""
+    """Pooled async client for balldontlie.io."""
 
-    def __init__(self):
-        self.client = httpx.AsyncClient()
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = BALLDONTLIE_BASE_URL,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        headers = {"Accept": "application/json"}
+        if api_key:
+            headers["Authorization"] = api_key
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            http2=True,
+            timeout=httpx.Timeout(
+                connect=CONNECT_TIMEOUT_SECONDS,
+                read=READ_TIMEOUT_SECONDS,
+                write=READ_TIMEOUT_SECONDS,
+                pool=POOL_TIMEOUT_SECONDS,
+            ),
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+            ),
+            # Tests/benchmarks inject a transport to talk to a local stand-in
+            transport=transport,
+        )
 
-    async def get_todays_games(self) -> list[dict]:
-        """Fetch today's games from NBA API."""
-        # Placeholder for real NBA API integration
-        # Will be implemented with actual API calls
-        return []
+    async def get_bytes(self, path: str, params: dict[str, Any] | None = None) -> bytes:
+        """GET a balldontlie endpoint and return the raw JSON body."""
+        try:
+            response = await self.client.get(path, params=params)
+        except httpx.HTTPError as e:
+            raise BallDontLieException(f"Request failed: {e!s}") from e
+
+        if response.is_error:
+            try:
+                body = response.json() if response.content else {}
+            except ValueError:
+                body = {}
+            message = body.get("error", response.reason_phrase)
+            error_cls = _STATUS_ERRORS.get(response.status_code)
+            if error_cls is None:
+                error_cls = (
+                    ServerError if response.status_code >= 500 else BallDontLieException
+                )
+            raise error_cls(message, response.status_code, body)
+
+        return response.content
 
     async def close(self):
         await self.client.aclose()
+
+
+# App-wide instances, owned by the lifespan
+_nba_api_service: NBAApiService | None = None
+_nba_cdn_service: NBAApiService | None = None
+
+
+def open_nba_api_service() -> NBAApiService:
+    """Create the shared client. Called once at startup."""
+    global _nba_api_service
+    if _nba_api_service is None:
+        _nba_api_service = NBAApiService(
+            api_key=settings.balldontlie_api_key,
+            base_url=settings.balldontlie_base_url,
+        )
+    return _nba_api_service
+
+
+def open_nba_cdn_service() -> NBAApiService | None:
+    """Create the CDN client, unless NBA_CDN_BASE_URL is empty (no failover)."""
+    global _nba_cdn_service
+    if _nba_cdn_service is None and settings.nba_cdn_base_url:
+        _nba_cdn_service = NBAApiService(api_key="", base_url=settings.nba_cdn_base_url)
+    return _nba_cdn_service
+
+
+async def close_nba_api_service() -> None:
+    """Close the shared clients and their pooled connections. Called at shutdown."""
+    global _nba_api_service, _nba_cdn_service
+    if _nba_api_service is not None:
+        await _nba_api_service.close()
+        _nba_api_service = None
+    if _nba_cdn_service is not None:
+        await _nba_cdn_service.close()
+        _nba_cdn_service = None
+
+
+def get_nba_api_service() -> NBAApiService:
+    """Dependency returning the shared client."""
+    if not settings.balldontlie_api_key:
+        raise ValueError(
+            "BALLDONTLIE_API_KEY not set. "
+            "Add it to 1Password (local section) and run 'task env'"
+        )
+    if _nba_api_service is None:
+        raise RuntimeError("NBA API client is not open (app lifespan not running)")
+    return _nba_api_service
+
+
+def get_nba_cdn_service() -> NBAApiService | None:
+    """The CDN client, None when failover is disabled."""
+    return _nba_cdn_service
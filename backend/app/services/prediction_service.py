@@ -0,0 +1,325 @@
+"""
+Pregame predictions for the slate, attached as GameWithPrediction.prediction.
+
+Scoring happens on the refresh path (the poller), never per request: each
+published snapshot already carries its predictions, so serving them costs
+nothing beyond the prebuilt body.
+
+A pregame prediction depends only on the matchup, the model and the feature
+definitions, so results are cached by (game id, model version,
+FEATURE_VERSION) and a 5s refresh tick re-scores nothing. Games not in the
+cache are scored together in one predict_proba call.
+
+Feature state and Elo ratings (ml/elo.py) come from the local game store
+(ml/data/games) at startup and are then fed every final the poller sees,
+so tomorrow's predictions account for tonight's results without waiting
+for the nightly ingest. Until a model has been trained, Elo alone predicts
+the slate.
+
+Models come from the registry (ml/registry.py). ModelReloader watches it and
+swaps a newly published version in with a single assignment: a batch being
+scored keeps the model it started with, and the next tick re-scores the
+slate under the new version (the cache key includes it).
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+from app.core.logging import get_logger
+from app.models.schemas import Game, GameStatus, GameWithPrediction, Prediction
+from ml.elo import EloRatings
+from ml.features import FEATURE_VERSION, FeatureEngine
+from ml.game_store import GameStore, current_season
+from ml.model import LinearGameModel
+from ml.registry import ModelRegistry
+
+logger = get_logger(__name__)
+
+# Comfortably more than a day's slate plus tomorrow's
+PREDICTION_CACHE_SIZE = 256
+
+# How often the reloader checks the registry for a new version
+MODEL_POLL_SECONDS = 30
+
+# Cache-key version of predictions made by the Elo fallback
+ELO_MODEL_VERSION = "elo"
+
+
+class PredictionService:
+    """Scores slates with one model and keeps the feature state current."""
+
+    def __init__(
+        self,
+        model: LinearGameModel | None,
+        engine: FeatureEngine,
+        elo: EloRatings | None = None,
+    ):
+        self.model = model
+        self.engine = engine
+        self.elo = elo or EloRatings()
+        self._cache: OrderedDict[tuple[int, str, int], Prediction] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.load_ms = 0.0
+        self.last_batch_ms = 0.0
+        self.last_batch_size = 0
+
+    @classmethod
+    def load(
+        cls,
+        models_dir: str | Path,
+        store_root: str | Path,
+        model_version: str | None = None,
+    ) -> "PredictionService":
+        """A registry model (newest unless pinned) plus feature state."""
+        start = time.perf_counter()
+        model_version = model_version or ModelRegistry(models_dir).latest()
+        model = (
+            LinearGameModel.load(models_dir, model_version) if model_version else None
+        )
+        model_ms = (time.perf_counter() - start) * 1000
+
+        store = GameStore(store_root)
+        columns = store.load_all(store.seasons()[-1:])
+        engine = FeatureEngine.from_columns(columns)
+        elo = EloRatings.from_store(store, Path(store_root).parent / "elo.npz")
+
+        service = cls(model, engine, elo)
+        service.load_ms = (time.perf_counter() - start) * 1000
+        logger.info(
+            "prediction_model_loaded",
+            model_version=model.version if model else None,
+            feature_version=FEATURE_VERSION,
+            model_load_ms=round(model_ms, 2),
+            total_load_ms=round(service.load_ms, 2),
+            history_games=len(columns["game_id"]),
+            elo_teams=len(elo.ratings),
+        )
+        return service
+
+    def swap_model(self, model: LinearGameModel) -> None:
+        """Serve `model` from the next batch on; in-flight batches finish."""
+        previous, self.model = self.model, model
+        logger.info(
+            "prediction_model_swapped",
+            previous_version=previous.version if previous else None,
+            model_version=model.version,
+        )
+
+    def attach(self, games: list[Game], game_date: date) -> list[GameWithPrediction]:
+        """The slate with predictions attached; scores only uncached games."""
+        model = self.model  # one model for the whole batch, even mid-swap
+        if model is None and not self.elo.ratings:
+            result = [_with_prediction(g, None) for g in games]
+            self.record_finals(games, game_date)
+            return result
+
+        version = model.version if model else ELO_MODEL_VERSION
+        predictions: dict[int, Prediction] = {}
+        missing: list[Game] = []
+        for game in games:
+            key = (game.id, version, FEATURE_VERSION)
+            cached = self._cache.get(key)
+            if cached is None:
+                missing.append(game)
+            else:
+                self._cache.move_to_end(key)
+                predictions[game.id] = cached
+        self.hits += len(games) - len(missing)
+
+        if missing:
+            self.misses += len(missing)
+            for game, prediction in zip(
+                missing, self._score(model, missing, game_date), strict=True
+            ):
+                predictions[game.id] = prediction
+                self._cache[(game.id, version, FEATURE_VERSION)] = prediction
+            while len(self._cache) > PREDICTION_CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+        # After scoring, so a final from this slate never feeds its own
+        # prediction
+        self.record_finals(games, game_date)
+        return [_with_prediction(g, predictions[g.id]) for g in games]
+
+    def _score(
+        self, model: LinearGameModel | None, games: list[Game], game_date: date
+    ) -> list[Prediction]:
+        """One vectorized call for the whole batch (Elo if there's no model)."""
+        start = time.perf_counter()
+        if model is None:
+            home_win = [
+                self.elo.home_win_probability(g.home_team.id, g.away_team.id)
+                for g in games
+            ]
+            spread = [
+                self.elo.params.spread(
+                    self.elo.rating(g.home_team.id), self.elo.rating(g.away_team.id)
+                )
+                for g in games
+            ]
+        else:
+            day = np.datetime64(game_date, "D")
+            season = current_season(game_date)
+            X = np.vstack(
+                [
+                    self.engine.features_for(
+                        g.home_team.id, g.away_team.id, day, season
+                    )
+                    for g in games
+                ]
+            )
+            home_win = model.predict_proba(X)[:, 1]
+            spread = model.predict_spread(X)
+
+        predictions = [
+            Prediction(
+                winner_id=g.home_team.id if p >= 0.5 else g.away_team.id,
+                confidence=round(float(max(p, 1.0 - p)), 3),
+                spread=round(float(s), 1),
+            )
+            for g, p, s in zip(games, home_win, spread, strict=True)
+        ]
+
+        self.last_batch_ms = (time.perf_counter() - start) * 1000
+        self.last_batch_size = len(games)
+        logger.info(
+            "predictions_scored",
+            model_version=model.version if model else ELO_MODEL_VERSION,
+            games=len(games),
+            duration_ms=round(self.last_batch_ms, 3),
+        )
+        return predictions
+
+    def record_finals(self, games: list[Game], game_date: date) -> None:
+        """Feed the finals among `games` to the feature state and Elo (idempotent)."""
+        day = np.datetime64(game_date, "D")
+        season = current_season(game_date)
+        for g in games:
+            if g.status == GameStatus.FINAL:
+                self.engine.add_final(
+                    game_id=g.id,
+                    game_date=day,
+                    season=season,
+                    home_team_id=g.home_team.id,
+                    visitor_team_id=g.away_team.id,
+                    home_score=g.home_team.score,
+                    visitor_score=g.away_team.score,
+                )
+                self.elo.update(
+                    g.id,
+                    day,
+                    season,
+                    g.home_team.id,
+                    g.away_team.id,
+                    g.home_team.score,
+                    g.away_team.score,
+                )
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "model_version": self.model.version
+            if self.model
+            else ELO_MODEL_VERSION
+            if self.elo.ratings
+            else None,
+            "feature_version": FEATURE_VERSION,
+            "cache_size": len(self._cache),
+            "cache_hits": self.hits,
+            "cache_misses": self.misses,
+            "load_ms": round(self.load_ms, 2),
+            "last_batch_ms": round(self.last_batch_ms, 3),
+            "last_batch_size": self.last_batch_size,
+        }
+
+
+class ModelReloader:
+    """Polls the registry and hot-swaps the service's model on a new version."""
+
+    def __init__(
+        self,
+        service: PredictionService,
+        models_dir: str | Path,
+        interval: float = MODEL_POLL_SECONDS,
+    ):
+        self._service = service
+        self._models_dir = models_dir
+        self._registry = ModelRegistry(models_dir)
+        self._interval = interval
+        self._task: asyncio.Task | None = None
+        self._failed_version: str | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="model-reloader")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def check(self) -> bool:
+        """Load and swap in the newest version if it changed. True if swapped."""
+        latest = await asyncio.to_thread(self._registry.latest)
+        current = self._service.model.version if self._service.model else None
+        if latest is None or latest == current or latest == self._failed_version:
+            return False
+
+        start = time.perf_counter()
+        try:
+            model = await asyncio.to_thread(
+                LinearGameModel.load, self._models_dir, latest
+            )
+        except Exception as e:
+            # Keep serving the current model; don't retry this version
+            self._failed_version = latest
+            logger.error(
+                "prediction_model_reload_failed",
+                model_version=latest,
+                error_type=type(e).__name__,
+                error_message=str(e),
+            )
+            return False
+
+        logger.info(
+            "prediction_model_reloaded",
+            model_version=latest,
+            load_ms=round((time.perf_counter() - start) * 1000, 2),
+        )
+        self._service.swap_model(model)
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                await self.check()
+            except Exception as e:
+                logger.warning(
+                    "model_registry_check_failed",
+                    error_type=type(e).__name__,
+                    error_message=str(e),
+                )
+
+
+def unscored(games: list[Game]) -> list[GameWithPrediction]:
+    """The games with no prediction attached, and no finals recorded."""
+    return [_with_prediction(g, None) for g in games]
+
+
+def _with_prediction(game: Game, prediction: Prediction | None) -> GameWithPrediction:
+    if isinstance(game, GameWithPrediction) and game.prediction == prediction:
+        return game
+    # Fields are already validated - skip re-validation on every tick
+    fields = {**game.__dict__, "prediction": prediction}
+    return GameWithPrediction.model_construct(**fields)
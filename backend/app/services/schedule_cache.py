@@ -0,0 +1,162 @@
+"""
+Per-date slates for /api/games?date= and /api/games/range.
+
+Today's slate is the poller's snapshot (see game_service.py). Every other
+date is fetched on demand and kept here, in a bounded LRU keyed by date,
+for as long as that date can reasonably still change:
+- past date, every game final: never expires, and is persisted to the
+  snapshot store's slates table, so neither a restart nor an LRU eviction
+  costs another upstream call
+- past date still settling (a game past midnight, a postponement):
+  PAST_UNSETTLED_TTL_SECONDS
+- today, when the poller isn't serving it yet (the minutes after midnight
+  Eastern): TODAY_TTL_SECONDS
+- future dates and past off days: SCHEDULE_TTL_SECONDS - schedules rarely
+  change, and tomorrow is re-fetched after every midnight by the
+  prefetcher (see game_poller.py)
+
+Expired entries stay cached and are served if their refresh fails. Each
+entry keeps its body pre-serialized and pre-compressed like /today, and
+range bodies are spliced together from the per-date bodies.
+"""
+
+import math
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date
+
+from app.core.http_cache import PreparedJSON
+from app.models.schemas import GameListResponse, GameStatus
+
+# Dates kept in memory. Finals evicted from here reload from disk.
+DATE_CACHE_SIZE = 64
+# Spliced range bodies kept (keyed by the per-date bodies they contain)
+RANGE_CACHE_SIZE = 16
+
+PAST_UNSETTLED_TTL_SECONDS = 60
+TODAY_TTL_SECONDS = 30
+SCHEDULE_TTL_SECONDS = 6 * 3600
+
+
+@dataclass(frozen=True, slots=True)
+class DateSlate:
+    """One date's games, ready to serve."""
+
+    game_date: date
+    response: GameListResponse
+    body: PreparedJSON
+    final: bool  # past date, every game final - never changes again
+    expires_at: float  # monotonic; inf when final
+    # "upstream", "disk", "schedule" (the season index), "snapshot" (handed
+    # over by the poller) or "shared" (built by another worker)
+    source: str
+
+
+def is_final_slate(game_date: date, today: date, response: GameListResponse) -> bool:
+    """A past date whose every game is final."""
+    return (
+        game_date < today
+        and bool(response.games)
+        and all(g.status == GameStatus.FINAL for g in response.games)
+    )
+
+
+def slate_ttl(game_date: date, today: date, response: GameListResponse) -> float:
+    """Seconds a slate for `game_date` stays fresh (inf: forever)."""
+    if is_final_slate(game_date, today, response):
+        return math.inf
+    if game_date == today:
+        return TODAY_TTL_SECONDS
+    if game_date < today and response.games:
+        return PAST_UNSETTLED_TTL_SECONDS
+    return SCHEDULE_TTL_SECONDS
+
+
+class DateSlateCache:
+    """Bounded LRU of DateSlates, with the TTL policy above."""
+
+    def __init__(
+        self,
+        size: int = DATE_CACHE_SIZE,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.size = size
+        self._clock = clock
+        self._slates: OrderedDict[date, DateSlate] = OrderedDict()
+        self._ranges: OrderedDict[tuple[str, ...], PreparedJSON] = OrderedDict()
+
+    def build(
+        self,
+        game_date: date,
+        today: date,
+        response: GameListResponse,
+        body: PreparedJSON,
+        source: str,
+        expires_in: float | None = None,
+    ) -> DateSlate:
+        """A slate expiring per the TTL policy, or in `expires_in` seconds."""
+        if expires_in is None:
+            expires_in = slate_ttl(game_date, today, response)
+        return DateSlate(
+            game_date=game_date,
+            response=response,
+            body=body,
+            final=is_final_slate(game_date, today, response),
+            expires_at=self._clock() + expires_in,
+            source=source,
+        )
+
+    def expires_in(self, slate: DateSlate) -> float:
+        """Seconds until a slate expires (inf for finals, negative if stale)."""
+        return slate.expires_at - self._clock()
+
+    def get(self, game_date: date) -> DateSlate | None:
+        """The cached slate for a date, fresh or not."""
+        slate = self._slates.get(game_date)
+        if slate is not None:
+            self._slates.move_to_end(game_date)
+        return slate
+
+    def is_fresh(self, slate: DateSlate) -> bool:
+        return self._clock() < slate.expires_at
+
+    def put(self, slate: DateSlate) -> None:
+        self._slates[slate.game_date] = slate
+        self._slates.move_to_end(slate.game_date)
+        while len(self._slates) > self.size:
+            self._slates.popitem(last=False)
+
+    def range_body(self, bodies: list[tuple[date, PreparedJSON]]) -> PreparedJSON:
+        """
+        {"dates": {"<iso date>": <slate body>, ...}} as one prepared body.
+
+        Built by splicing the per-date JSON, and reused while every date's
+        body is unchanged.
+        """
+        key = tuple(f"{day.isoformat()}{body.etag}" for day, body in bodies)
+        cached = self._ranges.get(key)
+        if cached is not None:
+            self._ranges.move_to_end(key)
+            return cached
+        content = (
+            b'{"dates":{'
+            + b",".join(
+                b'"' + day.isoformat().encode() + b'":' + body.content
+                for day, body in bodies
+            )
+            + b"}}"
+        )
+        prepared = PreparedJSON.from_bytes(content, fast=True)
+        self._ranges[key] = prepared
+        while len(self._ranges) > RANGE_CACHE_SIZE:
+            self._ranges.popitem(last=False)
+        return prepared
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "dates": len(self._slates),
+            "final_dates": sum(1 for s in self._slates.values() if s.final),
+            "ranges": len(self._ranges),
+        }
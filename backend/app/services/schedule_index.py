@@ -0,0 +1,360 @@
+"""
+In-memory index of a season's schedule.
+
+The season's /games pages (about 1,230 regular season games plus playoffs)
+are decoded once into NumPy columns, one row per game, sorted by date,
+tipoff and id - a few dozen KB instead of a list of Pydantic models. On top
+of the columns:
+- date -> games: a binary search over the sorted date column
+- team -> games, (team, opponent) -> games: row numbers per key, in
+  chronological order
+- game id -> row, for tipoff lookups
+
+Games are only materialized (as GameWithPrediction, unscored) for the rows
+a request returns. Ids use box_score_id's scheme, so they match the games
+served from /api/games.
+
+An index is immutable. Finals the poller publishes are folded in by
+with_results, which copies the few result columns and shares the rest, and
+the whole index is rebuilt from upstream once a day (see game_poller.py).
+to_bytes/from_bytes ship it to the other workers as raw column buffers.
+"""
+
+from copy import copy
+from datetime import UTC, date, datetime
+from functools import lru_cache
+from typing import NotRequired, TypedDict
+
+import numpy as np
+from pydantic import TypeAdapter
+
+from app.core.shared_state import pack, unpack
+from app.models.schemas import Game, GameStatus, GameWithPrediction
+from app.services.game_decoder import (
+    WireGame,
+    box_score_id,
+    parse_datetime,
+    parse_status,
+    period_name,
+    tipoff_text,
+)
+
+# Status column codes
+_STATUSES = (GameStatus.SCHEDULED, GameStatus.IN_PROGRESS, GameStatus.FINAL)
+_STATUS_CODES = {status: code for code, status in enumerate(_STATUSES)}
+_FINAL = _STATUS_CODES[GameStatus.FINAL]
+
+# Tipoff column value when upstream has no tipoff time (sorts last)
+NO_TIPOFF = np.iinfo(np.int64).max
+
+# Column name -> dtype
+COLUMNS: dict[str, np.dtype] = {
+    "game_id": np.dtype(np.int64),
+    "date": np.dtype("datetime64[D]"),
+    "tipoff": np.dtype(np.int64),  # epoch seconds, NO_TIPOFF if unknown
+    "home_team_id": np.dtype(np.int16),
+    "visitor_team_id": np.dtype(np.int16),
+    "home_score": np.dtype(np.int16),
+    "visitor_score": np.dtype(np.int16),
+    "period": np.dtype(np.int8),
+    "status": np.dtype(np.int8),
+}
+
+# Columns with_results replaces; the others never change within an index
+_RESULT_COLUMNS = ("home_score", "visitor_score", "period", "status")
+
+
+class WireScheduleGame(WireGame):
+    """A /games entry, plus the tipoff it carries after the game starts."""
+
+    datetime: NotRequired[str | None]
+
+
+class _Meta(TypedDict):
+    next_cursor: NotRequired[int | None]
+
+
+class _SchedulePage(TypedDict):
+    data: list[WireScheduleGame]
+    meta: NotRequired[_Meta]
+
+
+_page_adapter = TypeAdapter(_SchedulePage)
+
+
+def decode_schedule_page(raw: bytes) -> tuple[list[WireScheduleGame], int | None]:
+    """A /games page body: its games and the cursor of the next page."""
+    page = _page_adapter.validate_json(raw)
+    return page["data"], page.get("meta", {}).get("next_cursor")
+
+
+@lru_cache(maxsize=4096)
+def _scheduled_text(tipoff: int | None) -> str:
+    if tipoff is None:
+        return tipoff_text(None)
+    return tipoff_text(datetime.fromtimestamp(tipoff, UTC))
+
+
+def _group_rows(keys: np.ndarray, rows: np.ndarray) -> dict[int, np.ndarray]:
+    """Row numbers per key, each group in ascending (chronological) order."""
+    order = np.lexsort((rows, keys))
+    unique, starts = np.unique(keys[order], return_index=True)
+    groups = np.split(rows[order], starts[1:])
+    return {int(k): g for k, g in zip(unique, groups, strict=True)}
+
+
+def _pair_key(team_ids: np.ndarray, opponent_ids: np.ndarray) -> np.ndarray:
+    """Order-independent key of a matchup."""
+    low = np.minimum(team_ids, opponent_ids).astype(np.int64)
+    high = np.maximum(team_ids, opponent_ids).astype(np.int64)
+    return low * 10_000 + high
+
+
+class ScheduleIndex:
+    """A season's games as columns, with date, team and matchup lookups."""
+
+    def __init__(
+        self,
+        season: int,
+        columns: dict[str, np.ndarray],
+        teams: dict[int, tuple[str, str, str]],
+        fetched_at: datetime,
+    ):
+        self.season = season
+        self.columns = columns
+        self.teams = teams  # team id -> (name, city, abbreviation)
+        self.fetched_at = fetched_at
+
+        rows = np.arange(len(columns["game_id"]), dtype=np.int32)
+        home, visitor = columns["home_team_id"], columns["visitor_team_id"]
+        self._rows_by_id = {int(g): int(r) for r, g in enumerate(columns["game_id"])}
+        self._team_rows = _group_rows(
+            np.concatenate([home, visitor]), np.concatenate([rows, rows])
+        )
+        self._pair_rows = _group_rows(_pair_key(home, visitor), rows)
+        tipoffs = columns["tipoff"]
+        self._tipoffs = np.sort(tipoffs[tipoffs != NO_TIPOFF])
+
+    @classmethod
+    def build(
+        cls, season: int, games: list[WireScheduleGame], fetched_at: datetime
+    ) -> "ScheduleIndex":
+        """Index decoded /games entries (entries without a date are skipped)."""
+        games = [g for g in games if g.get("date")]
+        columns = {
+            name: np.zeros(len(games), dtype=dtype) for name, dtype in COLUMNS.items()
+        }
+        teams: dict[int, tuple[str, str, str]] = {}
+        for i, g in enumerate(games):
+            raw_status = g.get("status") or ""
+            tipoff = parse_datetime(g.get("datetime")) or parse_datetime(raw_status)
+            home, visitor = g["home_team"], g["visitor_team"]
+            columns["game_id"][i] = box_score_id(g)
+            columns["date"][i] = np.datetime64(g["date"][:10], "D")
+            columns["tipoff"][i] = (
+                int(tipoff.timestamp()) if tipoff is not None else NO_TIPOFF
+            )
+            columns["home_team_id"][i] = home["id"]
+            columns["visitor_team_id"][i] = visitor["id"]
+            columns["home_score"][i] = g.get("home_team_score") or 0
+            columns["visitor_score"][i] = g.get("visitor_team_score") or 0
+            columns["period"][i] = g.get("period") or 0
+            columns["status"][i] = _STATUS_CODES[parse_status(raw_status)]
+            for team in (home, visitor):
+                teams[team["id"]] = (team["name"], team["city"], team["abbreviation"])
+
+        order = np.lexsort((columns["game_id"], columns["tipoff"], columns["date"]))
+        columns = {name: array[order] for name, array in columns.items()}
+        return cls(season, columns, teams, fetched_at)
+
+    def to_bytes(self) -> bytes:
+        """The index as one blob: column buffers plus a JSON header."""
+        return pack(
+            {
+                "season": self.season,
+                "fetched_at": self.fetched_at.isoformat(),
+                "teams": [[team_id, *names] for team_id, names in self.teams.items()],
+            },
+            {name: array.tobytes() for name, array in self.columns.items()},
+        )
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> "ScheduleIndex":
+        header, parts = unpack(blob)
+        columns = {
+            name: np.frombuffer(parts[name], dtype=dtype)
+            for name, dtype in COLUMNS.items()
+        }
+        return cls(
+            header["season"],
+            columns,
+            {team_id: tuple(names) for team_id, *names in header["teams"]},
+            datetime.fromisoformat(header["fetched_at"]),
+        )
+
+    def __len__(self) -> int:
+        return len(self.columns["game_id"])
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the columns."""
+        return sum(array.nbytes for array in self.columns.values())
+
+    def covers(self, game_date: date) -> bool:
+        """Whether `game_date` falls inside the season's known schedule."""
+        days = self.columns["date"]
+        return len(days) > 0 and days[0] <= np.datetime64(game_date, "D") <= days[-1]
+
+    def game_ids_on(self, game_date: date) -> np.ndarray:
+        """Ids of the games on a date, in tipoff order."""
+        return self.columns["game_id"][self._date_slice(game_date)]
+
+    def games_on(self, game_date: date) -> list[GameWithPrediction]:
+        """The games on a date, in tipoff order."""
+        return self._games(self._date_slice(game_date))
+
+    def team_games(
+        self, team_id: int, opponent_id: int | None = None
+    ) -> list[GameWithPrediction] | None:
+        """A team's games (against `opponent_id` only, if given); None if unknown."""
+        if team_id not in self._team_rows:
+            return None
+        if opponent_id is None:
+            rows = self._team_rows[team_id]
+        else:
+            key = int(_pair_key(np.array(team_id), np.array(opponent_id)))
+            rows = self._pair_rows.get(key, np.empty(0, dtype=np.int32))
+        return self._games(rows)
+
+    def next_game(self, team_id: int, today: date) -> GameWithPrediction | None:
+        """A team's first game on or after `today` that isn't final."""
+        rows = self._team_rows.get(team_id)
+        if rows is None:
+            return None
+        days = self.columns["date"][rows]
+        start = int(np.searchsorted(days, np.datetime64(today, "D")))
+        upcoming = rows[start:]
+        pending = upcoming[self.columns["status"][upcoming] != _FINAL]
+        return self._games(pending[:1])[0] if len(pending) else None
+
+    def game_date(self, game_id: int) -> date | None:
+        """The date (US Eastern) a game is scheduled on, if it's known."""
+        row = self._rows_by_id.get(game_id)
+        if row is None:
+            return None
+        return self.columns["date"][row].astype(date)
+
+    def tipoff(self, game_id: int) -> datetime | None:
+        """A game's tipoff, if the game and its tipoff are known."""
+        row = self._rows_by_id.get(game_id)
+        if row is None:
+            return None
+        return self._tipoff(row)
+
+    def next_tipoff(self, after: datetime) -> datetime | None:
+        """The first tipoff strictly after `after`, if any."""
+        i = int(np.searchsorted(self._tipoffs, after.timestamp(), side="right"))
+        if i == len(self._tipoffs):
+            return None
+        return datetime.fromtimestamp(int(self._tipoffs[i]), UTC)
+
+    def with_results(self, games: list[Game]) -> "ScheduleIndex | None":
+        """
+        This index with the finals among `games` applied, or None if it
+        already has them.
+
+        Only the result columns are copied; lookups are shared.
+        """
+        changes = []
+        for game in games:
+            if game.status != GameStatus.FINAL:
+                continue
+            row = self._rows_by_id.get(game.id)
+            if row is None:
+                continue
+            result = (game.home_team.score, game.away_team.score, game.period, _FINAL)
+            if tuple(int(self.columns[c][row]) for c in _RESULT_COLUMNS) != result:
+                changes.append((row, result))
+        if not changes:
+            return None
+
+        updated = copy(self)
+        updated.columns = {
+            name: array.copy() if name in _RESULT_COLUMNS else array
+            for name, array in self.columns.items()
+        }
+        for row, result in changes:
+            for name, value in zip(_RESULT_COLUMNS, result, strict=True):
+                updated.columns[name][row] = value
+        return updated
+
+    def _date_slice(self, game_date: date) -> slice:
+        days = self.columns["date"]
+        day = np.datetime64(game_date, "D")
+        return slice(
+            int(np.searchsorted(days, day, side="left")),
+            int(np.searchsorted(days, day, side="right")),
+        )
+
+    def _tipoff(self, row: int) -> datetime | None:
+        tipoff = int(self.columns["tipoff"][row])
+        if tipoff == NO_TIPOFF:
+            return None
+        return datetime.fromtimestamp(tipoff, UTC)
+
+    def _games(self, rows: np.ndarray | slice) -> list[GameWithPrediction]:
+        """Materialize rows, converting the columns to Python in bulk."""
+        c = {name: array[rows].tolist() for name, array in self.columns.items()}
+        games = []
+        for i, game_id in enumerate(c["game_id"]):
+            status = _STATUSES[c["status"][i]]
+            period = c["period"][i]
+            tipoff = c["tipoff"][i]
+            if tipoff == NO_TIPOFF:
+                tipoff = None
+            if status == GameStatus.FINAL:
+                status_text = "Final"
+            elif status == GameStatus.IN_PROGRESS:
+                status_text = period_name(period)  # as of the last rebuild
+            else:
+                status_text = _scheduled_text(tipoff)
+            home_name, home_city, home_abbreviation = self.teams[c["home_team_id"][i]]
+            away_name, away_city, away_abbreviation = self.teams[
+                c["visitor_team_id"][i]
+            ]
+            games.append(
+                GameWithPrediction.model_validate(
+                    {
+                        "id": game_id,
+                        "status": status,
+                        "status_text": status_text,
+                        "period": period,
+                        "time_remaining": None,
+                        "home_team": {
+                            "id": c["home_team_id"][i],
+                            "name": home_name,
+                            "city": home_city,
+                            "abbreviation": home_abbreviation,
+                            "score": c["home_score"][i],
+                        },
+                        "away_team": {
+                            "id": c["visitor_team_id"][i],
+                            "name": away_name,
+                            "city": away_city,
+                            "abbreviation": away_abbreviation,
+                            "score": c["visitor_score"][i],
+                        },
+                        "start_time": tipoff,  # epoch seconds, parsed as UTC
+                    }
+                )
+            )
+        return games
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "season": self.season,
+            "games": len(self),
+            "teams": len(self.teams),
+            "bytes": self.nbytes,
+            "fetched_at": self.fetched_at.isoformat(),
+        }
@@ -0,0 +1,122 @@
+"""
+On-disk snapshot store so restarts (Watchtower redeploys) start warm.
+
+SQLite file with one table, slates: the latest serialized GameListResponse
+per date, exactly the bytes served from /api/games/today, plus its snapshot
+version.
+
+Reads happen once at startup (in the lifespan, before the app takes
+traffic). Writes are scheduled from the publish path and run in a worker
+thread; if snapshots arrive faster than the disk, only the newest pending one
+is written.
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from datetime import UTC, date, datetime
+from pathlib import Path
+
+from app.core.logging import get_logger
+from app.models.schemas import GameListResponse
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS slates (
+    game_date TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    saved_at TEXT NOT NULL,
+    payload BLOB NOT NULL
+);
+"""
+
+
+class SnapshotStore:
+    """Blocking SQLite access - call from a worker thread on the hot path."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+
+    def load_slate(self, game_date: date) -> tuple[GameListResponse, int] | None:
+        """The last saved slate for a date and its version, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, version FROM slates WHERE game_date = ?",
+                (game_date.isoformat(),),
+            ).fetchone()
+        if row is None:
+            return None
+        return GameListResponse.model_validate_json(row[0]), row[1]
+
+    def save_slate(self, game_date: date, version: int, payload: bytes) -> None:
+        """Upsert the slate for a date."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO slates (game_date, version, saved_at, payload) "
+                "VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (game_date) DO UPDATE SET "
+                "version = excluded.version, saved_at = excluded.saved_at, "
+                "payload = excluded.payload",
+                (
+                    game_date.isoformat(),
+                    version,
+                    datetime.now(UTC).isoformat(),
+                    payload,
+                ),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class SnapshotWriter:
+    """Writes snapshots off the event loop, newest-wins when behind."""
+
+    def __init__(self, store: SnapshotStore):
+        self._store = store
+        self._pending: tuple[date, int, bytes] | None = None
+        self._task: asyncio.Task | None = None
+
+    def schedule(self, game_date: date, version: int, payload: bytes) -> None:
+        """Queue a write; never blocks. Replaces any not-yet-written snapshot."""
+        self._pending = (game_date, version, payload)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._drain(), name="snapshot-writer")
+
+    async def _drain(self) -> None:
+        while self._pending is not None:
+            game_date, version, payload = self._pending
+            self._pending = None
+            start = time.perf_counter()
+            try:
+                await asyncio.to_thread(
+                    self._store.save_slate, game_date, version, payload
+                )
+            except Exception as e:
+                logger.error(
+                    "snapshot_save_failed",
+                    error_type=type(e).__name__,
+                    error_message=str(e),
+                )
+                continue
+            logger.debug(
+                "snapshot_saved",
+                date=game_date.isoformat(),
+                version=version,
+                duration_ms=round((time.perf_counter() - start) * 1000, 2),
+            )
+
+    async def flush(self) -> None:
+        """Wait for pending writes (called at shutdown)."""
+        if self._task is not None:
+            await self._task
@@ -19,9 +19,43 @@ class Settings(BaseSettings):
 
     # API Security (empty = skip verification, useful for local dev)
     api_key_hash: str = ""
+    # Separate key for /api/admin (profiler, stage timings) and /metrics.
+    # Unlike api_key_hash it isn't shipped to browsers. Empty = admin routes
+    # and /metrics disabled.
+    admin_api_key_hash: str = ""
 
     # NBA API
     balldontlie_api_key: str = ""
+    # Point at a local stand-in instead (benchmarks/fake_balldontlie.py)
+    balldontlie_base_url: str = "https://api.balldontlie.io"
+    # NBA live CDN, the failover for today's scoreboard (also a local
+    # stand-in: the fake above serves it too). Empty = balldontlie only.
+    nba_cdn_base_url: str = "https://cdn.nba.com"
+    # Record every upstream response to this file (.jsonl or .jsonl.gz) to
+    # capture a game night. Empty = off.
+    provider_record_path: str = ""
+    # Serve a recording instead of calling upstream, at this many times real
+    # time (offline debugging, CI). Empty = call balldontlie as usual.
+    provider_replay_path: str = ""
+    provider_replay_speed: float = 1.0
+
+    # Warm-start snapshot store (SQLite). Empty = in-memory only. In prod this
+    # path sits on a named volume so it survives Watchtower image swaps.
+    snapshot_db_path: str = "data/nba-oracle.sqlite3"
+
+    # Directory the worker processes share state through (uvicorn --workers
+    # N), ideally on tmpfs (/dev/shm). One worker is elected to poll
+    # upstream; the rest serve its snapshots. Empty = single process.
+    shared_state_dir: str = ""
+
+    # Pregame predictions: model registry in models_dir, feature
+    # history from the ingested game store (python -m ml.ingest). A missing
+    # model just means games are served with prediction = null.
+    models_dir: str = "ml/models"
+    game_store_path: str = "ml/data/games"
+    # Pin a registry version (e.g. to roll back). Empty = newest, and newly
+    # published versions are hot-swapped in without a restart.
+    model_version: str = ""
 
     # Sentry (empty DSN = disabled — keeps local dev a no-op).
     sentry_dsn: str = ""
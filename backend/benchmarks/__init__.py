@@ -0,0 +1 @@
+"""Performance benchmarks - scripts, run with python -m benchmarks.<name>."""
@@ -0,0 +1,92 @@
+"""
+Elo full-history recompute benchmark.
+
+    uv run python -m benchmarks.elo_recompute --seasons 25 --workers 4
+
+Runs on a synthetic history (30 teams, 1230 games a season) so it needs no
+ingested data, and reports as JSON lines:
+
+- incremental: EloRatings.update over every game, one at a time
+- recompute_1: recompute() with a single parameter set
+- recompute_grid: recompute() over the default sweep grid in one pass
+- sweep_processes: the same grid split across --workers processes
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+from ml.elo import EloParams, EloRatings, default_grid, recompute, sweep
+from ml.game_store import empty_rows
+
+GAMES_PER_SEASON = 1230
+TEAMS = 30
+
+
+def synthetic_history(seasons: int, seed: int = 0) -> dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    n = seasons * GAMES_PER_SEASON
+    columns = empty_rows(n)
+    season = np.repeat(np.arange(2000, 2000 + seasons), GAMES_PER_SEASON)
+    day = np.tile(np.sort(rng.integers(0, 170, GAMES_PER_SEASON)), seasons)
+    home = rng.integers(1, TEAMS + 1, n)
+    columns["game_id"][:] = np.arange(1, n + 1)
+    columns["season"][:] = season
+    columns["date"][:] = season.astype("datetime64[Y]").astype("datetime64[D]") + (
+        292 + day
+    )
+    columns["home_team_id"][:] = home
+    columns["visitor_team_id"][:] = (home + rng.integers(0, TEAMS - 1, n)) % TEAMS + 1
+    columns["home_score"][:] = rng.integers(85, 130, n)
+    columns["visitor_score"][:] = rng.integers(85, 130, n)
+    return columns
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--seasons", type=int, default=25)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    columns = synthetic_history(args.seasons)
+    games = len(columns["game_id"])
+    grid = default_grid()
+
+    def incremental():
+        EloRatings().update_from_columns(columns)
+
+    results = {
+        "incremental": _timed(incremental),
+        "recompute_1": _timed(lambda: recompute(columns, [EloParams()])),
+        "recompute_grid": _timed(lambda: recompute(columns, grid)),
+        "sweep_processes": _timed(lambda: sweep(columns, grid, args.workers)),
+    }
+    for name, seconds in results.items():
+        params = len(grid) if name in ("recompute_grid", "sweep_processes") else 1
+        print(
+            json.dumps(
+                {
+                    "case": name,
+                    "seasons": args.seasons,
+                    "games": games,
+                    "param_sets": params,
+                    "workers": args.workers if name == "sweep_processes" else 1,
+                    "seconds": round(seconds, 3),
+                    "us_per_game_per_param_set": round(
+                        seconds / games / params * 1e6, 3
+                    ),
+                }
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+"""
+Local stand-in for the balldontlie API, for benchmarks.
+
+    uv run python -m benchmarks.fake_balldontlie --port 8100 --latency-ms 80
+
+Serves the three endpoints the API polls (/nba/v1/box_scores,
+/nba/v1/box_scores/live, /nba/v1/games) for a synthetic slate on whatever
+date is asked: some games live (scores tick up as time passes, so the
+slate really changes between polls), some scheduled, some final. Box
+scores carry per-player lines so payloads are about the size of the real
+ones.
+
+/nba/v1/games?seasons[]= pages (by cursor) through a whole synthetic
+season, October to April: today is the slate above, other dates have
+shuffled matchups, final before today and scheduled after.
+
+It also stands in for the NBA CDN: /static/json/liveData/scoreboard/
+todaysScoreboard_00.json is today's slate in the CDN's format, so the
+failover provider can be pointed here too (NBA_CDN_BASE_URL). Run a second
+instance for the CDN to give each provider its own latency and errors.
+
+Every upstream response first waits --latency-ms (+ up to --jitter-ms), or
+--tail-ms more for a --tail-rate share of calls (a slow tail), and fails
+with --error-status at --error-rate. Control endpoints, not part of
+the real API:
+
+- GET  /_stats   calls per path since start
+- POST /_config  change latency_ms / jitter_ms / error_rate / error_status
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from app.providers.nba_cdn_provider import FINAL, IN_PROGRESS, SCHEDULED, TEAMS
+
+US_EASTERN = ZoneInfo("America/New_York")
+
+# Live scores go up one point per team every SCORE_TICK_SECONDS
+SCORE_TICK_SECONDS = 15
+
+# Synthetic season: games every day from Oct 21 to Apr 12
+SEASON_START = (10, 21)
+SEASON_DAYS = 174
+
+
+@dataclass
+class FakeConfig:
+    latency_ms: float = 50.0
+    jitter_ms: float = 20.0
+    error_rate: float = 0.0
+    error_status: int = 500
+    tail_rate: float = 0.0
+    tail_ms: float = 2000.0
+    games: int = 12  # a third each live, scheduled, final
+    players_per_team: int = 12
+
+
+# balldontlie team id -> (tricode, city, name)
+_TEAMS = {team_id: (code, city, name) for code, (team_id, city, name) in TEAMS.items()}
+
+
+def _team(team_id: int) -> dict:
+    code, city, name = _TEAMS[team_id]
+    return {
+        "id": team_id,
+        "conference": "East" if team_id <= 15 else "West",
+        "division": "Atlantic",
+        "city": city,
+        "name": name,
+        "full_name": f"{city} {name}",
+        "abbreviation": code,
+    }
+
+
+def _cdn_team(team: dict, score: int) -> dict:
+    return {
+        "teamId": 1610612736 + team["id"],
+        "teamName": team["name"],
+        "teamCity": team["city"],
+        "teamTricode": team["abbreviation"],
+        "score": score,
+    }
+
+
+def _players(team_id: int, count: int, rng: random.Random) -> list[dict]:
+    lines = []
+    for i in range(count):
+        fga, fta = rng.randint(2, 20), rng.randint(0, 8)
+        fgm, ftm = rng.randint(0, fga), rng.randint(0, fta)
+        lines.append(
+            {
+                "id": team_id * 100 + i,
+                "min": f"{rng.randint(5, 40)}",
+                "fgm": fgm,
+                "fga": fga,
+                "fg_pct": round(fgm / fga, 3),
+                "fg3m": 0,
+                "fg3a": rng.randint(0, 8),
+                "fg3_pct": 0.0,
+                "ftm": ftm,
+                "fta": fta,
+                "ft_pct": round(ftm / fta, 3) if fta else 0.0,
+                "oreb": rng.randint(0, 4),
+                "dreb": rng.randint(0, 8),
+                "reb": rng.randint(0, 12),
+                "ast": rng.randint(0, 10),
+                "stl": rng.randint(0, 3),
+                "blk": rng.randint(0, 3),
+                "turnover": rng.randint(0, 5),
+                "pf": rng.randint(0, 5),
+                "pts": 2 * fgm + ftm,
+                "player": {
+                    "id": team_id * 100 + i,
+                    "first_name": "Player",
+                    "last_name": f"{team_id}-{i}",
+                    "position": "G",
+                },
+            }
+        )
+    return lines
+
+
+class Slate:
+    """Deterministic games for a date; live scores depend on the clock."""
+
+    def __init__(self, config: FakeConfig):
+        self.config = config
+        self.started = time.monotonic()
+
+    def box_scores(self, game_date: str, live_only: bool = False) -> list[dict]:
+        ticks = int((time.monotonic() - self.started) / SCORE_TICK_SECONDS)
+        third = max(self.config.games // 3, 1)
+        out = []
+        for k in range(self.config.games):
+            rng = random.Random(f"{game_date}-{k}")
+            home_id, visitor_id = 2 * k % 30 + 1, (2 * k + 1) % 30 + 1
+            home_score, visitor_score = rng.randint(40, 60), rng.randint(40, 60)
+            tipoff = f"{game_date}T23:{k % 6 * 10:02d}:00Z"
+            if k < third:
+                status, period, clock = "3rd Qtr", 3, f"{11 - ticks % 12}:00"
+                home_score += ticks
+                visitor_score += ticks + ticks % 3
+            elif k < 2 * third:
+                if live_only:
+                    continue
+                status, period, clock = tipoff, 0, None
+                home_score = visitor_score = 0
+            else:
+                if live_only:
+                    continue
+                status, period, clock = "Final", 4, "Final"
+                home_score, visitor_score = home_score * 2, visitor_score * 2
+            home, visitor = _team(home_id), _team(visitor_id)
+            count = self.config.players_per_team if period else 0
+            home["players"] = _players(home_id, count, rng)
+            visitor["players"] = _players(visitor_id, count, rng)
+            out.append(
+                {
+                    "date": game_date,
+                    "season": int(game_date[:4]),
+                    "status": status,
+                    "period": period,
+                    "time": clock,
+                    "postseason": False,
+                    "home_team_score": home_score,
+                    "visitor_team_score": visitor_score,
+                    "home_team": home,
+                    "visitor_team": visitor,
+                }
+            )
+        return out
+
+    def games(self, game_date: str) -> list[dict]:
+        out = []
+        for k, box in enumerate(self.box_scores(game_date)):
+            home = {**box["home_team"]}
+            visitor = {**box["visitor_team"]}
+            del home["players"], visitor["players"]
+            out.append(
+                {
+                    **box,
+                    "id": int(game_date.replace("-", "")) * 100 + k,
+                    "datetime": f"{game_date}T23:00:00Z",
+                    "home_team": home,
+                    "visitor_team": visitor,
+                    "home_team_id": home["id"],
+                    "visitor_team_id": visitor["id"],
+                }
+            )
+        return out
+
+    def scoreboard(self, game_date: str) -> dict:
+        """The date's slate as the CDN's todaysScoreboard."""
+        games = []
+        for k, box in enumerate(self.box_scores(game_date)):
+            if box["status"] == "Final":
+                status, text, clock = FINAL, "Final", ""
+            elif box["period"]:
+                minutes = int(box["time"].split(":")[0])
+                status, clock = IN_PROGRESS, f"PT{minutes:02d}M00.00S"
+                text = f"Q{box['period']} {box['time']}"
+            else:
+                status, text, clock = SCHEDULED, "7:00 pm ET", ""
+            games.append(
+                {
+                    "gameId": f"00225{k:05d}",
+                    "gameStatus": status,
+                    "gameStatusText": text,
+                    "period": box["period"],
+                    "gameClock": clock,
+                    "gameTimeUTC": f"{game_date}T23:{k % 6 * 10:02d}:00Z",
+                    "homeTeam": _cdn_team(box["home_team"], box["home_team_score"]),
+                    "awayTeam": _cdn_team(
+                        box["visitor_team"], box["visitor_team_score"]
+                    ),
+                }
+            )
+        return {"scoreboard": {"gameDate": game_date, "games": games}}
+
+    def season_games(self, season: int) -> list[dict]:
+        today = datetime.now(US_EASTERN).date()
+        out = []
+        for offset in range(SEASON_DAYS):
+            day = date(season, *SEASON_START) + timedelta(days=offset)
+            if day == today:
+                out.extend(self.games(day.isoformat()))
+                continue
+            rng = random.Random(f"season-{day}")
+            teams = list(range(1, 31))
+            rng.shuffle(teams)
+            for k in range(min(self.config.games, 15)):
+                home, visitor = _team(teams[2 * k]), _team(teams[2 * k + 1])
+                tipoff = f"{day.isoformat()}T23:{k % 6 * 10:02d}:00Z"
+                final = day < today
+                out.append(
+                    {
+                        "id": int(day.strftime("%Y%m%d")) * 100 + k,
+                        "date": day.isoformat(),
+                        "datetime": tipoff,
+                        "season": season,
+                        "status": "Final" if final else tipoff,
+                        "period": 4 if final else 0,
+                        "time": "Final" if final else None,
+                        "postseason": False,
+                        "home_team_score": rng.randint(90, 130) if final else 0,
+                        "visitor_team_score": rng.randint(90, 130) if final else 0,
+                        "home_team": home,
+                        "visitor_team": visitor,
+                        "home_team_id": home["id"],
+                        "visitor_team_id": visitor["id"],
+                    }
+                )
+        return out
+
+
+def create_app(config: FakeConfig | None = None) -> FastAPI:
+    config = config or FakeConfig()
+    slate = Slate(config)
+    calls: Counter[str] = Counter()
+    app = FastAPI(title="fake balldontlie")
+
+    async def upstream(request: Request, data, meta=None, body=None) -> JSONResponse:
+        calls[request.url.path] += 1
+        delay = config.latency_ms + random.uniform(0, config.jitter_ms)
+        if random.random() < config.tail_rate:
+            delay += config.tail_ms
+        await asyncio.sleep(delay / 1000)
+        if random.random() < config.error_rate:
+            return JSONResponse(
+                {"error": "injected failure"}, status_code=config.error_status
+            )
+        if body is not None:
+            return JSONResponse(body())
+        return JSONResponse({"data": data(), "meta": meta or {"per_page": 100}})
+
+    @app.get("/nba/v1/box_scores")
+    async def box_scores(request: Request, date: str):
+        return await upstream(request, lambda: slate.box_scores(date))
+
+    @app.get("/nba/v1/box_scores/live")
+    async def live_box_scores(request: Request):
+        today = datetime.now(US_EASTERN).date().isoformat()
+        return await upstream(request, lambda: slate.box_scores(today, True))
+
+    @app.get("/nba/v1/games")
+    async def games(request: Request):
+        seasons = request.query_params.getlist("seasons[]")
+        if seasons:
+            season = slate.season_games(int(seasons[0]))
+            cursor = int(request.query_params.get("cursor") or 0)
+            per_page = int(request.query_params.get("per_page") or 25)
+            end = cursor + per_page
+            meta = {"per_page": per_page, "next_cursor": end}
+            if end >= len(season):
+                meta["next_cursor"] = None
+            return await upstream(request, lambda: season[cursor:end], meta)
+
+        dates = request.query_params.getlist("dates[]")
+        day = dates[0] if dates else date.today().isoformat()
+        return await upstream(request, lambda: slate.games(day))
+
+    @app.get("/static/json/liveData/scoreboard/todaysScoreboard_00.json")
+    async def scoreboard(request: Request):
+        today = datetime.now(US_EASTERN).date().isoformat()
+        return await upstream(request, None, body=lambda: slate.scoreboard(today))
+
+    @app.get("/_stats")
+    async def stats():
+        return {"calls": dict(calls), "total": sum(calls.values())}
+
+    @app.post("/_config")
+    async def update_config(changes: dict):
+        for key, value in changes.items():
+            if hasattr(config, key):
+                setattr(config, key, type(getattr(config, key))(value))
+        return asdict(config)
+
+    return app
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=FakeConfig.latency_ms)
+    parser.add_argument("--jitter-ms", type=float, default=FakeConfig.jitter_ms)
+    parser.add_argument("--error-rate", type=float, default=FakeConfig.error_rate)
+    parser.add_argument("--error-status", type=int, default=FakeConfig.error_status)
+    parser.add_argument("--tail-rate", type=float, default=FakeConfig.tail_rate)
+    parser.add_argument("--tail-ms", type=float, default=FakeConfig.tail_ms)
+    parser.add_argument("--games", type=int, default=FakeConfig.games)
+    args = parser.parse_args()
+
+    config = FakeConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        tail_rate=args.tail_rate,
+        tail_ms=args.tail_ms,
+        games=args.games,
+    )
+    uvicorn.run(
+        create_app(config), host="127.0.0.1", port=args.port, log_level="warning"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+"""
+Load test for /api/games/today against a local fake balldontlie.
+
+    uv run python -m benchmarks.load_test
+    uv run python -m benchmarks.load_test --concurrency 1 16 64 --duration 10 \\
+        --output results.json
+    uv run python -m benchmarks.load_test --baseline results.json   # regressions
+
+Starts benchmarks.fake_balldontlie and the real app (uvicorn, one worker)
+as subprocesses on free local ports, with BALLDONTLIE_BASE_URL pointed at
+the fake, then drives /api/games/today with closed-loop clients at each
+--concurrency level for --duration seconds. Scenarios:
+
+- cold: a fresh app process per level, load starts before the first
+  snapshot exists (the first requests wait for the poller)
+- warm: one app, load starts once a snapshot is published
+- warm_conditional: as warm, but clients send If-None-Match like the
+  frontend does, so unchanged slates come back as 304
+- upstream_failure: the warm app after the fake starts failing every call
+  (--failure-error-rate); the last snapshot should keep being served
+
+Each (scenario, level) reports p50/p95/p99/max latency, time to the first
+successful response, throughput, status counts, upstream calls made during
+the run (from the fake's counters) and cache hit ratio: the share of
+requests answered without an upstream call of their own,
+1 - upstream_calls / requests.
+
+Results print as JSON lines and, with --output, are written as one JSON
+document with the run's settings. --baseline compares against such a file
+and exits non-zero if p95 latency rose or throughput fell by more than
+--tolerance.
+
+The load generator runs in this process, so at high concurrency it can be
+the bottleneck; compare runs made on the same machine.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+API_KEY = "load-test"
+SCENARIOS = ("cold", "warm", "warm_conditional", "upstream_failure")
+STARTUP_TIMEOUT_SECONDS = 20
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_until_up(url: str, timeout: float = STARTUP_TIMEOUT_SECONDS) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.01)
+    raise RuntimeError(f"{url} did not come up in {timeout}s")
+
+
+@contextmanager
+def _process(args: list[str], env: dict[str, str], health_url: str):
+    proc = subprocess.Popen(
+        [sys.executable, *args],
+        env={**os.environ, **env},
+        cwd=Path(__file__).resolve().parent.parent,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_until_up(health_url)
+        yield
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+@contextmanager
+def fake_upstream(args: argparse.Namespace):
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}"
+    cli = [
+        "-m",
+        "benchmarks.fake_balldontlie",
+        f"--port={port}",
+        f"--latency-ms={args.latency_ms}",
+        f"--jitter-ms={args.jitter_ms}",
+        f"--error-rate={args.error_rate}",
+        f"--games={args.games}",
+    ]
+    with _process(cli, {}, f"{url}/_stats"):
+        yield url
+
+
+@contextmanager
+def app_server(upstream_url: str, workdir: Path):
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}"
+    env = {
+        "BALLDONTLIE_API_KEY": "fake",
+        "BALLDONTLIE_BASE_URL": upstream_url,
+        "API_KEY_HASH": hashlib.sha256(API_KEY.encode()).hexdigest(),
+        # Nothing from the developer's machine: no warm start, no models
+        "SNAPSHOT_DB_PATH": "",
+        "MODELS_DIR": str(workdir / "models"),
+        "GAME_STORE_PATH": str(workdir / "games"),
+        "SENTRY_DSN": "",
+    }
+    cli = ["-m", "uvicorn", "app.main:app", f"--port={port}", "--log-level=warning"]
+    with _process(cli, env, f"{url}/health"):
+        yield url
+
+
+def upstream_calls(upstream_url: str) -> int:
+    return httpx.get(f"{upstream_url}/_stats").json()["total"]
+
+
+def configure_upstream(upstream_url: str, **changes) -> None:
+    httpx.post(f"{upstream_url}/_config", json=changes).raise_for_status()
+
+
+def wait_for_snapshot(app_url: str) -> None:
+    deadline = time.monotonic() + STARTUP_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        response = httpx.get(
+            f"{app_url}/api/games/today", headers={"X-API-Key": API_KEY}, timeout=15
+        )
+        if response.status_code == 200:
+            return
+        time.sleep(0.1)
+    raise RuntimeError("The app never published a snapshot")
+
+
+async def drive(
+    app_url: str, concurrency: int, duration: float, conditional: bool
+) -> tuple[list[float], Counter[int], float | None]:
+    """
+    Closed loop: each client sends its next request when the last returns.
+
+    Returns latencies, status counts and seconds until the first success.
+    """
+    latencies: list[float] = []
+    statuses: Counter[int] = Counter()
+    first_ok: float | None = None
+    began = time.perf_counter()
+    deadline = began + duration
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(
+        base_url=app_url,
+        headers={"X-API-Key": API_KEY, "Accept-Encoding": "br, gzip"},
+        limits=limits,
+        timeout=30,
+    ) as client:
+
+        async def worker() -> None:
+            nonlocal first_ok
+            etag = None
+            while time.perf_counter() < deadline:
+                headers = {"If-None-Match": etag} if conditional and etag else {}
+                start = time.perf_counter()
+                try:
+                    response = await client.get("/api/games/today", headers=headers)
+                    status = response.status_code
+                    etag = response.headers.get("etag", etag)
+                except httpx.HTTPError:
+                    status = 0  # connection-level failure
+                end = time.perf_counter()
+                latencies.append(end - start)
+                statuses[status] += 1
+                if first_ok is None and status in (200, 304):
+                    first_ok = end - began
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, statuses, first_ok
+
+
+def measure(
+    scenario: str,
+    app_url: str,
+    upstream_url: str,
+    concurrency: int,
+    duration: float,
+    calls_before: int | None = None,
+) -> dict:
+    """Run one level. Upstream calls count from `calls_before` if given."""
+    if calls_before is None:
+        calls_before = upstream_calls(upstream_url)
+    start = time.perf_counter()
+    latencies, statuses, first_ok = asyncio.run(
+        drive(app_url, concurrency, duration, scenario == "warm_conditional")
+    )
+    elapsed = time.perf_counter() - start
+    calls = upstream_calls(upstream_url) - calls_before
+
+    ms = np.array(latencies) * 1000
+    requests = len(latencies)
+    ok = statuses[200] + statuses[304]
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "requests": requests,
+        "throughput_rps": round(requests / elapsed, 1),
+        "p50_ms": round(float(np.percentile(ms, 50)), 2),
+        "p95_ms": round(float(np.percentile(ms, 95)), 2),
+        "p99_ms": round(float(np.percentile(ms, 99)), 2),
+        "max_ms": round(float(ms.max()), 2),
+        "first_success_ms": round(first_ok * 1000, 2) if first_ok else None,
+        "success_ratio": round(ok / requests, 4),
+        "statuses": {str(code): n for code, n in sorted(statuses.items())},
+        "upstream_calls": calls,
+        "cache_hit_ratio": round(max(0.0, 1 - calls / requests), 4),
+    }
+
+
+def run(args: argparse.Namespace, workdir: Path) -> list[dict]:
+    results = []
+
+    def report(result: dict) -> None:
+        print(json.dumps(result), flush=True)
+        results.append(result)
+
+    with fake_upstream(args) as upstream_url:
+        if "cold" in args.scenarios:
+            for level in args.concurrency:
+                # Count the startup fetch too - it's the cold path's cost
+                calls_before = upstream_calls(upstream_url)
+                with app_server(upstream_url, workdir) as app_url:
+                    report(
+                        measure(
+                            "cold",
+                            app_url,
+                            upstream_url,
+                            level,
+                            args.duration,
+                            calls_before,
+                        )
+                    )
+
+        warm = [s for s in args.scenarios if s != "cold"]
+        if warm:
+            with app_server(upstream_url, workdir) as app_url:
+                wait_for_snapshot(app_url)
+                for scenario in warm:
+                    if scenario == "upstream_failure":
+                        configure_upstream(
+                            upstream_url, error_rate=args.failure_error_rate
+                        )
+                    for level in args.concurrency:
+                        report(
+                            measure(
+                                scenario, app_url, upstream_url, level, args.duration
+                            )
+                        )
+    return results
+
+
+def regressions(
+    results: list[dict], baseline: list[dict], tolerance: float
+) -> list[str]:
+    """Human-readable list of (scenario, level) pairs that got worse."""
+    before = {(r["scenario"], r["concurrency"]): r for r in baseline}
+    found = []
+    for r in results:
+        old = before.get((r["scenario"], r["concurrency"]))
+        if old is None:
+            continue
+        name = f"{r['scenario']}@{r['concurrency']}"
+        if r["p95_ms"] > old["p95_ms"] * (1 + tolerance):
+            found.append(f"{name}: p95 {old['p95_ms']}ms -> {r['p95_ms']}ms")
+        if r["throughput_rps"] < old["throughput_rps"] * (1 - tolerance):
+            found.append(
+                f"{name}: throughput {old['throughput_rps']} -> "
+                f"{r['throughput_rps']} req/s"
+            )
+        if r["success_ratio"] < old["success_ratio"]:
+            found.append(
+                f"{name}: success {old['success_ratio']} -> {r['success_ratio']}"
+            )
+    return found
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds/level")
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS)
+    )
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--failure-error-rate", type=float, default=1.0)
+    parser.add_argument("--games", type=int, default=12)
+    parser.add_argument("--output", help="Write all results to this JSON file")
+    parser.add_argument("--baseline", help="Results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = run(args, Path(tmp))
+
+    if args.output:
+        document = {
+            "created_at": datetime.now(UTC).isoformat(),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "settings": {
+                k: v
+                for k, v in vars(args).items()
+                if k not in ("output", "baseline", "tolerance")
+            },
+            "results": results,
+        }
+        Path(args.output).write_text(json.dumps(document, indent=2) + "\n")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())["results"]
+        found = regressions(results, baseline, args.tolerance)
+        print(json.dumps({"summary": True, "regressions": found}))
+        if found:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Model artifact load benchmark: registry (memory-mapped .npy) vs joblib pickle.
+
+    uv run --extra ml python -m benchmarks.model_load --mb 256 --workers 4
+
+Writes one synthetic model of --mb megabytes in both formats, then starts
+--workers fresh processes per format (like uvicorn workers) that each load
+it, score once (touching every array), and report:
+
+- load_ms: time from "load" call to a usable model
+- rss_mb / pss_mb after load and after scoring, and pss_mb while every
+  worker holds the model. PSS splits shared pages between the processes
+  mapping them, so it shows what N workers really cost together.
+
+Prints one JSON object per format (plus a summary line) to stdout.
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from ml.registry import ModelRegistry
+
+VERSION = "bench"
+
+
+def _memory_mb() -> dict[str, float]:
+    """RSS and PSS of this process (Linux /proc), in MB."""
+    values = {}
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                if key in ("Rss", "Pss"):
+                    values[key.lower() + "_mb"] = int(rest.split()[0]) / 1024
+    except OSError:
+        import resource
+
+        values["rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return values
+
+
+def _load(fmt: str, root: Path) -> dict[str, np.ndarray]:
+    if fmt == "registry":
+        _, arrays = ModelRegistry(root).read(VERSION)
+        return arrays
+    import joblib
+
+    return joblib.load(root / "model.joblib")
+
+
+def _worker(fmt: str, root: Path, barrier, results) -> None:
+    before = _memory_mb()
+    start = time.perf_counter()
+    arrays = _load(fmt, root)
+    load_ms = (time.perf_counter() - start) * 1000
+    loaded = _memory_mb()
+
+    start = time.perf_counter()
+    checksum = sum(
+        float(np.asarray(a, dtype=np.float64).sum()) for a in arrays.values()
+    )
+    score_ms = (time.perf_counter() - start) * 1000
+    scored = _memory_mb()
+
+    barrier.wait()  # every worker now holds the model
+    together = _memory_mb()
+    barrier.wait()
+
+    results.put(
+        {
+            "load_ms": load_ms,
+            "first_score_ms": score_ms,
+            "baseline": before,
+            "after_load": loaded,
+            "after_score": scored,
+            "all_workers_loaded": together,
+            "checksum": checksum,
+        }
+    )
+
+
+def _run_format(fmt: str, root: Path, workers: int) -> dict:
+    ctx = mp.get_context("spawn")
+    barrier = ctx.Barrier(workers)
+    results = ctx.Queue()
+    procs = [
+        ctx.Process(target=_worker, args=(fmt, root, barrier, results))
+        for _ in range(workers)
+    ]
+    for p in procs:
+        p.start()
+    reports = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+
+    def median(path: tuple[str, str]) -> float | None:
+        values = [r[path[0]].get(path[1]) for r in reports]
+        values = [
+            v - r["baseline"].get(path[1], 0) for v, r in zip(values, reports) if v
+        ]
+        return round(statistics.median(values), 1) if values else None
+
+    return {
+        "format": fmt,
+        "workers": workers,
+        "load_ms_median": round(statistics.median(r["load_ms"] for r in reports), 2),
+        "load_ms_max": round(max(r["load_ms"] for r in reports), 2),
+        "first_score_ms_median": round(
+            statistics.median(r["first_score_ms"] for r in reports), 2
+        ),
+        # Memory added by the model, per worker (MB above the bare interpreter)
+        "rss_after_load_mb": median(("after_load", "rss_mb")),
+        "rss_after_score_mb": median(("after_score", "rss_mb")),
+        "pss_all_workers_mb": median(("all_workers_loaded", "pss_mb")),
+        "checksums_match": len({r["checksum"] for r in reports}) == 1,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--mb", type=int, default=256, help="Model size in MB")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    import joblib
+
+    rng = np.random.default_rng(0)
+    # A few large arrays (embeddings / tree tables) plus small coefficients
+    count = args.mb * 1024 * 1024 // 4
+    arrays = {
+        "table_a": rng.random(count // 2, dtype=np.float32),
+        "table_b": rng.random(count - count // 2, dtype=np.float32),
+        "coef": rng.random(64),
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        ModelRegistry(root).publish(
+            VERSION, kind="benchmark", metadata={}, arrays=arrays
+        )
+        joblib.dump(arrays, root / "model.joblib")
+        del arrays
+
+        results = [
+            _run_format(fmt, root, args.workers) for fmt in ("registry", "joblib")
+        ]
+
+    for result in results:
+        print(json.dumps(result))
+    registry, pickle = results
+    print(
+        json.dumps(
+            {
+                "summary": True,
+                "model_mb": args.mb,
+                "load_speedup": round(
+                    pickle["load_ms_median"] / registry["load_ms_median"], 1
+                ),
+                "pss_ratio_joblib_vs_registry": (
+                    round(
+                        pickle["pss_all_workers_mb"] / registry["pss_all_workers_mb"], 2
+                    )
+                    if registry["pss_all_workers_mb"] and pickle["pss_all_workers_mb"]
+                    else None
+                ),
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""
+Provider failover benchmark: serial fallback vs failover with hedging.
+
+    uv run python -m benchmarks.provider_failover --calls 400
+
+Two in-process fake upstreams (benchmarks/fake_balldontlie.py over an ASGI
+transport, so no sockets or subprocesses): one as balldontlie, one as the
+NBA CDN. Each scenario fetches today's box scores --calls times,
+--concurrency at a time, two ways:
+
+- serial: the old path - balldontlie box scores, then balldontlie /games
+  if that fails
+- failover: FailoverProvider over balldontlie and the CDN (hedging at the
+  primary's p95, circuit breakers)
+
+Scenarios:
+- healthy: both upstreams fast
+- slow_tail: --tail-rate of balldontlie calls take --tail-ms longer
+- outage: balldontlie answers every call with a 500 after its latency
+
+Prints one JSON object with latency percentiles (ms), failures, and calls
+per upstream for each scenario and path. Every failover answer is also
+checked to decode to the same Games as balldontlie's.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from datetime import datetime
+
+import httpx
+
+from app.core.rate_limit import Priority, TokenBucket
+from app.providers import failover_provider
+from app.providers.balldontlie_provider import BalldontlieProvider
+from app.providers.base import BOX_SCORES
+from app.providers.failover_provider import FailoverProvider
+from app.providers.nba_cdn_provider import NBACdnProvider
+from app.services.game_decoder import (
+    US_EASTERN,
+    decode_box_scores,
+    game_from_box_score,
+)
+from app.services.nba_api import NBAApiService
+from benchmarks.fake_balldontlie import FakeConfig, create_app
+
+# Budgets big enough that the benchmark measures upstreams, not queueing
+UNLIMITED = 1e9
+
+
+def _percentiles(samples: list[float]) -> dict[str, float]:
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def at(q: float) -> float:
+        return round(ordered[min(int(q * len(ordered)), len(ordered) - 1)] * 1000, 1)
+
+    return {
+        "p50": at(0.50),
+        "p95": at(0.95),
+        "p99": at(0.99),
+        "max": round(ordered[-1] * 1000, 1),
+        "mean": round(statistics.fmean(ordered) * 1000, 1),
+    }
+
+
+def _games(raw: bytes) -> list:
+    return sorted(
+        (game_from_box_score(b) for b in decode_box_scores(raw)), key=lambda g: g.id
+    )
+
+
+class Upstreams:
+    """A fake balldontlie and a fake CDN, each with its own config and counters."""
+
+    def __init__(self, balldontlie: FakeConfig, cdn: FakeConfig):
+        self.apps = {"balldontlie": create_app(balldontlie), "nba_cdn": create_app(cdn)}
+        self.clients = {
+            name: NBAApiService(
+                api_key="fake",
+                base_url="http://fake",
+                transport=httpx.ASGITransport(app=app),
+            )
+            for name, app in self.apps.items()
+        }
+
+    def balldontlie(self) -> BalldontlieProvider:
+        return BalldontlieProvider(
+            self.clients["balldontlie"], TokenBucket(UNLIMITED, UNLIMITED)
+        )
+
+    def cdn(self) -> NBACdnProvider:
+        return NBACdnProvider(
+            self.clients["nba_cdn"], TokenBucket(UNLIMITED, UNLIMITED)
+        )
+
+    async def calls(self) -> dict[str, int]:
+        out = {}
+        for name, client in self.clients.items():
+            stats = (await client.client.get("/_stats")).json()
+            out[name] = stats["total"]
+        return out
+
+    async def close(self) -> None:
+        for client in self.clients.values():
+            await client.close()
+
+
+async def _serial(provider: BalldontlieProvider, today) -> bytes:
+    try:
+        return await provider.fetch_box_scores_by_date_raw(today, Priority.LIVE)
+    except Exception:
+        return await provider.fetch_games_by_date_raw(today, Priority.LIVE)
+
+
+async def _drive(fetch, calls: int, concurrency: int) -> tuple[list[float], int]:
+    latencies: list[float] = []
+    failures = 0
+    remaining = iter(range(calls))
+
+    async def worker():
+        nonlocal failures
+        for _ in remaining:
+            start = time.perf_counter()
+            try:
+                await fetch()
+            except Exception:
+                failures += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, failures
+
+
+async def scenario(
+    name: str, balldontlie: FakeConfig, cdn: FakeConfig, args: argparse.Namespace
+) -> dict:
+    today = datetime.now(US_EASTERN).date()
+    result = {}
+    for path in ("serial", "failover"):
+        # Fresh breakers and latency windows per run
+        failover_provider._breakers.clear()
+        failover_provider._latencies.clear()
+        upstreams = Upstreams(balldontlie, cdn)
+        try:
+            if path == "serial":
+                provider = upstreams.balldontlie()
+                fetch = lambda: _serial(provider, today)  # noqa: E731
+            else:
+                provider = FailoverProvider([upstreams.balldontlie(), upstreams.cdn()])
+                fetch = lambda: provider.fetch_box_scores_by_date_raw(  # noqa: E731
+                    today, Priority.LIVE
+                )
+                # The failover answer must mean the same Games
+                if balldontlie.error_rate < 1:
+                    reference = _games(
+                        await upstreams.balldontlie().fetch_box_scores_by_date_raw(
+                            today
+                        )
+                    )
+                    assert (
+                        _games(
+                            await upstreams.cdn().fetch_box_scores_by_date_raw(today)
+                        )
+                        == reference
+                    )
+
+            before = await upstreams.calls()
+            hedges = failover_provider.provider_hedges.value(BOX_SCORES)
+            latencies, failures = await _drive(fetch, args.calls, args.concurrency)
+            after = await upstreams.calls()
+            result[path] = {
+                "latency_ms": _percentiles(latencies),
+                "failures": failures,
+                "upstream_calls": {k: after[k] - before[k] for k in after},
+            }
+            if path == "failover":
+                result[path]["hedged"] = (
+                    failover_provider.provider_hedges.value(BOX_SCORES) - hedges
+                )
+                result[path]["circuits"] = failover_provider.get_provider_stats()[
+                    "circuits"
+                ]
+        finally:
+            await upstreams.close()
+    return {name: result}
+
+
+async def run(args: argparse.Namespace) -> dict:
+    def fast() -> FakeConfig:
+        return FakeConfig(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms)
+
+    slow_tail = fast()
+    slow_tail.tail_rate, slow_tail.tail_ms = args.tail_rate, args.tail_ms
+    outage = fast()
+    outage.error_rate = 1.0
+
+    results = {"calls": args.calls, "concurrency": args.concurrency}
+    for name, balldontlie in (
+        ("healthy", fast()),
+        ("slow_tail", slow_tail),
+        ("outage", outage),
+    ):
+        results |= await scenario(name, balldontlie, fast(), args)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=40.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--tail-rate", type=float, default=0.05)
+    parser.add_argument("--tail-ms", type=float, default=2000.0)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Replay a recorded game night through the refresh path, without a server.
+
+    uv run python -m benchmarks.replay_night night.jsonl.gz            # stepped
+    uv run python -m benchmarks.replay_night night.jsonl.gz --speed 60 # real time
+
+Record a night by running the API with PROVIDER_RECORD_PATH set (or against
+benchmarks.fake_balldontlie for a synthetic one). This then drives
+GameService.refresh_todays_games over a ReplayProvider the way the poller
+does: every refresh picks its next interval with next_poll_interval.
+
+By default the replay clock is stepped by each interval instead of slept
+on, so a four-hour night runs in seconds and the same recording always
+produces the same sequence of refreshes (suitable for CI). Timers inside
+GameService still read the wall clock, so the periodic full reconcile
+rarely fires in this mode. With --speed the loop really sleeps
+interval / speed.
+
+Prints one JSON summary: refresh count, refresh latency percentiles,
+snapshots published, game changes pushed to stream subscribers, full vs
+incremental refreshes, upstream calls and coalescing, and errors.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter
+
+import numpy as np
+
+from app.providers.recording import load_recording
+from app.providers.replay_provider import ReplayProvider
+from app.services.game_poller import next_poll_interval
+from app.services.game_service import GameService, get_coalescing_stats
+
+
+class _SteppedClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def replay(path: str, speed: float | None, max_refreshes: int) -> dict:
+    calls = load_recording(path)
+    clock = _SteppedClock()
+    provider = (
+        ReplayProvider(calls, speed) if speed else ReplayProvider(calls, clock=clock)
+    )
+    service = GameService(provider)
+
+    refresh_ms: list[float] = []
+    sources: Counter[str] = Counter()
+    errors: Counter[str] = Counter()
+    versions: set[int] = set()
+    changed_games = 0
+    previous = None
+    started = time.perf_counter()
+
+    while len(refresh_ms) < max_refreshes:
+        start = time.perf_counter()
+        try:
+            snapshot = await service.refresh_todays_games()
+        except Exception as e:
+            errors[type(e).__name__] += 1
+            interval = 5.0
+        else:
+            sources[snapshot.data_source] += 1
+            if snapshot.version not in versions:
+                versions.add(snapshot.version)
+                changed_games += sum(
+                    1 for v in snapshot.game_versions.values() if v == snapshot.version
+                )
+            previous = snapshot
+            interval = next_poll_interval(snapshot.response.games)
+        refresh_ms.append((time.perf_counter() - start) * 1000)
+
+        if provider.position() > provider.duration:
+            break
+        if speed:
+            await asyncio.sleep(interval / speed)
+        else:
+            clock.now += interval
+
+    ms = np.array(refresh_ms)
+    return {
+        "recording": path,
+        "recorded_calls": len(calls),
+        "recorded_seconds": round(provider.duration, 1),
+        "mode": f"{speed}x" if speed else "stepped",
+        "wall_seconds": round(time.perf_counter() - started, 3),
+        "refreshes": len(refresh_ms),
+        "refresh_p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "refresh_p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "refresh_max_ms": round(float(ms.max()), 3),
+        "data_sources": dict(sources),
+        "errors": dict(errors),
+        "snapshots_published": len(versions),
+        "game_changes_pushed": changed_games,
+        "final_game_count": len(previous.response.games) if previous else 0,
+        "upstream_calls": provider.served,
+        "coalescing": get_coalescing_stats(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("recording")
+    parser.add_argument(
+        "--speed", type=float, help="Sleep interval / SPEED (default: stepped)"
+    )
+    parser.add_argument("--max-refreshes", type=int, default=100_000)
+    args = parser.parse_args()
+    print(
+        json.dumps(asyncio.run(replay(args.recording, args.speed, args.max_refreshes)))
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Season schedule index benchmark.
+
+    uv run python -m benchmarks.schedule_index --repeat 200
+
+Runs on a synthetic season (30 teams, 1230 games, half of them played) so it
+needs no upstream, and prints one JSON object with:
+
+- build: decoding the season's /games pages and building the index, and
+  the index's size next to the same season held as a list of Games
+- lookups: team, matchup, date and next-game lookups against the index vs
+  a scan over that list (median microseconds)
+- polls: upstream calls the poller makes from just after midnight to the
+  first tipoff of a game day, with and without the index's tipoffs
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+import tracemalloc
+from datetime import UTC, date, datetime, timedelta
+
+from app.models.schemas import GameStatus
+from app.services.game_decoder import US_EASTERN
+from app.services.game_poller import STARTING_SOON_WINDOW, next_poll_interval
+from app.services.schedule_index import ScheduleIndex, decode_schedule_page
+
+GAMES_PER_SEASON = 1230
+SEASON_DAYS = 170
+TEAMS = 30
+PAGE_SIZE = 100
+
+
+def _team(team_id: int) -> dict:
+    return {
+        "id": team_id,
+        "name": f"Team {team_id}",
+        "city": f"City {team_id}",
+        "abbreviation": f"T{team_id:02d}",
+    }
+
+
+def synthetic_season(season: int, played_days: int, seed: int = 0) -> list[dict]:
+    """/games entries for a season whose first `played_days` are final."""
+    rng = random.Random(seed)
+    start = date(season, 10, 21)
+    games = []
+    per_day = GAMES_PER_SEASON // SEASON_DAYS + 1
+    for offset in range(SEASON_DAYS):
+        day = start + timedelta(days=offset)
+        teams = rng.sample(range(1, TEAMS + 1), 2 * per_day)
+        for k in range(per_day):
+            if len(games) == GAMES_PER_SEASON:
+                break
+            tipoff = f"{day + timedelta(days=1)}T{k % 4:02d}:00:00Z"
+            final = offset < played_days
+            games.append(
+                {
+                    "id": len(games) + 1,
+                    "date": day.isoformat(),
+                    "datetime": tipoff,
+                    "status": "Final" if final else tipoff,
+                    "period": 4 if final else 0,
+                    "time": "Final" if final else None,
+                    "home_team_score": rng.randint(90, 130) if final else 0,
+                    "visitor_team_score": rng.randint(90, 130) if final else 0,
+                    "home_team": _team(teams[2 * k]),
+                    "visitor_team": _team(teams[2 * k + 1]),
+                }
+            )
+    return games
+
+
+def _median_us(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return round(statistics.median(times) * 1e6, 1)
+
+
+def _peak_kib(fn) -> float:
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    kept = fn()  # noqa: F841 - held so it counts toward the peak
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return round(peak / 1024, 1)
+
+
+def polls_until_tipoff(games, day: date, schedule: ScheduleIndex | None) -> int:
+    """Poller ticks from 00:01 Eastern to the first tipoff's starting-soon mark."""
+    now = datetime.combine(day, datetime.min.time(), US_EASTERN) + timedelta(minutes=1)
+    # The poller's slate comes from box scores, which carry no tipoff
+    slate = [g.model_copy(update={"start_time": None}) for g in games]
+    first = min(g.start_time for g in games) - STARTING_SOON_WINDOW
+    polls = 0
+    while now < first:
+        polls += 1
+        now += timedelta(seconds=next_poll_interval(slate, now, schedule))
+    return polls
+
+
+def run(repeat: int) -> dict:
+    season = 2030
+    played_days = SEASON_DAYS // 2
+    wire = synthetic_season(season, played_days)
+    pages = [
+        json.dumps(
+            {
+                "data": wire[i : i + PAGE_SIZE],
+                "meta": {
+                    "next_cursor": i + PAGE_SIZE if i + PAGE_SIZE < len(wire) else None
+                },
+            }
+        ).encode()
+        for i in range(0, len(wire), PAGE_SIZE)
+    ]
+
+    def build() -> ScheduleIndex:
+        games = []
+        for raw in pages:
+            games.extend(decode_schedule_page(raw)[0])
+        return ScheduleIndex.build(season, games, datetime.now(UTC))
+
+    index = build()
+    days = sorted({date.fromisoformat(g["date"]) for g in wire})
+
+    def materialize():
+        return [g for day in days for g in index.games_on(day)]
+
+    # The naive alternative: the season as a list of Games, scanned per lookup
+    by_time = materialize()
+
+    team = 1
+    first = index.team_games(team)[0]
+    opponent = first.away_team.id if first.home_team.id == team else first.home_team.id
+    game_day = today = days[played_days + 1]
+
+    def scan_team():
+        return [g for g in by_time if team in (g.home_team.id, g.away_team.id)]
+
+    def scan_matchup():
+        return [
+            g for g in by_time if {g.home_team.id, g.away_team.id} == {team, opponent}
+        ]
+
+    def scan_date():
+        return [
+            g for g in by_time if g.start_time.astimezone(US_EASTERN).date() == game_day
+        ]
+
+    def scan_next():
+        return next(
+            g
+            for g in scan_team()
+            if g.status != GameStatus.FINAL
+            and g.start_time.astimezone(US_EASTERN).date() >= today
+        )
+
+    assert scan_next().id == index.next_game(team, today).id
+    assert [g.id for g in scan_date()] == index.game_ids_on(game_day).tolist()
+
+    day_games = index.games_on(game_day)
+    return {
+        "games": len(index),
+        "build": {
+            "median_ms": round(_median_us(build, max(repeat // 10, 5)) / 1000, 2),
+            "index_kib": round(index.nbytes / 1024, 1),
+            "build_peak_kib": _peak_kib(build),
+            "as_models_peak_kib": _peak_kib(materialize),
+        },
+        "lookups_us": {
+            "team": {
+                "index": _median_us(lambda: index.team_games(team), repeat),
+                "scan": _median_us(scan_team, repeat),
+            },
+            "matchup": {
+                "index": _median_us(lambda: index.team_games(team, opponent), repeat),
+                "scan": _median_us(scan_matchup, repeat),
+            },
+            "date_ids": {
+                "index": _median_us(lambda: index.game_ids_on(game_day), repeat),
+                "scan": _median_us(scan_date, repeat),
+            },
+            "next_game": {
+                "index": _median_us(lambda: index.next_game(team, today), repeat),
+                "scan": _median_us(scan_next, repeat),
+            },
+        },
+        "polls_before_first_tipoff": {
+            "with_index": polls_until_tipoff(day_games, game_day, index),
+            "without_index": polls_until_tipoff(day_games, game_day, None),
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    print(json.dumps(run(args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
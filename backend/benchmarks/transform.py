@@ -0,0 +1,187 @@
+"""
+Per-slate transform microbenchmark: upstream JSON bytes -> list[Game].
+
+    uv run python -m benchmarks.transform --games 15 --players 13
+
+Builds box score and /games bodies with the fake upstream's slate
+generator (benchmarks/fake_balldontlie.py) and times three paths per body:
+
+- sdk: the pre-decoder path - validate into the balldontlie SDK's models,
+  then build each Game field by field with getattr, re-parsing the tipoff
+  and re-formatting the status text every time
+- fast_cold: app.services.game_decoder with an empty status memo (the
+  first tick of the night)
+- fast: the decoder with a warm memo (every tick after that)
+
+For each it reports the median time per slate and the peak memory
+allocated while transforming one slate (tracemalloc), and checks that
+every path produces identical Games. Prints one JSON object.
+"""
+
+import argparse
+import json
+import statistics
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import date
+
+from balldontlie.base import ListResponse, PaginatedListResponse
+from balldontlie.nba.models import NBABoxScore, NBAGame
+
+from app.models.schemas import Game, GameStatus, Team
+from app.services import game_decoder
+from app.services.game_decoder import (
+    US_EASTERN,
+    box_score_id,
+    decode_box_scores,
+    decode_games,
+    game_from_box_score,
+    game_from_game,
+    parse_datetime,
+    parse_status,
+    period_name,
+)
+from benchmarks.fake_balldontlie import FakeConfig, Slate
+
+
+def _sdk_status_text(obj, status: GameStatus) -> str:
+    if status == GameStatus.FINAL:
+        return "Final"
+    if status == GameStatus.IN_PROGRESS:
+        period = getattr(obj, "period", 0) or 0
+        return f"{period_name(period)} {getattr(obj, 'time', '') or ''}".strip()
+    dt = parse_datetime(getattr(obj, "status", None))
+    return dt.astimezone(US_EASTERN).strftime("%-I:%M %p ET") if dt else "TBD"
+
+
+def _sdk_game(obj, game_id: int, start_time) -> Game:
+    status = parse_status(getattr(obj, "status", "") or "")
+    return Game(
+        id=game_id,
+        status=status,
+        status_text=_sdk_status_text(obj, status),
+        period=getattr(obj, "period", 0) or 0,
+        time_remaining=getattr(obj, "time", None),
+        home_team=Team(
+            id=obj.home_team.id,
+            name=obj.home_team.name,
+            city=obj.home_team.city,
+            abbreviation=obj.home_team.abbreviation,
+            score=getattr(obj, "home_team_score", 0) or 0,
+        ),
+        away_team=Team(
+            id=obj.visitor_team.id,
+            name=obj.visitor_team.name,
+            city=obj.visitor_team.city,
+            abbreviation=obj.visitor_team.abbreviation,
+            score=getattr(obj, "visitor_team_score", 0) or 0,
+        ),
+        start_time=start_time,
+    )
+
+
+def _derived_id(obj) -> int:
+    day = int((obj.date or "")[:10].replace("-", "") or 0)
+    return day * 10_000 + obj.home_team.id * 100 + obj.visitor_team.id
+
+
+def sdk_box_scores(raw: bytes) -> list[Game]:
+    return [
+        _sdk_game(b, _derived_id(b), None)
+        for b in ListResponse[NBABoxScore].model_validate_json(raw).data
+    ]
+
+
+def sdk_games(raw: bytes) -> list[Game]:
+    return [
+        _sdk_game(g, _derived_id(g), parse_datetime(g.status))
+        for g in PaginatedListResponse[NBAGame].model_validate_json(raw).data
+    ]
+
+
+def fast_box_scores(raw: bytes) -> list[Game]:
+    return [game_from_box_score(b) for b in decode_box_scores(raw)]
+
+
+def fast_games(raw: bytes) -> list[Game]:
+    return [game_from_game(g) for g in decode_games(raw)]
+
+
+def _cold(fn: Callable[[bytes], list[Game]]) -> Callable[[bytes], list[Game]]:
+    def run(raw: bytes) -> list[Game]:
+        game_decoder.game_status.cache_clear()
+        return fn(raw)
+
+    return run
+
+
+def measure(fn: Callable[[bytes], list[Game]], raw: bytes, repeat: int) -> dict:
+    fn(raw)  # warm up imports, adapters and (for fast) the status memo
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(raw)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    fn(raw)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "median_ms": round(statistics.median(times) * 1000, 3),
+        "p95_ms": round(statistics.quantiles(times, n=20)[18] * 1000, 3),
+        "peak_alloc_kib": round(peak / 1024, 1),
+    }
+
+
+def run(games: int, players: int, repeat: int) -> dict:
+    slate = Slate(FakeConfig(games=games, players_per_team=players))
+    day = date.today().isoformat()
+    bodies = {
+        "box_scores": (
+            json.dumps({"data": slate.box_scores(day)}).encode(),
+            sdk_box_scores,
+            fast_box_scores,
+        ),
+        "games": (
+            json.dumps({"data": slate.games(day), "meta": {}}).encode(),
+            sdk_games,
+            fast_games,
+        ),
+    }
+
+    results: dict[str, object] = {"games": games, "players_per_team": players}
+    for name, (raw, sdk, fast) in bodies.items():
+        expected = sdk(raw)
+        matches = fast(raw) == expected
+        if name == "box_scores":
+            matches = matches and [box_score_id(b) for b in decode_box_scores(raw)] == [
+                g.id for g in expected
+            ]
+        paths = {
+            "sdk": measure(sdk, raw, repeat),
+            "fast_cold": measure(_cold(fast), raw, repeat),
+            "fast": measure(fast, raw, repeat),
+        }
+        results[name] = {
+            "body_kib": round(len(raw) / 1024, 1),
+            **paths,
+            "speedup": round(paths["sdk"]["median_ms"] / paths["fast"]["median_ms"], 1),
+            "outputs_match": matches,
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--games", type=int, default=15)
+    parser.add_argument("--players", type=int, default=13, help="Per team")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    print(json.dumps(run(args.games, args.players, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
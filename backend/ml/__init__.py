@@ -0,0 +1 @@
+"""ML pipeline: historical data ingestion and model training."""
@@ -0,0 +1,248 @@
+"""
+Walk-forward backtest of the pregame model over past seasons.
+
+    uv run --extra ml python -m ml.backtest                  # one fold per core
+    uv run --extra ml python -m ml.backtest --C 0.1 --alpha 10
+    uv run --extra ml python -m ml.backtest --serial-baseline
+
+Fold N trains on every season before N (ml.train.fit) and scores season N,
+so no fold ever sees its own future. Each fold reports accuracy, Brier
+score, log loss, spread MAE and a calibration table, next to the Elo
+baseline's numbers for the same games.
+
+Features are pregame-only, so one matrix over the whole store serves every
+fold. It's cached in ml/data/features/<key>/ as .npy files, keyed by
+FEATURE_VERSION, the window and each season's manifest: re-running with new
+hyperparameters reuses it, and any ingestion (new rows or box scores)
+changes the key. Fold workers memory-map the cached arrays instead of
+receiving copies through the pool.
+
+Output is JSON lines: one per fold (with its own timing) and a summary with
+the pooled metrics and total wall-clock (plus serial wall-clock and speedup
+with --serial-baseline).
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import numpy as np
+
+from ml.elo import EloParams, recompute
+from ml.features import FEATURE_VERSION, WINDOW, build_features
+from ml.game_store import DEFAULT_ROOT, GameStore
+from ml.train import fit
+
+CACHE_DIR = DEFAULT_ROOT.parent / "features"
+CALIBRATION_BINS = 10
+MIN_TRAIN_SEASONS = 3
+
+# Arrays in a feature cache entry, all aligned with the store's rows
+_CACHED = ("X", "season", "home_margin", "elo_probability")
+
+
+@dataclass(frozen=True)
+class Fold:
+    season: int
+    cache: str  # feature cache directory
+    c: float
+    alpha: float
+
+
+def cache_key(store: GameStore, window: int = WINDOW) -> str:
+    """Changes whenever the stored games or the feature definitions do."""
+    manifests = [asdict(store.manifest(s)) for s in store.seasons()]
+    payload = json.dumps(
+        {"feature_version": FEATURE_VERSION, "window": window, "seasons": manifests},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def feature_cache(
+    store: GameStore, root: str | Path = CACHE_DIR, window: int = WINDOW
+) -> tuple[Path, bool]:
+    """
+    Directory of the cached matrix for the store, building it if needed.
+
+    Returns (path, hit). Entries for other keys are removed.
+    """
+    root = Path(root)
+    path = root / cache_key(store, window)
+    if (path / "done").exists():
+        return path, True
+
+    columns = store.load_all()
+    home_margin = columns["home_score"].astype(np.float64) - columns["visitor_score"]
+    _, _, elo = recompute(columns, [EloParams()])
+    arrays = {
+        "X": build_features(columns, window),
+        "season": columns["season"],
+        "home_margin": home_margin,
+        "elo_probability": elo[0],
+    }
+
+    tmp = root / f".{path.name}.{os.getpid()}.tmp"
+    tmp.mkdir(parents=True, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(tmp / f"{name}.npy", np.ascontiguousarray(array))
+    (tmp / "done").touch()
+    for stale in root.iterdir():
+        if stale != tmp and not stale.name.startswith("."):
+            shutil.rmtree(stale, ignore_errors=True)
+    tmp.rename(path)
+    return path, False
+
+
+def _load_cache(path: str | Path) -> dict[str, np.ndarray]:
+    return {
+        name: np.load(Path(path) / f"{name}.npy", mmap_mode="r") for name in _CACHED
+    }
+
+
+def calibration(probability: np.ndarray, outcome: np.ndarray) -> list[dict]:
+    """Mean predicted vs observed home win rate per probability bin."""
+    bins = np.minimum(
+        (probability * CALIBRATION_BINS).astype(int), CALIBRATION_BINS - 1
+    )
+    table = []
+    for b in range(CALIBRATION_BINS):
+        mask = bins == b
+        if mask.any():
+            table.append(
+                {
+                    "low": b / CALIBRATION_BINS,
+                    "games": int(mask.sum()),
+                    "predicted": round(float(probability[mask].mean()), 4),
+                    "observed": round(float(outcome[mask].mean()), 4),
+                }
+            )
+    return table
+
+
+def scores(probability: np.ndarray, outcome: np.ndarray) -> dict[str, float]:
+    p = np.clip(probability, 1e-9, 1 - 1e-9)
+    return {
+        "accuracy": round(float(np.mean((p > 0.5) == outcome)), 4),
+        "brier": round(float(np.mean((p - outcome) ** 2)), 4),
+        "log_loss": round(
+            float(-np.mean(np.where(outcome, np.log(p), np.log(1 - p)))), 4
+        ),
+    }
+
+
+def run_fold(fold: Fold) -> dict:
+    """Train on seasons before fold.season, evaluate on fold.season."""
+    start = time.perf_counter()
+    data = _load_cache(fold.cache)
+    train = data["season"] < fold.season
+    test = data["season"] == fold.season
+    # Early-season rows have NaN features; fit imputes them with training means
+    model = fit(
+        np.asarray(data["X"][train], dtype=np.float64),
+        data["home_margin"][train],
+        version=f"backtest-{fold.season}",
+        c=fold.c,
+        alpha=fold.alpha,
+    )
+    fit_seconds = time.perf_counter() - start
+
+    X_test = np.asarray(data["X"][test], dtype=np.float64)
+    margin = data["home_margin"][test]
+    outcome = margin > 0
+    probability = model.predict_proba(X_test)[:, 1]
+    return {
+        "season": fold.season,
+        "train_games": int(train.sum()),
+        "test_games": int(test.sum()),
+        **scores(probability, outcome),
+        "spread_mae": round(
+            float(np.mean(np.abs(model.predict_spread(X_test) - margin))), 3
+        ),
+        "elo_baseline": scores(np.asarray(data["elo_probability"][test]), outcome),
+        "calibration": calibration(probability, outcome),
+        # Pooled metrics are recomputed from these in the parent
+        "_probability": probability,
+        "_outcome": outcome,
+        "fit_seconds": round(fit_seconds, 3),
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def run_folds(folds: list[Fold], workers: int) -> tuple[list[dict], float]:
+    """Fold results in season order, and the wall-clock seconds they took."""
+    start = time.perf_counter()
+    if workers <= 1:
+        results = [run_fold(fold) for fold in folds]
+    else:
+        with ProcessPoolExecutor(min(workers, len(folds))) as pool:
+            results = list(pool.map(run_fold, folds))
+    return results, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--C", type=float, default=1.0, dest="c")
+    parser.add_argument("--alpha", type=float, default=1.0)
+    parser.add_argument("--min-train-seasons", type=int, default=MIN_TRAIN_SEASONS)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--serial-baseline",
+        action="store_true",
+        help="Also run every fold in-process and report the speedup",
+    )
+    parser.add_argument("--cache-dir", default=str(CACHE_DIR))
+    args = parser.parse_args()
+
+    store = GameStore()
+    seasons = store.seasons()
+    if len(seasons) <= args.min_train_seasons:
+        raise SystemExit(
+            f"Need more than {args.min_train_seasons} stored seasons, "
+            f"have {len(seasons)} - run python -m ml.ingest first"
+        )
+
+    start = time.perf_counter()
+    cache, hit = feature_cache(store, args.cache_dir)
+    feature_seconds = time.perf_counter() - start
+
+    folds = [
+        Fold(season=s, cache=str(cache), c=args.c, alpha=args.alpha)
+        for s in seasons[args.min_train_seasons :]
+    ]
+    results, wall = run_folds(folds, args.workers)
+
+    for result in results:
+        print(json.dumps({k: v for k, v in result.items() if not k.startswith("_")}))
+
+    probability = np.concatenate([r["_probability"] for r in results])
+    outcome = np.concatenate([r["_outcome"] for r in results])
+    summary = {
+        "summary": True,
+        "folds": len(folds),
+        "games": len(outcome),
+        "C": args.c,
+        "alpha": args.alpha,
+        **scores(probability, outcome),
+        "calibration": calibration(probability, outcome),
+        "feature_cache": "hit" if hit else "miss",
+        "feature_seconds": round(feature_seconds, 3),
+        "workers": min(args.workers, len(folds)),
+        "wall_seconds": round(wall, 3),
+        "fold_seconds_sum": round(sum(r["seconds"] for r in results), 3),
+    }
+    if args.serial_baseline:
+        _, serial = run_folds(folds, workers=1)
+        summary["serial_wall_seconds"] = round(serial, 3)
+        summary["speedup"] = round(serial / wall, 2)
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
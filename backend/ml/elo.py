@@ -0,0 +1,319 @@
+"""
+Elo team ratings with margin-of-victory and home-court terms.
+
+    uv run python -m ml.elo                 # recompute from the store and save
+    uv run python -m ml.elo --sweep         # grid search K / home advantage
+
+Update per final (FiveThirtyEight's NBA variant):
+
+    expected = 1 / (1 + 10 ** (-(home - visitor + HCA) / 400))
+    mov_mult = (|margin| + 3) ** 0.8 / (7.5 + 0.006 * winner_elo_edge)
+    shift    = K * mov_mult * (home_won - expected)
+
+and at each new season every rating regresses CARRYOVER of the way to the
+mean. Two implementations share these formulas:
+
+- EloRatings: dict of ratings, O(1) per final. Used live by the API and
+  persisted as a tiny .npz (team ids + float32 ratings + a checkpoint).
+- recompute(): whole history at once for a grid of parameter sets. The game
+  loop is inherently sequential, so the vectorization runs across the grid:
+  each step updates one column pair of a (params, teams) array, and dozens
+  of parameter sets cost little more than one. sweep() can also fan the grid
+  out over processes.
+"""
+
+import argparse
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import numpy as np
+
+from ml.game_store import DEFAULT_ROOT, GameStore
+
+DEFAULT_PATH = DEFAULT_ROOT.parent / "elo.npz"
+
+MEAN_RATING = 1505.0
+
+
+@dataclass(frozen=True)
+class EloParams:
+    k: float = 20.0
+    home_advantage: float = 100.0
+    carryover: float = 0.25  # share of the distance to the mean removed per season
+
+    def spread(self, home: float, visitor: float) -> float:
+        """Expected home margin in points (about 28 Elo points per point)."""
+        return (home - visitor + self.home_advantage) / 28.0
+
+
+def _expected(diff):
+    return 1.0 / (1.0 + 10.0 ** (-diff / 400.0))
+
+
+def _mov_multiplier(margin, winner_edge):
+    return (np.abs(margin) + 3.0) ** 0.8 / (7.5 + 0.006 * winner_edge)
+
+
+class EloRatings:
+    """Current ratings; fold in finals one at a time."""
+
+    def __init__(self, params: EloParams = EloParams()):
+        self.params = params
+        self.ratings: dict[int, float] = {}
+        self.games: dict[int, int] = {}
+        self.season: int | None = None
+        # Checkpoint: newest game date folded in and the ids seen on it
+        self.last_date: np.datetime64 | None = None
+        self.last_ids: set[int] = set()
+
+    def rating(self, team_id: int) -> float:
+        return self.ratings.get(team_id, MEAN_RATING)
+
+    def _start_season(self, season: int) -> None:
+        if self.season is not None and season > self.season:
+            keep = 1.0 - self.params.carryover
+            self.ratings = {
+                team: MEAN_RATING + (r - MEAN_RATING) * keep
+                for team, r in self.ratings.items()
+            }
+        self.season = season
+
+    def home_win_probability(self, home_id: int, visitor_id: int) -> float:
+        diff = self.rating(home_id) - self.rating(visitor_id)
+        return float(_expected(diff + self.params.home_advantage))
+
+    def update(
+        self,
+        game_id: int,
+        game_date: np.datetime64,
+        season: int,
+        home_id: int,
+        visitor_id: int,
+        home_score: int,
+        visitor_score: int,
+    ) -> bool:
+        """Fold in one final. False if it's already counted."""
+        game_date = np.datetime64(game_date, "D")
+        if self.last_date is not None and (
+            game_date < self.last_date
+            or (game_date == self.last_date and game_id in self.last_ids)
+        ):
+            return False
+        if self.season is None or season != self.season:
+            self._start_season(season)
+
+        home, visitor = self.rating(home_id), self.rating(visitor_id)
+        edge = home - visitor + self.params.home_advantage
+        margin = home_score - visitor_score
+        home_won = 1.0 if margin > 0 else 0.0
+        winner_edge = edge if margin > 0 else -edge
+        shift = float(
+            self.params.k
+            * _mov_multiplier(margin, winner_edge)
+            * (home_won - _expected(edge))
+        )
+        self.ratings[home_id] = home + shift
+        self.ratings[visitor_id] = visitor - shift
+        for team in (home_id, visitor_id):
+            self.games[team] = self.games.get(team, 0) + 1
+
+        if game_date != self.last_date:
+            self.last_date, self.last_ids = game_date, set()
+        self.last_ids.add(game_id)
+        return True
+
+    def update_from_columns(self, columns: dict[str, np.ndarray]) -> int:
+        """Fold in every stored final not counted yet, in game order."""
+        order = np.lexsort((columns["game_id"], columns["date"]))
+        if self.last_date is not None:
+            order = order[columns["date"][order] >= self.last_date]
+        added = 0
+        for i in order:
+            added += self.update(
+                int(columns["game_id"][i]),
+                columns["date"][i],
+                int(columns["season"][i]),
+                int(columns["home_team_id"][i]),
+                int(columns["visitor_team_id"][i]),
+                int(columns["home_score"][i]),
+                int(columns["visitor_score"][i]),
+            )
+        return added
+
+    def table(self) -> list[tuple[int, float, int]]:
+        """(team_id, rating, games) sorted best first."""
+        return sorted(
+            ((team, r, self.games.get(team, 0)) for team, r in self.ratings.items()),
+            key=lambda row: -row[1],
+        )
+
+    def save(self, path: str | Path = DEFAULT_PATH) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        teams = sorted(self.ratings)
+        tmp = path.with_name(f".{path.name}.tmp")
+        with open(tmp, "wb") as f:
+            np.savez(
+                f,
+                team_ids=np.array(teams, dtype=np.int16),
+                ratings=np.array([self.ratings[t] for t in teams], dtype=np.float32),
+                games=np.array([self.games.get(t, 0) for t in teams], dtype=np.int32),
+                last_ids=np.array(sorted(self.last_ids), dtype=np.int64),
+                meta=np.array(
+                    json.dumps(
+                        {
+                            "params": asdict(self.params),
+                            "season": self.season,
+                            "last_date": str(self.last_date)
+                            if self.last_date is not None
+                            else None,
+                        }
+                    )
+                ),
+            )
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: str | Path = DEFAULT_PATH) -> "EloRatings":
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            elo = cls(EloParams(**meta["params"]))
+            teams = data["team_ids"].tolist()
+            elo.ratings = dict(zip(teams, data["ratings"].astype(float).tolist()))
+            elo.games = dict(zip(teams, data["games"].tolist()))
+            elo.last_ids = set(data["last_ids"].tolist())
+        elo.season = meta["season"]
+        if meta["last_date"]:
+            elo.last_date = np.datetime64(meta["last_date"], "D")
+        return elo
+
+    @classmethod
+    def from_store(
+        cls,
+        store: GameStore,
+        path: str | Path | None = None,
+        params: EloParams = EloParams(),
+    ) -> "EloRatings":
+        """Saved ratings (if any, same params) caught up with the store."""
+        elo = None
+        if path is not None and Path(path).exists():
+            saved = cls.load(path)
+            if saved.params == params:
+                elo = saved
+        elo = elo or cls(params)
+        elo.update_from_columns(store.load_all())
+        return elo
+
+
+def recompute(
+    columns: dict[str, np.ndarray], grid: list[EloParams]
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Replay the whole history once for every parameter set in `grid`.
+
+    Returns (team_ids, final ratings (len(grid), teams), pregame home win
+    probability (len(grid), games) aligned with `columns`).
+    """
+    order = np.lexsort((columns["game_id"], columns["date"]))
+    team_ids, dense = np.unique(
+        np.concatenate([columns["home_team_id"], columns["visitor_team_id"]]),
+        return_inverse=True,
+    )
+    n = len(order)
+    home_idx = dense[:n][order]
+    visitor_idx = dense[n:][order]
+    margin = (
+        columns["home_score"][order].astype(np.float64)
+        - columns["visitor_score"][order]
+    )
+    home_won = (margin > 0).astype(np.float64)
+    seasons = columns["season"][order]
+    new_season = np.flatnonzero(np.diff(seasons)) + 1
+
+    k = np.array([p.k for p in grid])
+    hca = np.array([p.home_advantage for p in grid])
+    keep = 1.0 - np.array([p.carryover for p in grid])[:, None]
+
+    ratings = np.full((len(grid), len(team_ids)), MEAN_RATING)
+    pregame = np.empty((len(grid), n))
+    boundaries = set(new_season.tolist())
+    for j in range(n):
+        if j in boundaries:
+            ratings = MEAN_RATING + (ratings - MEAN_RATING) * keep
+        h, v = home_idx[j], visitor_idx[j]
+        edge = ratings[:, h] - ratings[:, v] + hca
+        expected = _expected(edge)
+        pregame[:, j] = expected
+        winner_edge = edge if margin[j] > 0 else -edge
+        shift = k * _mov_multiplier(margin[j], winner_edge) * (home_won[j] - expected)
+        ratings[:, h] += shift
+        ratings[:, v] -= shift
+
+    aligned = np.empty_like(pregame)
+    aligned[:, order] = pregame
+    return team_ids, ratings, aligned
+
+
+def _log_loss(columns: dict[str, np.ndarray], grid: list[EloParams]) -> np.ndarray:
+    _, _, prob = recompute(columns, grid)
+    won = columns["home_score"] > columns["visitor_score"]
+    prob = np.clip(prob, 1e-9, 1 - 1e-9)
+    return -np.mean(np.where(won, np.log(prob), np.log(1 - prob)), axis=1)
+
+
+def sweep(
+    columns: dict[str, np.ndarray], grid: list[EloParams], workers: int = 1
+) -> list[tuple[EloParams, float]]:
+    """Log loss of each parameter set, best first."""
+    if workers <= 1:
+        losses = _log_loss(columns, grid)
+    else:
+        chunks = [grid[i::workers] for i in range(workers)]
+        with ProcessPoolExecutor(workers) as pool:
+            parts = list(pool.map(_log_loss, [columns] * workers, chunks))
+        by_params = {
+            p: loss
+            for chunk, part in zip(chunks, parts, strict=True)
+            for p, loss in zip(chunk, part, strict=True)
+        }
+        losses = np.array([by_params[p] for p in grid])
+    return sorted(zip(grid, losses.tolist(), strict=True), key=lambda r: r[1])
+
+
+def default_grid() -> list[EloParams]:
+    return [
+        EloParams(k=k, home_advantage=hca, carryover=c)
+        for k in (10, 15, 20, 25, 30)
+        for hca in (50, 75, 100, 125)
+        for c in (0.25, 0.5)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--sweep", action="store_true", help="Grid search params")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--output", default=str(DEFAULT_PATH))
+    args = parser.parse_args()
+
+    columns = GameStore().load_all()
+    if args.sweep:
+        start = time.perf_counter()
+        results = sweep(columns, default_grid(), args.workers)
+        for params, loss in results[:5]:
+            print(json.dumps({**asdict(params), "log_loss": round(loss, 5)}))
+        print(json.dumps({"seconds": round(time.perf_counter() - start, 2)}))
+        return
+
+    elo = EloRatings()
+    elo.update_from_columns(columns)
+    elo.save(args.output)
+    for team, rating, games in elo.table():
+        print(f"{team:>4} {rating:7.1f} {games:>5}")
+
+
+if __name__ == "__main__":
+    main()
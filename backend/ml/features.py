@@ -0,0 +1,313 @@
+"""
+Pregame team features, computed from the historical game store.
+
+Every feature describes a team *before* tip-off, from that team's earlier
+games in the same season only (no leakage, a new season starts fresh):
+
+- margin: mean point differential over the last WINDOW games
+- off_rating / def_rating: points scored / allowed per 100 possessions over
+  the last WINDOW games with box scores (possessions estimated as
+  FGA - OREB + TOV + 0.44 * FTA, averaged over both teams)
+- rest_days: days since the previous game, capped at REST_CAP_DAYS
+- back_to_back: 1.0 if the team also played yesterday
+- split_margin: mean differential over the last WINDOW games at the same
+  venue type - home games for the home team, road games for the visitor
+
+A game's row is home_<feature> then visitor_<feature> (FEATURE_NAMES).
+Missing history is NaN; imputation is the model's business.
+
+Two paths produce identical values:
+- build_features(): whole history at once. Each team's games are laid out
+  contiguously, and a rolling "previous WINDOW rows" mean is two lookups
+  into a cumulative sum - no Python loop over games.
+- FeatureEngine: per-team rolling state. A new final updates only its two
+  teams, and features for an upcoming matchup are read straight off the
+  state, so nightly updates and live serving cost microseconds.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+
+import numpy as np
+
+# Bump when feature definitions change - cached features/predictions keyed
+# on it become stale
+FEATURE_VERSION = 1
+
+WINDOW = 10
+REST_CAP_DAYS = 7
+
+TEAM_FEATURES = (
+    "margin",
+    "off_rating",
+    "def_rating",
+    "rest_days",
+    "back_to_back",
+    "split_margin",
+)
+FEATURE_NAMES = [
+    f"{side}_{name}" for side in ("home", "visitor") for name in TEAM_FEATURES
+]
+
+
+def possessions(columns: dict[str, np.ndarray]) -> np.ndarray:
+    """Estimated possessions per game (NaN where box scores are missing)."""
+    home = (
+        columns["home_fga"]
+        - columns["home_oreb"]
+        + columns["home_tov"]
+        + 0.44 * columns["home_fta"]
+    )
+    visitor = (
+        columns["visitor_fga"]
+        - columns["visitor_oreb"]
+        + columns["visitor_tov"]
+        + 0.44 * columns["visitor_fta"]
+    )
+    return 0.5 * (home.astype(np.float64) + visitor)
+
+
+def _group_starts(keys: np.ndarray) -> np.ndarray:
+    """For rows sorted by key, the index where each row's group begins."""
+    idx = np.arange(len(keys))
+    is_start = np.ones(len(keys), dtype=bool)
+    is_start[1:] = keys[1:] != keys[:-1]
+    return np.maximum.accumulate(np.where(is_start, idx, 0))
+
+
+def _rolling_prev_sum(
+    values: np.ndarray, starts: np.ndarray, window: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Sum of the up-to-`window` rows before each row in its group, and how
+    many rows that was. NaN values are skipped (not counted).
+    """
+    idx = np.arange(len(values))
+    lo = np.maximum(idx - window, starts)
+    valid = ~np.isnan(values)
+    sums = np.zeros(len(values) + 1)
+    np.cumsum(np.where(valid, values, 0.0), out=sums[1:])
+    counts = np.zeros(len(values) + 1)
+    np.cumsum(valid, out=counts[1:])
+    return sums[idx] - sums[lo], counts[idx] - counts[lo]
+
+
+def _divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    out = np.full(len(numerator), np.nan)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out
+
+
+def build_features(columns: dict[str, np.ndarray], window: int = WINDOW) -> np.ndarray:
+    """
+    Feature matrix (rows aligned with `columns`, FEATURE_NAMES order).
+
+    `columns` is GameStore.load_all() output, or anything with its columns.
+    """
+    n = len(columns["game_id"])
+    poss = possessions(columns)
+
+    # One row per (game, team): home rows first, then visitor rows
+    team = np.concatenate([columns["home_team_id"], columns["visitor_team_id"]])
+    season = np.tile(columns["season"].astype(np.int64), 2)
+    day = np.tile(columns["date"], 2)
+    game_id = np.tile(columns["game_id"], 2)
+    is_home = np.repeat([True, False], n)
+    points_for = np.concatenate([columns["home_score"], columns["visitor_score"]])
+    points_against = np.concatenate([columns["visitor_score"], columns["home_score"]])
+    margin = points_for.astype(np.float64) - points_against
+    poss = np.tile(poss, 2)
+    with_poss = ~np.isnan(poss)
+
+    out = np.full((2 * n, len(TEAM_FEATURES)), np.nan)
+
+    # Rolling over each team's season, in game order
+    key = season * 1000 + team
+    order = np.lexsort((game_id, day, key))
+    starts = _group_starts(key[order])
+
+    total, count = _rolling_prev_sum(margin[order], starts, window)
+    out[order, 0] = _divide(total, count)
+
+    # Ratings use only games with box scores, so numerator and denominator
+    # cover the same games
+    scored, _ = _rolling_prev_sum(
+        np.where(with_poss, points_for, np.nan)[order], starts, window
+    )
+    allowed, _ = _rolling_prev_sum(
+        np.where(with_poss, points_against, np.nan)[order], starts, window
+    )
+    poss_total, _ = _rolling_prev_sum(poss[order], starts, window)
+    out[order, 1] = 100 * _divide(scored, poss_total)
+    out[order, 2] = 100 * _divide(allowed, poss_total)
+
+    sorted_day = day[order]
+    rest = np.full(2 * n, float(REST_CAP_DAYS))
+    has_prev = np.arange(2 * n) > starts
+    gap = (sorted_day[1:] - sorted_day[:-1]).astype(np.float64)
+    rest[1:][has_prev[1:]] = gap[has_prev[1:]]
+    rest = np.minimum(rest, REST_CAP_DAYS)
+    out[order, 3] = rest
+    out[order, 4] = (rest == 1).astype(np.float64)
+
+    # Same rolling margin, grouped by venue type as well
+    split_key = key * 2 + is_home
+    split_order = np.lexsort((game_id, day, split_key))
+    split_starts = _group_starts(split_key[split_order])
+    total, count = _rolling_prev_sum(margin[split_order], split_starts, window)
+    out[split_order, 5] = _divide(total, count)
+
+    return np.hstack([out[:n], out[n:]]).astype(np.float32)
+
+
+@dataclass
+class _TeamState:
+    season: int
+    # (game_id, margin, points_for, points_against, possessions)
+    recent: deque
+    home_margins: deque
+    away_margins: deque
+    last_date: np.datetime64 | None = None
+    # Ids counted on last_date: with it, the high-water mark add_final
+    # rejects replays against
+    last_ids: set[int] = field(default_factory=set)
+
+
+class FeatureEngine:
+    """Rolling per-team state; O(1) update per final, O(1) feature lookup."""
+
+    def __init__(self, window: int = WINDOW):
+        self.window = window
+        self._teams: dict[int, _TeamState] = {}
+
+    @classmethod
+    def from_columns(
+        cls, columns: dict[str, np.ndarray], window: int = WINDOW
+    ) -> "FeatureEngine":
+        """State as of the end of `columns` (replays the latest season)."""
+        engine = cls(window)
+        order = np.lexsort((columns["game_id"], columns["date"]))
+        latest = int(columns["season"].max()) if len(order) else 0
+        # Only the latest season matters - older state would be reset anyway
+        order = order[columns["season"][order] == latest]
+        poss = possessions(columns)
+        for i in order:
+            engine.add_final(
+                game_id=int(columns["game_id"][i]),
+                game_date=columns["date"][i],
+                season=int(columns["season"][i]),
+                home_team_id=int(columns["home_team_id"][i]),
+                visitor_team_id=int(columns["visitor_team_id"][i]),
+                home_score=int(columns["home_score"][i]),
+                visitor_score=int(columns["visitor_score"][i]),
+                possessions=float(poss[i]),
+            )
+        return engine
+
+    def _state(self, team_id: int, season: int) -> _TeamState:
+        state = self._teams.get(team_id)
+        if state is None or state.season < season:
+            state = _TeamState(
+                season=season,
+                recent=deque(maxlen=self.window),
+                home_margins=deque(maxlen=self.window),
+                away_margins=deque(maxlen=self.window),
+            )
+            self._teams[team_id] = state
+        return state
+
+    def _counted(
+        self, team_id: int, game_id: int, game_date: np.datetime64, season: int
+    ) -> bool:
+        """Whether a final is at or before the team's high-water mark."""
+        state = self._teams.get(team_id)
+        if state is None or state.last_date is None:
+            return False
+        if state.season != season:
+            return state.season > season
+        return game_date < state.last_date or (
+            game_date == state.last_date and game_id in state.last_ids
+        )
+
+    def add_final(
+        self,
+        game_id: int,
+        game_date: np.datetime64,
+        season: int,
+        home_team_id: int,
+        visitor_team_id: int,
+        home_score: int,
+        visitor_score: int,
+        possessions: float = np.nan,
+    ) -> bool:
+        """
+        Fold one final into both teams' state. False if already counted.
+
+        Finals must arrive in date order, as from_columns replays them. One
+        dated before either team's last counted game, or already counted on
+        that date, is a replay - even once it has left the rolling window.
+        """
+        game_date = np.datetime64(game_date, "D")
+        if self._counted(home_team_id, game_id, game_date, season) or self._counted(
+            visitor_team_id, game_id, game_date, season
+        ):
+            return False
+        sides = (
+            (home_team_id, home_score, visitor_score, True),
+            (visitor_team_id, visitor_score, home_score, False),
+        )
+        for team_id, points_for, points_against, at_home in sides:
+            state = self._state(team_id, season)
+            margin = float(points_for - points_against)
+            state.recent.append(
+                (game_id, margin, points_for, points_against, possessions)
+            )
+            (state.home_margins if at_home else state.away_margins).append(margin)
+            if game_date != state.last_date:
+                state.last_date, state.last_ids = game_date, set()
+            state.last_ids.add(game_id)
+        return True
+
+    def team_features(
+        self, team_id: int, game_date: np.datetime64, season: int, at_home: bool
+    ) -> list[float]:
+        """One side's TEAM_FEATURES for a game that hasn't been played."""
+        state = self._teams.get(team_id)
+        if state is None or state.season != season or not state.recent:
+            return [np.nan, np.nan, np.nan, float(REST_CAP_DAYS), 0.0, np.nan]
+
+        margins = [entry[1] for entry in state.recent]
+        with_poss = [e for e in state.recent if not np.isnan(e[4])]
+        poss_total = sum(e[4] for e in with_poss)
+        if poss_total > 0:
+            off_rating = 100 * sum(e[2] for e in with_poss) / poss_total
+            def_rating = 100 * sum(e[3] for e in with_poss) / poss_total
+        else:
+            off_rating = def_rating = np.nan
+
+        rest = (np.datetime64(game_date, "D") - state.last_date).astype(float)
+        rest = min(rest, REST_CAP_DAYS)
+        split = state.home_margins if at_home else state.away_margins
+
+        return [
+            sum(margins) / len(margins),
+            off_rating,
+            def_rating,
+            rest,
+            1.0 if rest == 1 else 0.0,
+            sum(split) / len(split) if split else np.nan,
+        ]
+
+    def features_for(
+        self,
+        home_team_id: int,
+        visitor_team_id: int,
+        game_date: np.datetime64,
+        season: int,
+    ) -> np.ndarray:
+        """Feature row (FEATURE_NAMES order) for an upcoming matchup."""
+        return np.array(
+            self.team_features(home_team_id, game_date, season, at_home=True)
+            + self.team_features(visitor_team_id, game_date, season, at_home=False),
+            dtype=np.float32,
+        )
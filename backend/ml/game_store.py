@@ -0,0 +1,176 @@
+"""
+Local columnar store of historical games, partitioned by season.
+
+Layout (one directory per season, one .npy file per column):
+
+    ml/data/games/season=2024/
+        manifest.json       row count + ingestion checkpoint
+        game_id.npy
+        date.npy
+        home_score.npy
+        ...
+
+Columns are plain NumPy arrays, so a whole season loads with one np.load per
+column (memory-mapped if asked) and feature code works on arrays directly.
+
+Rows are append-only and never reordered. The manifest is written last and
+records how many rows are committed, so a crash mid-write leaves at worst
+some columns with extra trailing rows - readers truncate to the manifest's
+count and the next run rewrites them.
+"""
+
+import json
+import os
+from dataclasses import asdict, dataclass
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_ROOT = Path(__file__).parent / "data" / "games"
+
+# Column name -> dtype. Box score totals are NaN until ingested.
+COLUMNS: dict[str, np.dtype] = {
+    "game_id": np.dtype(np.int64),
+    "date": np.dtype("datetime64[D]"),
+    "season": np.dtype(np.int16),
+    "postseason": np.dtype(np.bool_),
+    "home_team_id": np.dtype(np.int16),
+    "visitor_team_id": np.dtype(np.int16),
+    "home_score": np.dtype(np.int16),
+    "visitor_score": np.dtype(np.int16),
+    # Team totals from box scores - enough to estimate possessions
+    "home_fga": np.dtype(np.float32),
+    "home_fta": np.dtype(np.float32),
+    "home_oreb": np.dtype(np.float32),
+    "home_tov": np.dtype(np.float32),
+    "visitor_fga": np.dtype(np.float32),
+    "visitor_fta": np.dtype(np.float32),
+    "visitor_oreb": np.dtype(np.float32),
+    "visitor_tov": np.dtype(np.float32),
+}
+
+BOX_SCORE_STATS = ("fga", "fta", "oreb", "tov")
+BOX_SCORE_COLUMNS = [
+    f"{side}_{stat}" for side in ("home", "visitor") for stat in BOX_SCORE_STATS
+]
+
+
+@dataclass
+class SeasonManifest:
+    """Committed row count plus where ingestion left off."""
+
+    season: int
+    rows: int = 0
+    # Games phase: cursor of the next page, and whether the season pass ended
+    games_cursor: int | None = None
+    games_complete: bool = False
+    # Box score phase: last date whose box scores were filled in
+    box_scores_through: str | None = None
+
+
+class GameStore:
+    """Read/append access to the per-season column files."""
+
+    def __init__(self, root: str | Path = DEFAULT_ROOT):
+        self.root = Path(root)
+
+    def _season_dir(self, season: int) -> Path:
+        return self.root / f"season={season}"
+
+    def seasons(self) -> list[int]:
+        """Seasons with at least one committed row, ascending."""
+        if not self.root.exists():
+            return []
+        found = []
+        for path in self.root.glob("season=*"):
+            manifest = self.manifest(int(path.name.split("=", 1)[1]))
+            if manifest.rows:
+                found.append(manifest.season)
+        return sorted(found)
+
+    def manifest(self, season: int) -> SeasonManifest:
+        path = self._season_dir(season) / "manifest.json"
+        if not path.exists():
+            return SeasonManifest(season=season)
+        return SeasonManifest(**json.loads(path.read_text()))
+
+    def save_manifest(self, manifest: SeasonManifest) -> None:
+        directory = self._season_dir(manifest.season)
+        directory.mkdir(parents=True, exist_ok=True)
+        _atomic_write(directory / "manifest.json", json.dumps(asdict(manifest)))
+
+    def load_season(self, season: int, mmap: bool = False) -> dict[str, np.ndarray]:
+        """All committed columns for a season (empty arrays if none)."""
+        rows = self.manifest(season).rows
+        directory = self._season_dir(season)
+        columns = {}
+        for name, dtype in COLUMNS.items():
+            path = directory / f"{name}.npy"
+            if rows == 0 or not path.exists():
+                columns[name] = np.empty(0, dtype=dtype)
+                continue
+            array = np.load(path, mmap_mode="r" if mmap else None)
+            columns[name] = array[:rows]
+        return columns
+
+    def load_all(self, seasons: list[int] | None = None) -> dict[str, np.ndarray]:
+        """Concatenate seasons, sorted by date then game id."""
+        parts = [self.load_season(s) for s in (seasons or self.seasons())]
+        if not parts:
+            return {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+        columns = {name: np.concatenate([p[name] for p in parts]) for name in COLUMNS}
+        order = np.lexsort((columns["game_id"], columns["date"]))
+        return {name: array[order] for name, array in columns.items()}
+
+    def write_columns(
+        self, manifest: SeasonManifest, columns: dict[str, np.ndarray]
+    ) -> None:
+        """Replace a season's columns, then commit the new row count."""
+        rows = len(columns["game_id"])
+        directory = self._season_dir(manifest.season)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name, dtype in COLUMNS.items():
+            array = np.ascontiguousarray(columns[name], dtype=dtype)
+            if len(array) != rows:
+                raise ValueError(f"Column {name} has {len(array)} rows, want {rows}")
+            tmp = directory / f".{name}.npy.tmp"
+            with open(tmp, "wb") as f:
+                np.save(f, array)
+            os.replace(tmp, directory / f"{name}.npy")
+        manifest.rows = rows
+        self.save_manifest(manifest)
+
+    def append(self, manifest: SeasonManifest, new_rows: dict[str, np.ndarray]) -> int:
+        """Append rows whose game_id isn't stored yet. Returns rows added."""
+        existing = self.load_season(manifest.season)
+        fresh = ~np.isin(new_rows["game_id"], existing["game_id"])
+        if not fresh.any():
+            self.save_manifest(manifest)  # still commit the checkpoint
+            return 0
+        combined = {
+            name: np.concatenate([existing[name], new_rows[name][fresh]])
+            for name in COLUMNS
+        }
+        self.write_columns(manifest, combined)
+        return int(fresh.sum())
+
+
+def current_season(today: date | None = None) -> int:
+    """balldontlie seasons are named by the year they start (Oct-Jun)."""
+    today = today or date.today()
+    return today.year if today.month >= 10 else today.year - 1
+
+
+def empty_rows(count: int) -> dict[str, np.ndarray]:
+    """Column arrays for `count` new rows, box score totals set to NaN."""
+    rows = {name: np.zeros(count, dtype=dtype) for name, dtype in COLUMNS.items()}
+    for name in BOX_SCORE_COLUMNS:
+        rows[name][:] = np.nan
+    return rows
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(text)
+    os.replace(tmp, path)
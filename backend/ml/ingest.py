@@ -0,0 +1,274 @@
+"""
+Historical ingestion: balldontlie -> local columnar store (ml/game_store.py).
+
+    uv run python -m ml.ingest --seasons 2022 2023 2024   # backfill seasons
+    uv run python -m ml.ingest --incremental              # nightly append
+
+Two phases per season, each checkpointed in the season's manifest so an
+interrupted run picks up where it stopped:
+- games: page through /games with the cursor; finals are appended and the
+  next cursor is saved after every page
+- box scores: one /box_scores call per stored date, summing player lines
+  into team totals; the last completed date is saved after every date
+
+Incremental mode only asks for the current season from a few days before the
+last stored game, so a nightly run costs a handful of requests.
+
+All calls go through BalldontlieProvider at BACKFILL priority with a bucket
+slower than the server's, leaving most of the shared upstream key's budget to
+live refreshes when both run at once.
+"""
+
+import argparse
+import asyncio
+from datetime import date, timedelta
+
+import numpy as np
+from balldontlie.exceptions import AuthenticationError
+from balldontlie.nba.models import NBABoxScore, NBABoxScoreTeam, NBAGame
+
+from app.core.logging import get_logger, setup_logging
+from app.core.rate_limit import Priority, TokenBucket
+from app.providers.balldontlie_provider import BalldontlieProvider
+from app.services.nba_api import NBAApiService
+from app.settings import settings
+from ml.game_store import (
+    BOX_SCORE_COLUMNS,
+    BOX_SCORE_STATS,
+    GameStore,
+    current_season,
+    empty_rows,
+)
+
+logger = get_logger(__name__)
+
+# Default ingestion budget - half the free tier, the rest stays with the server
+DEFAULT_RATE_PER_MINUTE = 30
+
+# Incremental runs re-read this many days before the last stored game, to
+# pick up games that weren't final yet when it ran
+INCREMENTAL_LOOKBACK_DAYS = 2
+
+FINAL_STATUS = "Final"
+
+# Box score player field -> store stat name
+_PLAYER_STATS = {"fga": "fga", "fta": "fta", "oreb": "oreb", "turnover": "tov"}
+
+
+def game_rows(games: list[NBAGame]) -> dict[str, np.ndarray]:
+    """Column arrays for the final games in a page."""
+    finals = [g for g in games if g.status == FINAL_STATUS]
+    rows = empty_rows(len(finals))
+    for i, g in enumerate(finals):
+        rows["game_id"][i] = g.id
+        rows["date"][i] = np.datetime64(g.date[:10], "D")
+        rows["season"][i] = g.season
+        rows["postseason"][i] = g.postseason
+        rows["home_team_id"][i] = g.home_team.id
+        rows["visitor_team_id"][i] = g.visitor_team.id
+        rows["home_score"][i] = g.home_team_score
+        rows["visitor_score"][i] = g.visitor_team_score
+    return rows
+
+
+def team_totals(team: NBABoxScoreTeam | None) -> dict[str, float] | None:
+    """Sum player lines into team totals (None if there are no players)."""
+    if team is None or not team.players:
+        return None
+    totals = dict.fromkeys(BOX_SCORE_STATS, 0.0)
+    for player in team.players:
+        for field, stat in _PLAYER_STATS.items():
+            totals[stat] += getattr(player, field) or 0.0
+    return totals
+
+
+def fill_box_scores(
+    columns: dict[str, np.ndarray], day: np.datetime64, box_scores: list[NBABoxScore]
+) -> int:
+    """Write team totals into the matching rows. Returns games filled."""
+    on_day = columns["date"] == day
+    filled = 0
+    for box in box_scores:
+        if box.home_team is None or box.visitor_team is None:
+            continue
+        match = (
+            on_day
+            & (columns["home_team_id"] == box.home_team.id)
+            & (columns["visitor_team_id"] == box.visitor_team.id)
+        )
+        home, visitor = team_totals(box.home_team), team_totals(box.visitor_team)
+        if not match.any() or home is None or visitor is None:
+            continue
+        for side, totals in (("home", home), ("visitor", visitor)):
+            for stat, value in totals.items():
+                columns[f"{side}_{stat}"][match] = value
+        filled += 1
+    return filled
+
+
+async def ingest_games(
+    provider: BalldontlieProvider,
+    store: GameStore,
+    season: int,
+    start_date: date | None = None,
+) -> int:
+    """
+    Page through a season's games and append the finals.
+
+    With `start_date` (incremental) the season is re-read from that date on,
+    without touching the backfill cursor. Returns rows added.
+    """
+    manifest = store.manifest(season)
+    incremental = start_date is not None
+    if manifest.games_complete and not incremental:
+        logger.info("ingest_games_skipped", season=season, rows=manifest.rows)
+        return 0
+
+    cursor = None if incremental else manifest.games_cursor
+    added = 0
+    while True:
+        page = await provider.fetch_games_page(
+            seasons=[season], start_date=start_date, cursor=cursor
+        )
+        rows = game_rows(page.data)
+
+        # A late final on an already-processed date re-opens box scores there
+        stored_ids = store.load_season(season, mmap=True)["game_id"]
+        fresh_dates = rows["date"][~np.isin(rows["game_id"], stored_ids)]
+        if fresh_dates.size and manifest.box_scores_through is not None:
+            earliest = fresh_dates.min()
+            if earliest <= np.datetime64(manifest.box_scores_through):
+                manifest.box_scores_through = str(earliest - np.timedelta64(1, "D"))
+
+        cursor = page.meta.next_cursor
+        if not incremental:
+            manifest.games_cursor = cursor
+            manifest.games_complete = cursor is None
+        added += store.append(manifest, rows)
+
+        logger.info(
+            "ingest_games_page",
+            season=season,
+            page_games=len(page.data),
+            rows=manifest.rows,
+            next_cursor=cursor,
+        )
+        if cursor is None:
+            return added
+
+
+async def ingest_box_scores(
+    provider: BalldontlieProvider, store: GameStore, season: int
+) -> int:
+    """Fill team box score totals for stored dates not processed yet."""
+    manifest = store.manifest(season)
+    columns = store.load_season(season)
+    dates = np.unique(columns["date"])
+    if manifest.box_scores_through is not None:
+        dates = dates[dates > np.datetime64(manifest.box_scores_through)]
+
+    filled = 0
+    for day in dates:
+        response = await provider.fetch_box_scores_by_date(
+            day.item(), priority=Priority.BACKFILL
+        )
+        filled += fill_box_scores(columns, day, response.data)
+        manifest.box_scores_through = str(day)
+        store.write_columns(manifest, columns)
+
+    missing = int(np.isnan(columns[BOX_SCORE_COLUMNS[0]]).sum())
+    logger.info(
+        "ingest_box_scores_done",
+        season=season,
+        dates=len(dates),
+        games_filled=filled,
+        games_missing=missing,
+    )
+    return filled
+
+
+async def run(
+    seasons: list[int],
+    incremental: bool = False,
+    box_scores: bool = True,
+    rate_per_minute: float = DEFAULT_RATE_PER_MINUTE,
+    store: GameStore | None = None,
+    api: NBAApiService | None = None,
+) -> None:
+    store = store or GameStore()
+    own_api = api is None
+    if api is None:
+        if not settings.balldontlie_api_key:
+            raise ValueError("BALLDONTLIE_API_KEY not configured")
+        api = NBAApiService(api_key=settings.balldontlie_api_key)
+
+    # Separate, slower bucket: this process can't see the server's bucket
+    limiter = TokenBucket(
+        rate_per_minute=rate_per_minute,
+        capacity=max(1.0, rate_per_minute / 10),
+    )
+    provider = BalldontlieProvider(api, limiter=limiter)
+
+    try:
+        for season in seasons:
+            start_date = None
+            if incremental:
+                stored = store.load_season(season, mmap=True)["date"]
+                if stored.size:
+                    last = stored.max().item()
+                    start_date = last - timedelta(days=INCREMENTAL_LOOKBACK_DAYS)
+
+            added = await ingest_games(provider, store, season, start_date)
+            logger.info("ingest_games_done", season=season, added=added)
+
+            if box_scores:
+                try:
+                    await ingest_box_scores(provider, store, season)
+                except AuthenticationError:
+                    # /box_scores isn't included in every API tier
+                    logger.warning("ingest_box_scores_unavailable", season=season)
+                    box_scores = False
+    finally:
+        if own_api:
+            await api.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--seasons",
+        type=int,
+        nargs="+",
+        help="Seasons to ingest (start year). Default: the current season.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only fetch finals newer than what's stored (nightly job).",
+    )
+    parser.add_argument(
+        "--skip-box-scores",
+        action="store_true",
+        help="Games only; leave box score totals unfilled.",
+    )
+    parser.add_argument(
+        "--rate-per-minute",
+        type=float,
+        default=DEFAULT_RATE_PER_MINUTE,
+        help="Upstream requests per minute for this run.",
+    )
+    args = parser.parse_args()
+
+    setup_logging()
+    asyncio.run(
+        run(
+            seasons=args.seasons or [current_season()],
+            incremental=args.incremental,
+            box_scores=not args.skip_box_scores,
+            rate_per_minute=args.rate_per_minute,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Pregame prediction model artifact, shared by training and serving.
+
+Training (ml/train.py) fits scikit-learn models; what ships is only their
+coefficients, so the API scores games with NumPy alone and doesn't need
+scikit-learn (or unpickling) at runtime:
+
+- win: logistic regression -> P(home team wins)
+- spread: ridge regression -> expected home margin (home minus visitor)
+
+Both read the same FEATURE_NAMES row, imputed with the training means and
+standardized. Artifacts are versions in the model registry (ml/registry.py).
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from ml.features import FEATURE_NAMES, FEATURE_VERSION
+from ml.registry import MODELS_DIR, ModelRegistry
+
+KIND = "linear_game_model"
+
+
+@dataclass(frozen=True)
+class LinearGameModel:
+    """Standardize -> linear heads. All arrays are per-feature (FEATURE_NAMES)."""
+
+    version: str
+    feature_version: int
+    feature_names: list[str]
+    fill: np.ndarray  # imputation value for NaN features (training mean)
+    mean: np.ndarray
+    scale: np.ndarray
+    win_coef: np.ndarray
+    win_intercept: float
+    spread_coef: np.ndarray
+    spread_intercept: float
+
+    def _prepare(self, X: np.ndarray) -> np.ndarray:
+        X = np.where(np.isnan(X), self.fill, X)
+        return (X - self.mean) / self.scale
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """(n, 2) array of [P(visitor wins), P(home wins)], like scikit-learn."""
+        z = self._prepare(X) @ self.win_coef + self.win_intercept
+        home = 1.0 / (1.0 + np.exp(-z))
+        return np.column_stack([1.0 - home, home])
+
+    def predict_spread(self, X: np.ndarray) -> np.ndarray:
+        """Expected home margin per game."""
+        return self._prepare(X) @ self.spread_coef + self.spread_intercept
+
+    def save(self, root: str | Path = MODELS_DIR) -> Path:
+        """Publish as a new version in the registry at `root`."""
+        return ModelRegistry(root).publish(
+            self.version,
+            kind=KIND,
+            metadata={
+                "feature_version": self.feature_version,
+                "feature_names": self.feature_names,
+                "win_intercept": self.win_intercept,
+                "spread_intercept": self.spread_intercept,
+            },
+            arrays={
+                "fill": self.fill,
+                "mean": self.mean,
+                "scale": self.scale,
+                "win_coef": self.win_coef,
+                "spread_coef": self.spread_coef,
+            },
+        )
+
+    @classmethod
+    def load(cls, root: str | Path, version: str) -> "LinearGameModel":
+        """Load a registry version (arrays stay memory-mapped)."""
+        manifest, arrays = ModelRegistry(root).read(version)
+        if manifest["kind"] != KIND:
+            raise ValueError(f"Model {version} is a {manifest['kind']!r} artifact")
+        meta = manifest["metadata"]
+        if meta["feature_names"] != FEATURE_NAMES:
+            raise ValueError(
+                f"Model {version} was trained on different features "
+                f"(feature_version {meta['feature_version']}, "
+                f"current {FEATURE_VERSION})"
+            )
+        return cls(
+            version=version,
+            feature_version=meta["feature_version"],
+            feature_names=meta["feature_names"],
+            fill=arrays["fill"],
+            mean=arrays["mean"],
+            scale=arrays["scale"],
+            win_coef=arrays["win_coef"],
+            win_intercept=meta["win_intercept"],
+            spread_coef=arrays["spread_coef"],
+            spread_intercept=meta["spread_intercept"],
+        )
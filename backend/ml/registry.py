@@ -0,0 +1,92 @@
+"""
+Versioned model artifacts in ml/models, memory-mapped on load.
+
+Layout (one directory per version, names sort oldest -> newest):
+
+    ml/models/20260101093000/
+        manifest.json       kind, metadata, and the list of arrays
+        win_coef.npy        one uncompressed .npy per array
+        ...
+
+Arrays are opened with np.load(mmap_mode="r"): loading a version only maps
+the files, pages are read on first touch, and every process (uvicorn worker)
+mapping the same file shares one copy in the page cache instead of holding a
+private unpickled copy each.
+
+Publishing writes into a hidden temp directory and renames it into place, so
+a reader (or the API's reload watcher) sees either a complete version or
+nothing - never a half-written one.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+MODELS_DIR = Path(__file__).parent / "models"
+
+MANIFEST = "manifest.json"
+
+
+class ModelRegistry:
+    """Publish and read versioned array artifacts under one root."""
+
+    def __init__(self, root: str | Path = MODELS_DIR):
+        self.root = Path(root)
+
+    def versions(self) -> list[str]:
+        """Complete versions, oldest first."""
+        if not self.root.exists():
+            return []
+        return sorted(
+            path.name
+            for path in self.root.iterdir()
+            if not path.name.startswith(".") and (path / MANIFEST).exists()
+        )
+
+    def latest(self) -> str | None:
+        versions = self.versions()
+        return versions[-1] if versions else None
+
+    def publish(
+        self, version: str, kind: str, metadata: dict, arrays: dict[str, np.ndarray]
+    ) -> Path:
+        """Write a new version atomically. Versions are immutable."""
+        target = self.root / version
+        if target.exists():
+            raise FileExistsError(f"Model version {version} already exists")
+        self.root.mkdir(parents=True, exist_ok=True)
+
+        staging = Path(tempfile.mkdtemp(prefix=f".{version}-", dir=self.root))
+        try:
+            for name, array in arrays.items():
+                np.save(staging / f"{name}.npy", np.ascontiguousarray(array))
+            manifest = {
+                "version": version,
+                "kind": kind,
+                "metadata": metadata,
+                "arrays": {
+                    name: {"dtype": str(array.dtype), "shape": list(array.shape)}
+                    for name, array in arrays.items()
+                },
+            }
+            (staging / MANIFEST).write_text(json.dumps(manifest, indent=2))
+            os.chmod(staging, 0o755)
+            os.rename(staging, target)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        return target
+
+    def read(self, version: str) -> tuple[dict, dict[str, np.ndarray]]:
+        """(manifest, arrays) for a version; arrays are read-only memory maps."""
+        directory = self.root / version
+        manifest = json.loads((directory / MANIFEST).read_text())
+        arrays = {
+            name: np.load(directory / f"{name}.npy", mmap_mode="r")
+            for name in manifest["arrays"]
+        }
+        return manifest, arrays
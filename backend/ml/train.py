@@ -0,0 +1,96 @@
+"""
+Train the pregame model on the local game store and write an artifact.
+
+    uv run --extra ml python -m ml.train                  # every stored season
+    uv run --extra ml python -m ml.train --seasons 2021 2022 2023
+
+Needs the ml extra (scikit-learn). The model is published to the registry in
+ml/models as version <timestamp> (see ml/registry.py); a running API picks
+it up within MODEL_POLL_SECONDS, no restart needed.
+"""
+
+import argparse
+import time
+from datetime import UTC, datetime
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression, Ridge
+
+from app.core.logging import get_logger, setup_logging
+from ml.features import FEATURE_NAMES, FEATURE_VERSION, build_features
+from ml.game_store import GameStore
+from ml.model import LinearGameModel
+from ml.registry import MODELS_DIR
+
+logger = get_logger(__name__)
+
+
+def fit(
+    X: np.ndarray,
+    home_margin: np.ndarray,
+    version: str,
+    c: float = 1.0,
+    alpha: float = 1.0,
+) -> LinearGameModel:
+    """
+    Fit both heads on a feature matrix and the final home margins.
+
+    `c` is the logistic head's inverse regularization, `alpha` the ridge
+    penalty of the spread head.
+    """
+    fill = np.nanmean(X, axis=0)
+    fill = np.where(np.isnan(fill), 0.0, fill)
+    X = np.where(np.isnan(X), fill, X)
+    mean = X.mean(axis=0)
+    scale = X.std(axis=0)
+    scale = np.where(scale > 0, scale, 1.0)
+    Z = (X - mean) / scale
+
+    win = LogisticRegression(C=c, max_iter=1000).fit(Z, home_margin > 0)
+    spread = Ridge(alpha=alpha).fit(Z, home_margin)
+
+    return LinearGameModel(
+        version=version,
+        feature_version=FEATURE_VERSION,
+        feature_names=list(FEATURE_NAMES),
+        fill=fill,
+        mean=mean,
+        scale=scale,
+        win_coef=win.coef_[0],
+        win_intercept=float(win.intercept_[0]),
+        spread_coef=spread.coef_,
+        spread_intercept=float(spread.intercept_),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--seasons", type=int, nargs="+", help="Default: all")
+    parser.add_argument("--C", type=float, default=1.0, dest="c")
+    parser.add_argument("--alpha", type=float, default=1.0)
+    parser.add_argument("--output", default=str(MODELS_DIR))
+    args = parser.parse_args()
+    setup_logging()
+
+    start = time.perf_counter()
+    columns = GameStore().load_all(args.seasons)
+    if not len(columns["game_id"]):
+        raise SystemExit("No games stored - run python -m ml.ingest first")
+    X = build_features(columns)
+    home_margin = columns["home_score"].astype(np.float64) - columns["visitor_score"]
+
+    version = datetime.now(UTC).strftime("%Y%m%d%H%M%S")
+    model = fit(X, home_margin, version, c=args.c, alpha=args.alpha)
+    path = model.save(args.output)
+
+    logger.info(
+        "model_trained",
+        version=version,
+        path=str(path),
+        games=len(home_margin),
+        duration_ms=round((time.perf_counter() - start) * 1000, 2),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Shared fixtures: in-process fake upstreams and a clean slate of module state.
+
+Upstreams are benchmarks/fake_balldontlie.py apps reached over an ASGI
+transport, so tests make real HTTP requests through NBAApiService without
+sockets or subprocesses. The service keeps its caches, breakers and latency
+windows at module level (one per process in production); every test gets
+fresh ones.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Callable
+
+import httpx
+import numpy as np
+import pytest
+
+from app.core.rate_limit import TokenBucket
+from app.core.singleflight import SingleFlight
+from app.providers import failover_provider
+from app.providers.balldontlie_provider import BalldontlieProvider
+from app.providers.nba_cdn_provider import NBACdnProvider
+from app.services import game_service
+from app.services.live_probability import LiveProbabilityEngine
+from app.services.nba_api import NBAApiService
+from app.services.prediction_service import PredictionService
+from app.services.schedule_cache import DateSlateCache
+from benchmarks import fake_balldontlie
+from benchmarks.fake_balldontlie import FakeConfig, create_app
+from ml.elo import MEAN_RATING, EloRatings
+from ml.features import FEATURE_NAMES, FEATURE_VERSION, FeatureEngine
+from ml.model import LinearGameModel
+
+# Budgets big enough that tests never queue unless they mean to
+UNLIMITED = 1e9
+
+
+class FakeUpstream:
+    """A fake upstream, its config (mutable mid-test) and a client for it."""
+
+    def __init__(
+        self,
+        config: FakeConfig,
+        wrap: Callable[[httpx.AsyncBaseTransport], httpx.AsyncBaseTransport]
+        | None = None,
+    ):
+        self.config = config
+        transport = httpx.ASGITransport(app=create_app(config))
+        self.api = NBAApiService(
+            api_key="test",
+            base_url="http://fake",
+            transport=wrap(transport) if wrap else transport,
+        )
+
+    def balldontlie(self, limiter: TokenBucket | None = None) -> BalldontlieProvider:
+        return BalldontlieProvider(
+            self.api, limiter or TokenBucket(UNLIMITED, UNLIMITED)
+        )
+
+    def cdn(self, limiter: TokenBucket | None = None) -> NBACdnProvider:
+        return NBACdnProvider(self.api, limiter or TokenBucket(UNLIMITED, UNLIMITED))
+
+    async def calls(self, path: str | None = None) -> int:
+        """Upstream calls so far, to one path or in total."""
+        stats = (await self.api.client.get("/_stats")).json()
+        return stats["calls"].get(path, 0) if path else stats["total"]
+
+
+def fast_config(**changes) -> FakeConfig:
+    """About a millisecond per call, small payloads."""
+    return FakeConfig(
+        **{"latency_ms": 1.0, "jitter_ms": 0.0, "players_per_team": 2, **changes}
+    )
+
+
+def linear_model(
+    version: str = "20250101000000", margin_weight: float = 0.1, home_edge: float = 0.0
+) -> LinearGameModel:
+    """A model scoring the margin difference: missing features count as 0,
+    so a matchup with no history is home_edge (logit) either way."""
+    n = len(FEATURE_NAMES)
+    win_coef = np.zeros(n)
+    win_coef[FEATURE_NAMES.index("home_margin")] = margin_weight
+    win_coef[FEATURE_NAMES.index("visitor_margin")] = -margin_weight
+    return LinearGameModel(
+        version=version,
+        feature_version=FEATURE_VERSION,
+        feature_names=list(FEATURE_NAMES),
+        fill=np.zeros(n),
+        mean=np.zeros(n),
+        scale=np.ones(n),
+        win_coef=win_coef,
+        win_intercept=home_edge,
+        spread_coef=win_coef * 10,
+        spread_intercept=home_edge * 10,
+    )
+
+
+def warm_elo() -> EloRatings:
+    """Every team at the mean rating, as if loaded from a store, so the Elo
+    fallback scores the first slate rather than from the second on."""
+    elo = EloRatings()
+    elo.ratings = dict.fromkeys(range(1, 31), MEAN_RATING)
+    return elo
+
+
+@pytest.fixture
+async def make_upstream() -> AsyncIterator[Callable[..., FakeUpstream]]:
+    """Build fast fakes (FakeUpstream's arguments); closed after the test."""
+    made: list[FakeUpstream] = []
+
+    def make(**kwargs) -> FakeUpstream:
+        made.append(FakeUpstream(fast_config(), **kwargs))
+        return made[-1]
+
+    yield make
+    for fake in made:
+        await fake.api.close()
+
+
+@pytest.fixture
+def upstream(make_upstream) -> FakeUpstream:
+    """A fast fake balldontlie."""
+    return make_upstream()
+
+
+@pytest.fixture
+def cdn_upstream(make_upstream) -> FakeUpstream:
+    """A second fake, standing in for the NBA CDN."""
+    return make_upstream()
+
+
+@pytest.fixture
+def score_ticks(monkeypatch):
+    """Make the fake's live scores move every 10ms instead of every 15s."""
+    monkeypatch.setattr(fake_balldontlie, "SCORE_TICK_SECONDS", 0.01)
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    """Module-level caches, flights, breakers, sharing and models, as at startup."""
+    for name, value in {
+        "_snapshot": None,
+        "_snapshot_ready": asyncio.Event(),
+        "_last_refresh_error": None,
+        "_delta_cache": {},
+        "_delta_cache_version": 0,
+        "_dates": DateSlateCache(),
+        "_schedule": None,
+        "_team_cache": {},
+        "_team_cache_index": None,
+        "_shared": None,
+        "_leader": True,
+        "_shared_stamps": {},
+        "_store": None,
+        "_writer": None,
+        "_predictions": PredictionService(None, FeatureEngine(), warm_elo()),
+        "_live_probability": LiveProbabilityEngine(),
+        "_box_scores_flight": SingleFlight("box_scores"),
+        "_games_flight": SingleFlight("games"),
+        "_live_flight": SingleFlight("box_scores_live"),
+        "_date_flight": SingleFlight("date_slate"),
+    }.items():
+        monkeypatch.setattr(game_service, name, value)
+    monkeypatch.setattr(failover_provider, "_breakers", {})
+    monkeypatch.setattr(failover_provider, "_latencies", {})
@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from ml.features import build_features
+from ml.game_store import BOX_SCORE_COLUMNS, GameStore, empty_rows
+
+# Folds fit with scikit-learn (the ml extra)
+backtest = pytest.importorskip("ml.backtest")
+
+SEASONS = (2021, 2022, 2023, 2024)
+
+
+def season_rows(season: int, days: int = 40, seed: int = 0) -> dict[str, np.ndarray]:
+    """A season where low team ids are stronger, plus home court."""
+    rng = np.random.default_rng([season, seed])
+    games = []
+    for day in range(days):
+        teams = rng.permutation(np.arange(1, 13))
+        games.extend((day, teams[2 * k], teams[2 * k + 1]) for k in range(6))
+    rows = empty_rows(len(games))
+    rows["game_id"][:] = season * 10_000 + np.arange(len(games))
+    rows["season"][:] = season
+    rows["date"][:] = [np.datetime64(f"{season}-11-01") + day for day, _, _ in games]
+    home = np.array([h for _, h, _ in games])
+    visitor = np.array([v for _, _, v in games])
+    rows["home_team_id"][:], rows["visitor_team_id"][:] = home, visitor
+    margin = (visitor - home) + 3 + rng.normal(0, 10, len(games))
+    rows["home_score"][:] = 110 + np.round(margin / 2)
+    rows["visitor_score"][:] = rows["home_score"] - np.round(margin) - (margin == 0)
+    for name in BOX_SCORE_COLUMNS:
+        rows[name][:] = rng.integers(5, 90, len(games))
+    return rows
+
+
+@pytest.fixture
+def store(tmp_path) -> GameStore:
+    store = GameStore(tmp_path / "games")
+    for season in SEASONS:
+        store.append(store.manifest(season), season_rows(season))
+    return store
+
+
+def test_feature_cache_is_reused_until_the_store_changes(store, tmp_path):
+    root = tmp_path / "features"
+    path, hit = backtest.feature_cache(store, root)
+    assert not hit
+    assert backtest.feature_cache(store, root) == (path, True)
+    np.testing.assert_array_equal(
+        np.load(path / "X.npy"), build_features(store.load_all()), strict=True
+    )
+
+    # New finals: a new key, and the stale entry is cleaned up
+    more = season_rows(2024, seed=1)
+    more["game_id"] += 5_000
+    more["date"] += 60
+    store.append(store.manifest(2024), more)
+    fresh, hit = backtest.feature_cache(store, root)
+    assert not hit and fresh != path
+    assert [p.name for p in root.iterdir()] == [fresh.name]
+
+
+def test_folds_train_only_on_earlier_seasons(store, tmp_path):
+    cache, _ = backtest.feature_cache(store, tmp_path / "features")
+    folds = [
+        backtest.Fold(season=s, cache=str(cache), c=1.0, alpha=1.0) for s in SEASONS[2:]
+    ]
+
+    results, _ = backtest.run_folds(folds, workers=1)
+
+    games = len(season_rows(SEASONS[0])["game_id"])
+    assert [r["season"] for r in results] == list(SEASONS[2:])
+    assert [r["train_games"] for r in results] == [2 * games, 3 * games]
+    assert all(r["test_games"] == games for r in results)
+    # Stronger teams and home court are learnable; a coin flip is 0.25
+    assert all(r["brier"] < 0.25 for r in results)
+    for result in results:
+        calibrated = sum(b["games"] for b in result["calibration"])
+        assert calibrated == result["test_games"]
+
+
+def test_parallel_folds_match_serial(store, tmp_path):
+    cache, _ = backtest.feature_cache(store, tmp_path / "features")
+    folds = [
+        backtest.Fold(season=s, cache=str(cache), c=0.5, alpha=2.0) for s in SEASONS[1:]
+    ]
+
+    def metrics(results):
+        return [
+            {k: v for k, v in r.items() if "seconds" not in k and not k.startswith("_")}
+            for r in results
+        ]
+
+    serial, _ = backtest.run_folds(folds, workers=1)
+    parallel, _ = backtest.run_folds(folds, workers=2)
+    assert metrics(parallel) == metrics(serial)
+
+
+def test_scores():
+    outcome = np.array([True, False, True, False])
+    perfect = backtest.scores(outcome.astype(float), outcome)
+    assert perfect["accuracy"] == 1.0 and perfect["brier"] == 0.0
+    coin = backtest.scores(np.full(4, 0.5), outcome)
+    assert coin["brier"] == 0.25 and coin["log_loss"] == round(np.log(2), 4)
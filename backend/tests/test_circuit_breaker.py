@@ -0,0 +1,83 @@
+from app.core.circuit_breaker import CircuitBreaker, CircuitState
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def tripped(clock: Clock) -> CircuitBreaker:
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_seconds=10, clock=clock)
+    for _ in range(3):
+        breaker.record_failure()
+    return breaker
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("test", failure_threshold=3, clock=Clock())
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow()
+
+
+def test_half_open_admits_exactly_one_probe():
+    clock = Clock()
+    breaker = tripped(clock)
+    clock.now = 10
+
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+    assert not breaker.allow()
+
+
+def test_probe_success_closes():
+    clock = Clock()
+    breaker = tripped(clock)
+    clock.now = 10
+    assert breaker.allow()
+
+    breaker.record_success()
+
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow() and breaker.allow()
+
+
+def test_probe_failure_reopens_for_another_reset_period():
+    clock = Clock()
+    breaker = tripped(clock)
+    clock.now = 10
+    assert breaker.allow()
+
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.OPEN
+    clock.now = 19.9
+    assert not breaker.allow()
+    clock.now = 20
+    assert breaker.allow()
+    assert breaker.stats()["opened_total"] == 2
+
+
+def test_released_probe_lets_the_next_caller_probe():
+    clock = Clock()
+    breaker = tripped(clock)
+    clock.now = 10
+    assert breaker.allow()
+
+    breaker.release()
+
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
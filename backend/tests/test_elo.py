@@ -0,0 +1,127 @@
+import numpy as np
+import pytest
+
+from ml.elo import MEAN_RATING, EloParams, EloRatings, recompute, sweep
+from ml.game_store import GameStore, empty_rows
+
+START = np.datetime64("2024-11-01")
+GRID = [EloParams(), EloParams(k=30, home_advantage=60, carryover=0.5)]
+
+
+def two_seasons(days: int = 20, seed: int = 0) -> dict[str, np.ndarray]:
+    """Random finals over two seasons, a few games a day."""
+    rng = np.random.default_rng(seed)
+    games = []
+    for season in (2024, 2025):
+        for day in range(days):
+            teams = rng.permutation(np.arange(1, 11))
+            for k in range(rng.integers(1, 5)):
+                games.append((season, day, teams[2 * k], teams[2 * k + 1]))
+    columns = empty_rows(len(games))
+    columns["game_id"][:] = np.arange(1, len(games) + 1)
+    columns["season"][:] = [season for season, _, _, _ in games]
+    columns["date"][:] = [
+        START + np.timedelta64(365 * (season - 2024) + day, "D")
+        for season, day, _, _ in games
+    ]
+    columns["home_team_id"][:] = [home for _, _, home, _ in games]
+    columns["visitor_team_id"][:] = [visitor for _, _, _, visitor in games]
+    columns["home_score"][:] = rng.integers(90, 130, len(games))
+    columns["visitor_score"][:] = rng.integers(90, 130, len(games))
+    return columns
+
+
+def test_update_counts_each_final_once():
+    elo = EloRatings()
+    assert elo.update(1, START, 2024, 1, 2, 110, 100)
+    rating = elo.rating(1)
+
+    assert not elo.update(1, START, 2024, 1, 2, 110, 100)
+    assert not elo.update(7, START - 1, 2024, 1, 3, 110, 100)
+    assert elo.rating(1) == rating > MEAN_RATING
+    assert elo.rating(1) + elo.rating(2) == pytest.approx(2 * MEAN_RATING)
+    assert elo.games == {1: 1, 2: 1}
+
+
+@pytest.mark.parametrize("params", GRID)
+def test_incremental_ratings_match_the_grid_recompute(params):
+    columns = two_seasons()
+    team_ids, ratings, pregame = recompute(columns, GRID)
+    row = GRID.index(params)
+
+    elo = EloRatings(params)
+    order = np.lexsort((columns["game_id"], columns["date"]))
+    for i in order:
+        home, visitor = (
+            int(columns["home_team_id"][i]),
+            int(columns["visitor_team_id"][i]),
+        )
+        season = int(columns["season"][i])
+        # A new season's carryover is applied by its first update
+        if elo.season == season:
+            expected = pregame[row, i]
+            assert elo.home_win_probability(home, visitor) == pytest.approx(expected)
+        elo.update(
+            int(columns["game_id"][i]),
+            columns["date"][i],
+            season,
+            home,
+            visitor,
+            int(columns["home_score"][i]),
+            int(columns["visitor_score"][i]),
+        )
+
+    np.testing.assert_allclose([elo.rating(t) for t in team_ids], ratings[row])
+
+
+def test_saved_ratings_resume_from_their_checkpoint(tmp_path):
+    columns = two_seasons()
+    store = GameStore(tmp_path / "games")
+    latest = columns["season"] == 2025
+    first_half = latest & (columns["date"] < START + 375)
+    for season, mask in ((2024, ~latest), (2025, first_half)):
+        store.append(store.manifest(season), {k: v[mask] for k, v in columns.items()})
+
+    path = tmp_path / "elo.npz"
+    EloRatings.from_store(store, path).save(path)
+    store.append(
+        store.manifest(2025),
+        {k: v[latest & ~first_half] for k, v in columns.items()},
+    )
+
+    resumed = EloRatings.from_store(store, path)
+    fresh = EloRatings()
+    fresh.update_from_columns(columns)
+
+    assert resumed.games == fresh.games
+    assert resumed.last_date == fresh.last_date
+    for team, rating in fresh.ratings.items():
+        # Saved as float32
+        assert resumed.rating(team) == pytest.approx(rating, abs=1e-3)
+
+
+def test_saved_params_that_differ_are_recomputed(tmp_path):
+    store = GameStore(tmp_path / "games")
+    columns = two_seasons(days=3)
+    for season in (2024, 2025):
+        mask = columns["season"] == season
+        store.append(store.manifest(season), {k: v[mask] for k, v in columns.items()})
+    path = tmp_path / "elo.npz"
+    EloRatings.from_store(store, path, GRID[1]).save(path)
+
+    elo = EloRatings.from_store(store, path)
+
+    assert elo.params == EloParams()
+    assert sum(elo.games.values()) == 2 * len(columns["game_id"])
+
+
+def test_sweep_is_the_same_across_processes():
+    columns = two_seasons(days=5)
+
+    serial = sweep(columns, GRID)
+    parallel = sweep(columns, GRID, workers=2)
+
+    assert [p for p, _ in parallel] == [p for p, _ in serial]
+    np.testing.assert_allclose(
+        [loss for _, loss in parallel], [loss for _, loss in serial]
+    )
@@ -0,0 +1,178 @@
+"""
+FailoverProvider over a fake balldontlie and a fake NBA CDN.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from balldontlie.exceptions import AuthenticationError
+
+from app.core.circuit_breaker import CircuitState
+from app.core.rate_limit import TokenBucket
+from app.providers import failover_provider
+from app.providers.base import BOX_SCORES, GAMES
+from app.providers.failover_provider import FailoverProvider, get_breaker
+from app.services.game_decoder import (
+    US_EASTERN,
+    decode_box_scores,
+    game_from_box_score,
+)
+from app.services.game_service import GameService
+
+BOX_SCORES_PATH = "/nba/v1/box_scores"
+GAMES_PATH = "/nba/v1/games"
+
+
+def today():
+    return datetime.now(US_EASTERN).date()
+
+
+def games(raw: bytes) -> list:
+    return sorted(
+        (game_from_box_score(b) for b in decode_box_scores(raw)), key=lambda g: g.id
+    )
+
+
+@pytest.fixture
+def provider(upstream, cdn_upstream) -> FailoverProvider:
+    return FailoverProvider([upstream.balldontlie(), cdn_upstream.cdn()])
+
+
+class BoxScoresForbidden(httpx.AsyncBaseTransport):
+    """401 on /box_scores, like an API plan without it; the rest passes."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport):
+        self.inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.startswith(BOX_SCORES_PATH):
+            return httpx.Response(401, json={"error": "Unauthorized"})
+        return await self.inner.handle_async_request(request)
+
+
+async def test_healthy_primary_answers_alone(provider, upstream, cdn_upstream):
+    raw = await provider.fetch_box_scores_by_date_raw(today())
+
+    assert len(decode_box_scores(raw)) == upstream.config.games
+    assert await cdn_upstream.calls() == 0
+
+
+async def test_cdn_answers_with_the_same_games(upstream, cdn_upstream):
+    from_balldontlie = await upstream.balldontlie().fetch_box_scores_by_date_raw(
+        today()
+    )
+    from_cdn = await cdn_upstream.cdn().fetch_box_scores_by_date_raw(today())
+
+    assert games(from_cdn) == games(from_balldontlie)
+
+
+async def test_outage_fails_over_then_opens_the_circuit(
+    provider, upstream, cdn_upstream
+):
+    upstream.config.error_rate = 1.0
+
+    for _ in range(10):
+        await provider.fetch_box_scores_by_date_raw(today())
+
+    threshold = failover_provider.CIRCUIT_FAILURE_THRESHOLD
+    assert await upstream.calls() == threshold
+    assert await cdn_upstream.calls() == 10
+    assert get_breaker("balldontlie", BOX_SCORES).state == CircuitState.OPEN
+
+
+async def test_open_box_scores_circuit_leaves_games_alone(
+    provider, upstream, cdn_upstream
+):
+    upstream.config.error_rate = 1.0
+    for _ in range(failover_provider.CIRCUIT_FAILURE_THRESHOLD):
+        await provider.fetch_box_scores_by_date_raw(today())
+    upstream.config.error_rate = 0.0
+
+    await provider.fetch_games_by_date_raw(today())
+
+    assert await upstream.calls(GAMES_PATH) == 1
+    assert get_breaker("balldontlie", GAMES).state == CircuitState.CLOSED
+
+
+async def test_open_box_scores_circuit_falls_back_to_games(upstream):
+    # balldontlie alone: the CDN has no /games to offer
+    service = GameService(FailoverProvider([upstream.balldontlie()]))
+    breaker = get_breaker("balldontlie", BOX_SCORES)
+    for _ in range(failover_provider.CIRCUIT_FAILURE_THRESHOLD):
+        breaker.record_failure()
+
+    snapshot = await service.refresh_todays_games()
+
+    assert snapshot.data_source == "games"
+    assert await upstream.calls(BOX_SCORES_PATH) == 0
+
+
+async def test_unauthorized_box_scores_never_open_a_circuit(make_upstream):
+    upstream = make_upstream(wrap=BoxScoresForbidden)
+    provider = FailoverProvider([upstream.balldontlie()])
+    service = GameService(provider)
+
+    for _ in range(failover_provider.CIRCUIT_FAILURE_THRESHOLD * 2):
+        with pytest.raises(AuthenticationError):
+            await provider.fetch_box_scores_by_date_raw(today())
+
+    assert get_breaker("balldontlie", BOX_SCORES).state == CircuitState.CLOSED
+    # Today and past dates still come from /games
+    assert (await service.refresh_todays_games()).data_source == "games"
+    await service.get_date_body(today() - timedelta(days=2))
+    assert await upstream.calls(GAMES_PATH) == 2
+
+
+async def test_slow_primary_is_hedged(provider, upstream, cdn_upstream, monkeypatch):
+    monkeypatch.setattr(failover_provider, "HEDGE_DEFAULT_SECONDS", 0.05)
+    upstream.config.tail_rate, upstream.config.tail_ms = 1.0, 1000.0
+    hedges = failover_provider.provider_hedges.value(BOX_SCORES)
+    loop = asyncio.get_running_loop()
+
+    start = loop.time()
+    raw = await provider.fetch_box_scores_by_date_raw(today())
+
+    assert loop.time() - start < 0.5
+    assert len(decode_box_scores(raw)) == upstream.config.games
+    assert failover_provider.provider_hedges.value(BOX_SCORES) == hedges + 1
+    assert await cdn_upstream.calls() == 1
+
+
+async def test_queueing_for_our_own_budget_is_not_hedged(
+    upstream, cdn_upstream, monkeypatch
+):
+    monkeypatch.setattr(failover_provider, "HEDGE_DEFAULT_SECONDS", 0.05)
+    # One token in hand, the next in 150ms - longer than the hedge delay
+    limiter = TokenBucket(rate_per_minute=400, capacity=1)
+    provider = FailoverProvider([upstream.balldontlie(limiter), cdn_upstream.cdn()])
+
+    await asyncio.gather(
+        provider.fetch_box_scores_by_date_raw(today()),
+        provider.fetch_box_scores_by_date_raw(today()),
+    )
+
+    assert await cdn_upstream.calls() == 0
+    # Latencies are time on the wire: the queued call doesn't skew the p95
+    window = failover_provider._latencies[("balldontlie", BOX_SCORES)]
+    assert max(window._samples) < 0.1
+
+
+async def test_half_open_circuit_sends_one_probe(
+    provider, upstream, cdn_upstream, monkeypatch
+):
+    monkeypatch.setattr(failover_provider, "CIRCUIT_RESET_SECONDS", 0.05)
+    upstream.config.error_rate = 1.0
+    for _ in range(failover_provider.CIRCUIT_FAILURE_THRESHOLD):
+        await provider.fetch_box_scores_by_date_raw(today())
+    await asyncio.sleep(0.06)
+    upstream.config.error_rate, upstream.config.latency_ms = 0.0, 50.0
+    before = await upstream.calls()
+
+    await asyncio.gather(
+        *(provider.fetch_box_scores_by_date_raw(today()) for _ in range(5))
+    )
+
+    assert await upstream.calls() - before == 1
+    assert get_breaker("balldontlie", BOX_SCORES).state == CircuitState.CLOSED
@@ -0,0 +1,115 @@
+"""
+SSE fan-out: one full slate on connect, then only what changed.
+"""
+
+import asyncio
+import json
+from datetime import UTC, datetime
+
+import pytest
+
+from app.models.schemas import GameListResponse, GameStatus, GameWithPrediction, Team
+from app.services import game_broadcaster
+from app.services.game_broadcaster import GameBroadcaster, broadcaster
+from app.services.game_service import GameService
+
+
+def game(game_id: int, home_score: int = 0) -> GameWithPrediction:
+    return GameWithPrediction(
+        id=game_id,
+        status=GameStatus.IN_PROGRESS,
+        status_text="3rd 5:00",
+        period=3,
+        time_remaining="5:00",
+        home_team=Team(
+            id=1, name="Hawks", city="Atlanta", abbreviation="ATL", score=home_score
+        ),
+        away_team=Team(
+            id=2, name="Celtics", city="Boston", abbreviation="BOS", score=50
+        ),
+        start_time=None,
+    )
+
+
+def slate(*games: GameWithPrediction, version: int = 1) -> GameListResponse:
+    return GameListResponse(
+        games=list(games), last_updated=datetime.now(UTC), version=version
+    )
+
+
+def parse(frame: bytes) -> tuple[str, dict]:
+    """The event name and JSON data of one SSE frame."""
+    fields = dict(
+        line.split(": ", 1) for line in frame.decode().splitlines() if ": " in line
+    )
+    return fields["event"], json.loads(fields["data"])
+
+
+async def test_subscriber_gets_the_slate_then_only_changes():
+    hub = GameBroadcaster()
+    first = slate(game(1), game(2))
+    stream = hub.stream(lambda: first.model_dump_json().encode())
+
+    opening = await anext(stream)
+    assert opening.startswith(b"retry: ")
+    event, data = parse(opening)
+    assert event == "slate" and len(data["games"]) == 2
+
+    second = slate(game(1, home_score=3), version=2)
+    hub.publish(first, second)
+
+    event, data = parse(await anext(stream))
+    assert event == "games"
+    assert [g["id"] for g in data["games"]] == [1]
+    assert data["removed_ids"] == [2]
+    assert data["version"] == 2
+    await stream.aclose()
+    assert hub.subscriber_count == 0
+
+
+async def test_unchanged_slate_sends_nothing(monkeypatch):
+    monkeypatch.setattr(game_broadcaster, "HEARTBEAT_SECONDS", 0.01)
+    hub = GameBroadcaster()
+    current = slate(game(1))
+    stream = hub.stream(lambda: b"{}")
+    await anext(stream)
+
+    hub.publish(current, slate(game(1), version=2))
+
+    assert await anext(stream) == b": heartbeat\n\n"
+    await stream.aclose()
+
+
+async def test_slow_subscriber_is_dropped():
+    hub = GameBroadcaster()
+    stream = hub.stream(lambda: b"{}")
+    await anext(stream)
+
+    previous = slate(game(1))
+    for score in range(1, game_broadcaster.SUBSCRIBER_QUEUE_SIZE + 2):
+        current = slate(game(1, home_score=score), version=score)
+        hub.publish(previous, current)
+        previous = current
+
+    # Everything queued is discarded and the stream ends
+    with pytest.raises(StopAsyncIteration):
+        await anext(stream)
+    assert hub.dropped_total == 1
+    assert hub.subscriber_count == 0
+
+
+async def test_refresh_pushes_changed_live_games(upstream, score_ticks):
+    service = GameService(upstream.balldontlie())
+    first = await service.refresh_todays_games()
+    stream = broadcaster.stream(lambda: first.body.content)
+    await anext(stream)
+
+    await asyncio.sleep(0.05)
+    second = await service.refresh_todays_games()
+
+    event, data = parse(await asyncio.wait_for(anext(stream), 1))
+    await stream.aclose()
+    assert event == "games"
+    assert data["version"] == second.version
+    assert data["games"]
+    assert {g["status"] for g in data["games"]} == {"in_progress"}
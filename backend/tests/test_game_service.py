@@ -0,0 +1,176 @@
+"""
+The refresh path and /api/games against a fake balldontlie.
+
+The fake's slate is a third each live, scheduled and final; live scores
+only move when the score_ticks fixture speeds up its clock.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from balldontlie.exceptions import ServerError
+from fastapi import FastAPI
+
+from app.models.schemas import GameStatus
+from app.providers.failover_provider import get_game_provider
+from app.routers import games
+from app.services.game_decoder import US_EASTERN
+from app.services.game_service import GameService, get_snapshot
+
+BOX_SCORES = "/nba/v1/box_scores"
+LIVE_BOX_SCORES = "/nba/v1/box_scores/live"
+
+
+@pytest.fixture
+def service(upstream) -> GameService:
+    return GameService(upstream.balldontlie())
+
+
+@pytest.fixture
+async def client(service) -> AsyncIterator[httpx.AsyncClient]:
+    """The games router, its provider pointed at the fake."""
+    app = FastAPI()
+    app.include_router(games.router, prefix="/api/games")
+    app.dependency_overrides[get_game_provider] = lambda: service._provider
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
+
+
+async def test_first_refresh_fetches_the_full_day(service, upstream):
+    snapshot = await service.refresh_todays_games()
+
+    assert snapshot.data_source == "box_scores"
+    statuses = [g.status for g in snapshot.response.games]
+    assert len(statuses) == upstream.config.games
+    # Live first, then scheduled, then final
+    assert statuses == sorted(
+        statuses,
+        key=[GameStatus.IN_PROGRESS, GameStatus.SCHEDULED, GameStatus.FINAL].index,
+    )
+    assert await upstream.calls(BOX_SCORES) == 1
+
+
+async def test_concurrent_refreshes_share_one_upstream_call(service, upstream):
+    await asyncio.gather(*(service.refresh_todays_games() for _ in range(5)))
+
+    assert await upstream.calls() == 1
+
+
+async def test_live_ticks_merge_the_live_feed(service, upstream, score_ticks):
+    first = await service.refresh_todays_games()
+    await asyncio.sleep(0.05)
+    second = await service.refresh_todays_games()
+
+    assert second.data_source == "box_scores_live"
+    assert await upstream.calls(BOX_SCORES) == 1
+    assert await upstream.calls(LIVE_BOX_SCORES) == 1
+
+    before = {g.id: g for g in first.response.games}
+    changed = {g.id for g in second.response.games if before[g.id] != g}
+    live = {g.id for g in first.response.games if g.status == GameStatus.IN_PROGRESS}
+    assert changed and changed <= live
+    assert second.version > first.version
+    assert {second.game_versions[i] for i in changed} == {second.version}
+
+
+async def test_unchanged_refresh_keeps_body_and_version(service):
+    first = await service.refresh_todays_games()
+    second = await service.refresh_todays_games()
+
+    assert second.body is first.body
+    assert second.version == first.version
+
+
+async def test_today_revalidates_with_etag(client, service, score_ticks):
+    await service.refresh_todays_games()
+
+    first = await client.get("/api/games/today")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert first.json()["version"] == get_snapshot().version
+
+    unchanged = await client.get("/api/games/today", headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304
+
+    await asyncio.sleep(0.05)
+    await service.refresh_todays_games()
+    changed = await client.get("/api/games/today", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+async def test_since_returns_only_changed_games(client, service, score_ticks):
+    first = await service.refresh_todays_games()
+
+    empty = (await client.get(f"/api/games/today?since={first.version}")).json()
+    assert empty["games"] == [] and not empty["full"]
+
+    await asyncio.sleep(0.05)
+    second = await service.refresh_todays_games()
+    delta = (await client.get(f"/api/games/today?since={first.version}")).json()
+    assert not delta["full"]
+    assert delta["version"] == second.version
+    assert delta["games"]
+    assert {g["status"] for g in delta["games"]} == {"in_progress"}
+
+    # Older than today's slate: the whole slate, flagged full
+    full = (await client.get("/api/games/today?since=0")).json()
+    assert full["full"]
+    assert len(full["games"]) == len(second.response.games)
+
+
+async def test_since_reports_removed_games(client, service, upstream):
+    first = await service.refresh_todays_games()
+    upstream.config.games = 9
+    second = await service.refresh_todays_games()
+
+    delta = (await client.get(f"/api/games/today?since={first.version}")).json()
+
+    removed = {g.id for g in first.response.games} - {
+        g.id for g in second.response.games
+    }
+    assert removed and set(delta["removed_ids"]) == removed
+
+
+async def test_stale_snapshot_is_served_when_upstream_fails(client, service, upstream):
+    await service.refresh_todays_games()
+    etag = (await client.get("/api/games/today")).headers["etag"]
+
+    upstream.config.error_rate = 1.0
+    with pytest.raises(ServerError):
+        await service.refresh_todays_games()
+
+    response = await client.get("/api/games/today")
+    assert response.status_code == 200
+    assert response.headers["etag"] == etag
+
+
+async def test_date_slates_are_cached(client, upstream):
+    yesterday = datetime.now(US_EASTERN).date() - timedelta(days=1)
+
+    for _ in range(3):
+        response = await client.get(f"/api/games?date={yesterday}")
+        assert response.status_code == 200
+
+    assert await upstream.calls(BOX_SCORES) == 1
+
+
+async def test_range_reuses_date_slates(client, upstream):
+    today = datetime.now(US_EASTERN).date()
+    start, end = today - timedelta(days=5), today - timedelta(days=3)
+
+    first = await client.get(f"/api/games/range?start={start}&end={end}")
+    assert first.status_code == 200
+    assert len(first.json()["dates"]) == 3
+    again = await client.get(
+        f"/api/games/range?start={start}&end={end}",
+        headers={"If-None-Match": first.headers["etag"]},
+    )
+
+    assert again.status_code == 304
+    assert await upstream.calls(BOX_SCORES) == 3
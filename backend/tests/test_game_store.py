@@ -0,0 +1,61 @@
+from datetime import date
+
+import numpy as np
+
+from ml.game_store import GameStore, current_season, empty_rows
+
+
+def rows(game_ids: list[int], day: str = "2025-11-01") -> dict[str, np.ndarray]:
+    new = empty_rows(len(game_ids))
+    new["game_id"][:] = game_ids
+    new["date"][:] = np.datetime64(day)
+    return new
+
+
+def test_append_skips_stored_games_and_commits(tmp_path):
+    store = GameStore(tmp_path)
+    manifest = store.manifest(2025)
+
+    assert store.append(manifest, rows([1, 2, 3])) == 3
+    assert store.append(manifest, rows([2, 3, 4])) == 1
+
+    assert store.manifest(2025).rows == 4
+    assert list(store.load_season(2025)["game_id"]) == [1, 2, 3, 4]
+    assert np.isnan(store.load_season(2025)["home_fga"]).all()
+    assert store.seasons() == [2025]
+
+
+def test_rows_past_the_manifest_are_ignored(tmp_path):
+    store = GameStore(tmp_path)
+    store.append(store.manifest(2025), rows([1, 2]))
+    # A crash after writing a column but before committing the manifest
+    np.save(tmp_path / "season=2025" / "game_id.npy", np.arange(1, 6))
+
+    assert list(store.load_season(2025)["game_id"]) == [1, 2]
+    # The next append rewrites the columns consistently
+    store.append(store.manifest(2025), rows([3]))
+    assert list(store.load_season(2025, mmap=True)["game_id"]) == [1, 2, 3]
+
+
+def test_load_all_orders_seasons_by_date_then_id(tmp_path):
+    store = GameStore(tmp_path)
+    store.append(store.manifest(2025), rows([9, 7], day="2025-11-02"))
+    store.append(store.manifest(2024), rows([8], day="2024-11-02"))
+    store.append(store.manifest(2025), rows([5], day="2025-11-03"))
+
+    columns = store.load_all()
+
+    assert list(columns["game_id"]) == [8, 7, 9, 5]
+    assert list(store.load_all([2024])["game_id"]) == [8]
+
+
+def test_empty_store_has_no_seasons(tmp_path):
+    store = GameStore(tmp_path / "missing")
+
+    assert store.seasons() == []
+    assert len(store.load_all()["game_id"]) == 0
+
+
+def test_seasons_are_named_by_their_start_year():
+    assert current_season(date(2025, 10, 21)) == 2025
+    assert current_season(date(2026, 4, 12)) == 2025
@@ -0,0 +1,89 @@
+import brotli
+import pytest
+from starlette.requests import Request
+
+from app.core.http_cache import MIN_COMPRESS_BYTES, PreparedJSON
+
+BODY = b'{"games":"' + b"x" * (4 * MIN_COMPRESS_BYTES) + b'"}'
+
+
+def request(**headers: str) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "headers": [
+                (name.replace("_", "-").encode(), value.encode())
+                for name, value in headers.items()
+            ],
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    ("accept", "encoding"),
+    [
+        ("gzip, deflate, br", "br"),
+        ("gzip", "gzip"),
+        ("BR", "br"),
+        ("br;q=0, gzip", "gzip"),
+        ("gzip;q=0.5, br;q=0.4", "gzip"),
+        ("*", "br"),
+        ("br;q=0, *;q=0.1", "gzip"),
+        ("*;q=0", None),
+        ("identity", None),
+        ("gzipped, xbr", None),
+        ("gzip;q=nope", None),
+        ("", None),
+    ],
+)
+def test_accept_encoding_q_values(accept: str, encoding: str | None):
+    response = PreparedJSON.from_bytes(BODY).respond(request(accept_encoding=accept))
+
+    assert response.headers.get("content-encoding") == encoding
+    assert response.headers["vary"] == "Accept-Encoding"
+
+
+def test_variants_decode_to_the_same_content():
+    prepared = PreparedJSON.from_bytes(BODY)
+    response = prepared.respond(request(accept_encoding="br"))
+
+    assert brotli.decompress(response.body) == BODY
+    assert response.headers["etag"] == prepared.variants["br"][1]
+
+
+def test_small_bodies_are_not_compressed():
+    prepared = PreparedJSON.from_bytes(b'{"games":[]}')
+
+    assert set(prepared.variants) == {"identity"}
+    assert (
+        "content-encoding"
+        not in prepared.respond(request(accept_encoding="br")).headers
+    )
+
+
+def test_fast_compression_is_still_valid_and_keeps_the_etag():
+    full, fast = PreparedJSON.from_bytes(BODY), PreparedJSON.from_bytes(BODY, fast=True)
+
+    assert brotli.decompress(fast.variants["br"][0]) == BODY
+    assert fast.etag == full.etag
+
+
+@pytest.mark.parametrize("encoding", ["identity", "gzip", "br"])
+def test_any_variant_etag_revalidates(encoding: str):
+    prepared = PreparedJSON.from_bytes(BODY)
+    etag = prepared.variants[encoding][1]
+
+    for tag in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        response = prepared.respond(request(if_none_match=tag, accept_encoding="br"))
+        assert response.status_code == 304
+        assert response.body == b""
+
+
+def test_changed_content_does_not_revalidate():
+    old = PreparedJSON.from_bytes(BODY)
+    new = PreparedJSON.from_bytes(BODY.replace(b"x", b"y", 1))
+
+    response = new.respond(request(if_none_match=old.etag))
+
+    assert response.status_code == 200
+    assert response.body == new.content
@@ -0,0 +1,123 @@
+"""
+Historical ingestion from the fake balldontlie's synthetic season.
+"""
+
+import httpx
+import numpy as np
+import pytest
+from balldontlie.exceptions import ServerError
+from balldontlie.nba.models import NBABoxScore
+
+from benchmarks.fake_balldontlie import SEASON_DAYS, FakeConfig, Slate
+from ml import ingest
+from ml.game_store import GameStore
+
+SEASON = 2025
+GAMES_PATH = "/nba/v1/games"
+UNLIMITED = 1e9
+
+
+class FailOnce(httpx.AsyncBaseTransport):
+    """Answers the nth /games page with a 500, once."""
+
+    def __init__(self, nth: int):
+        self.remaining = nth
+
+    def wrap(self, inner: httpx.AsyncBaseTransport) -> "FailOnce":
+        self.inner = inner
+        return self
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == GAMES_PATH:
+            self.remaining -= 1
+            if self.remaining == 0:
+                return httpx.Response(500, json={"error": "injected failure"})
+        return await self.inner.handle_async_request(request)
+
+
+@pytest.fixture
+def store(tmp_path) -> GameStore:
+    return GameStore(tmp_path)
+
+
+async def backfill(upstream, store: GameStore, **kwargs) -> None:
+    await ingest.run(
+        [SEASON],
+        box_scores=False,
+        rate_per_minute=UNLIMITED,
+        store=store,
+        api=upstream.api,
+        **kwargs,
+    )
+
+
+def season_games(upstream) -> int:
+    return SEASON_DAYS * upstream.config.games
+
+
+async def test_backfill_stores_every_final_once(make_upstream, store):
+    upstream = make_upstream()
+    upstream.config.games = 2
+
+    await backfill(upstream, store)
+
+    columns = store.load_season(SEASON)
+    assert len(columns["game_id"]) == season_games(upstream)
+    assert len(np.unique(columns["game_id"])) == len(columns["game_id"])
+    assert store.manifest(SEASON).games_complete
+    assert (columns["home_score"] > 0).all()
+
+
+async def test_interrupted_backfill_resumes_from_its_cursor(make_upstream, store):
+    failure = FailOnce(nth=3)
+    upstream = make_upstream(wrap=failure.wrap)
+    upstream.config.games = 2
+
+    with pytest.raises(ServerError):
+        await backfill(upstream, store)
+    assert store.manifest(SEASON).rows == 200  # two pages of 100
+
+    await backfill(upstream, store)
+
+    assert store.manifest(SEASON).rows == season_games(upstream)
+    # Pages already stored weren't fetched again
+    pages = -(-season_games(upstream) // 100)
+    assert await upstream.calls(GAMES_PATH) == pages
+
+
+async def test_incremental_rerun_adds_nothing_new(make_upstream, store):
+    upstream = make_upstream()
+    upstream.config.games = 2
+    await backfill(upstream, store)
+    ids = store.load_season(SEASON)["game_id"].copy()
+
+    await backfill(upstream, store, incremental=True)
+
+    assert store.manifest(SEASON).rows == season_games(upstream)
+    assert (store.load_season(SEASON)["game_id"] == ids).all()
+
+
+def test_box_scores_fill_the_matching_games(store):
+    day = "2025-11-01"
+    boxes = [
+        NBABoxScore.model_validate(raw)
+        for raw in Slate(FakeConfig(games=3)).box_scores(day)
+    ]
+    columns = ingest.empty_rows(len(boxes) + 1)
+    columns["date"][:] = np.datetime64(day)
+    columns["home_team_id"][:-1] = [b.home_team.id for b in boxes]
+    columns["visitor_team_id"][:-1] = [b.visitor_team.id for b in boxes]
+    columns["home_team_id"][-1], columns["visitor_team_id"][-1] = 29, 30
+
+    # The scheduled game has no player lines yet
+    played = [b for b in boxes if b.home_team.players]
+    assert 0 < len(played) < len(boxes)
+    assert ingest.fill_box_scores(columns, np.datetime64(day), boxes) == len(played)
+
+    for i, box in enumerate(boxes):
+        expected = sum(p.fga or 0 for p in box.home_team.players)
+        if box.home_team.players:
+            assert columns["home_fga"][i] == expected
+        else:
+            assert np.isnan(columns["home_fga"][i])
+    assert np.isnan(columns["visitor_tov"][-1])
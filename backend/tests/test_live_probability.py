@@ -0,0 +1,84 @@
+import numpy as np
+
+from app.models.schemas import GameStatus, GameWithPrediction, Prediction, Team
+from app.services.live_probability import (
+    REGULATION_MINUTES,
+    LiveProbabilityEngine,
+    home_win_probability,
+    minutes_left,
+)
+
+
+def live(
+    game_id: int,
+    home_score: int,
+    away_score: int,
+    period: int = 3,
+    clock: str | None = "6:00",
+    spread: float | None = None,
+    status: GameStatus = GameStatus.IN_PROGRESS,
+) -> GameWithPrediction:
+    """Team 1 hosting team 2, optionally with a pregame spread."""
+    return GameWithPrediction(
+        id=game_id,
+        status=status,
+        status_text=f"Q{period} {clock}",
+        period=period,
+        time_remaining=clock,
+        home_team=Team(id=1, name="", city="", abbreviation="", score=home_score),
+        away_team=Team(id=2, name="", city="", abbreviation="", score=away_score),
+        start_time=None,
+        prediction=None
+        if spread is None
+        else Prediction(winner_id=1, confidence=0.6, spread=spread),
+    )
+
+
+def test_minutes_left():
+    assert minutes_left(0, None) == REGULATION_MINUTES
+    assert minutes_left(1, "12:00") == REGULATION_MINUTES
+    assert minutes_left(3, "4:30") == 12 + 4.5
+    assert minutes_left(4, "0:09.5") == 9.5 / 60
+    assert minutes_left(2, "Half") == 24
+    assert minutes_left(5, "2:00") == 2  # overtime: only this period is left
+
+
+def test_probability_starts_at_the_line_and_converges_on_the_score():
+    lead = np.array([0.0, 0.0, 5.0, 5.0, -1.0, 0.0])
+    minutes = np.array([48.0, 48.0, 24.0, 1.0, 0.0, 0.0])
+    spread = np.array([0.0, 6.0, 0.0, 0.0, 10.0, 0.0])
+
+    p = home_win_probability(lead, minutes, spread)
+
+    assert p[0] == 0.5  # tied tip-off, pick'em
+    assert p[1] > 0.65  # tied tip-off, home favored by 6
+    assert 0.5 < p[2] < p[3] < 1.0  # the same lead is worth more later
+    assert p[4] == 0.0 and p[5] == 0.5  # clock at zero: decided, or overtime
+
+
+def test_only_changed_games_are_recomputed():
+    engine = LiveProbabilityEngine()
+    slate = [live(1, 50, 40), live(2, 40, 50, spread=-3.0)]
+
+    first = engine.apply(slate)
+    assert first[0].live_home_win_probability > 0.5
+    assert first[1].live_home_win_probability < 0.5
+
+    second = engine.apply([slate[0], live(2, 42, 50, spread=-3.0)])
+    assert second[0].live_home_win_probability == first[0].live_home_win_probability
+    assert second[1].live_home_win_probability > first[1].live_home_win_probability
+    assert engine.stats() == {"live_games": 2, "computed": 3, "skipped": 1}
+
+
+def test_games_leaving_the_live_set_lose_the_probability():
+    engine = LiveProbabilityEngine()
+    (during,) = engine.apply([live(1, 50, 40)])
+    assert during.live_home_win_probability is not None
+
+    final = during.model_copy(
+        update={"status": GameStatus.FINAL, "period": 4, "time_remaining": None}
+    )
+    (after,) = engine.apply([final])
+
+    assert after.live_home_win_probability is None
+    assert engine.stats()["live_games"] == 0
@@ -0,0 +1,43 @@
+import hashlib
+
+import httpx
+import pytest
+
+from app.core.metrics import PREFIX
+from app.main import app
+from app.settings import settings
+
+ADMIN_KEY = "operator"
+
+
+@pytest.fixture
+async def client():
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
+
+
+@pytest.fixture
+def admin_key(monkeypatch) -> str:
+    digest = hashlib.sha256(ADMIN_KEY.encode()).hexdigest()
+    monkeypatch.setattr(settings, "admin_api_key_hash", digest)
+    return ADMIN_KEY
+
+
+async def test_metrics_are_hidden_without_an_admin_key_configured(client, monkeypatch):
+    monkeypatch.setattr(settings, "admin_api_key_hash", "")
+
+    assert (await client.get("/metrics")).status_code == 404
+
+
+async def test_metrics_need_the_admin_key(client, admin_key):
+    assert (await client.get("/metrics")).status_code == 401
+    wrong = await client.get("/metrics", headers={"X-Admin-Key": "guess"})
+    assert wrong.status_code == 403
+
+    response = await client.get("/metrics", headers={"X-Admin-Key": admin_key})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert f"# TYPE {PREFIX}" in response.text
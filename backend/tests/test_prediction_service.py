@@ -0,0 +1,176 @@
+"""
+PredictionService: cached, batch-scored predictions, and on the refresh path
+finals feed the feature state and Elo once, whichever endpoint reported them.
+"""
+
+import json
+import math
+from datetime import date, timedelta
+
+import httpx
+import numpy as np
+import pytest
+from conftest import linear_model, warm_elo
+
+from app.models.schemas import Game, GameStatus, Team
+from app.services import game_service
+from app.services.game_service import GameService
+from app.services.prediction_service import ELO_MODEL_VERSION, PredictionService
+from ml.features import FEATURE_NAMES, FeatureEngine
+from ml.model import LinearGameModel
+
+BOX_SCORES_PATH = "/nba/v1/box_scores"
+
+
+class Switchboard(httpx.AsyncBaseTransport):
+    """Fails /box_scores while it's down; once the whistle blows, every game
+    the fake reports is final."""
+
+    def __init__(self):
+        self.box_scores_down = False
+        self.final_whistle = False
+
+    def wrap(self, inner: httpx.AsyncBaseTransport) -> "Switchboard":
+        self.inner = inner
+        return self
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.box_scores_down and request.url.path.startswith(BOX_SCORES_PATH):
+            return httpx.Response(500, json={"error": "injected failure"})
+        response = await self.inner.handle_async_request(request)
+        if not self.final_whistle or not request.url.path.startswith("/nba/"):
+            return response
+        body = json.loads(await response.aread())
+        for game in body["data"]:
+            game.update(status="Final", period=4, time="Final")
+        return httpx.Response(response.status_code, json=body)
+
+
+@pytest.fixture
+def no_live_merge(monkeypatch):
+    """Every tick is a full fetch, so each one goes to /box_scores or /games."""
+    monkeypatch.setattr(game_service, "FULL_RECONCILE_SECONDS", 0)
+
+
+def team_state() -> dict[int, tuple[float, int, int]]:
+    """Per team: Elo rating, Elo games and games in the feature window."""
+    predictions = game_service._predictions
+    elo = predictions.elo
+    return {
+        team: (elo.rating(team), elo.games.get(team, 0), len(state.recent))
+        for team, state in predictions.engine._teams.items()
+    }
+
+
+async def test_finals_count_once_across_box_scores_and_games(
+    make_upstream, no_live_merge
+):
+    switchboard = Switchboard()
+    service = GameService(make_upstream(wrap=switchboard.wrap).balldontlie())
+
+    first = await service.refresh_todays_games()
+    assert first.data_source == "box_scores"
+    statuses = {g.status for g in first.response.games}
+    assert GameStatus.FINAL in statuses and len(statuses) > 1
+
+    # The rest of the slate goes final on a /games fallback tick...
+    switchboard.box_scores_down = switchboard.final_whistle = True
+    second = await service.refresh_todays_games()
+    assert second.data_source == "games"
+    after_games = team_state()
+
+    # ...and box scores come back
+    switchboard.box_scores_down = False
+    third = await service.refresh_todays_games()
+    assert third.data_source == "box_scores"
+
+    # One id per game whichever endpoint served it, and each final counted once
+    ids = [{g.id for g in s.response.games} for s in (first, second, third)]
+    assert ids[0] == ids[1] == ids[2]
+    assert all(g.status == GameStatus.FINAL for g in third.response.games)
+    assert len(after_games) == 2 * len(ids[0])
+    assert {(games, window) for _, games, window in after_games.values()} == {(1, 1)}
+    assert team_state() == after_games
+    # Nothing changed: the finals pinned on the /games tick are kept as-is
+    assert third.version == second.version
+
+
+DAY = date(2025, 11, 1)
+
+
+def game(game_id: int, home: int, away: int, home_score: int = 0, away_score: int = 0):
+    """A scheduled game, or a final if it has a score."""
+    final = home_score or away_score
+    return Game(
+        id=game_id,
+        status=GameStatus.FINAL if final else GameStatus.SCHEDULED,
+        status_text="Final" if final else "7:30 PM ET",
+        period=4 if final else 0,
+        time_remaining=None,
+        home_team=Team(id=home, name="", city="", abbreviation="", score=home_score),
+        away_team=Team(id=away, name="", city="", abbreviation="", score=away_score),
+        start_time=None,
+    )
+
+
+def test_slate_is_scored_once_then_served_from_cache():
+    service = PredictionService(linear_model(), FeatureEngine())
+    slate = [game(1, 1, 2), game(2, 3, 4), game(3, 5, 6)]
+
+    first = service.attach(slate, DAY)
+    second = service.attach(slate, DAY)
+
+    assert [g.prediction for g in second] == [g.prediction for g in first]
+    assert (service.misses, service.hits) == (3, 3)
+    assert service.last_batch_size == 3
+    # No history either side: a coin flip with no home edge
+    assert {g.prediction.confidence for g in first} == {0.5}
+
+
+def test_finals_feed_the_next_days_predictions_not_their_own():
+    service = PredictionService(linear_model(), FeatureEngine())
+
+    (final,) = service.attach([game(1, 1, 2, 120, 100)], DAY)
+    assert final.prediction.confidence == 0.5
+
+    (tomorrow,) = service.attach([game(2, 1, 3)], DAY + timedelta(days=1))
+    assert tomorrow.prediction.winner_id == 1
+    assert tomorrow.prediction.confidence == round(1 / (1 + math.exp(-2.0)), 3)
+    assert tomorrow.prediction.spread == 20.0
+
+
+def test_swapped_model_rescores_the_slate():
+    service = PredictionService(linear_model(), FeatureEngine())
+    slate = [game(1, 1, 2)]
+    service.attach(slate, DAY)
+
+    service.swap_model(linear_model("20250102000000", home_edge=1.0))
+    (rescored,) = service.attach(slate, DAY)
+
+    assert service.misses == 2
+    assert rescored.prediction.winner_id == 1
+    assert rescored.prediction.spread == 10.0
+
+
+def test_elo_predicts_until_a_model_is_trained():
+    cold = PredictionService(None, FeatureEngine())
+    (unscored,) = cold.attach([game(1, 1, 2)], DAY)
+    assert unscored.prediction is None
+
+    service = PredictionService(None, FeatureEngine(), warm_elo())
+    (scored,) = service.attach([game(1, 1, 2)], DAY)
+    assert scored.prediction.winner_id == 1  # home advantage
+    assert service.stats()["model_version"] == ELO_MODEL_VERSION
+
+
+def test_model_round_trips_through_the_registry(tmp_path):
+    model = linear_model(home_edge=0.3)
+    model.save(tmp_path)
+
+    loaded = LinearGameModel.load(tmp_path, model.version)
+
+    X = np.random.default_rng(0).normal(size=(8, len(FEATURE_NAMES)))
+    X[0, :] = np.nan
+    np.testing.assert_allclose(loaded.predict_proba(X), model.predict_proba(X))
+    np.testing.assert_allclose(loaded.predict_spread(X), model.predict_spread(X))
+    np.testing.assert_allclose(loaded.predict_proba(X).sum(axis=1), 1.0)
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from app.core.rate_limit import Priority, RateLimitTimeout, TokenBucket
+from app.core.shared_state import SharedState
+
+
+async def test_burst_is_served_from_capacity():
+    bucket = TokenBucket(rate_per_minute=60, capacity=3)
+
+    for _ in range(3):
+        await asyncio.wait_for(bucket.acquire(), 0.01)
+
+    assert bucket.granted[Priority.SCHEDULE] == 3
+    assert bucket.remaining() < 1
+
+
+async def test_queued_callers_are_served_by_priority():
+    # One token every 20ms, none in hand
+    bucket = TokenBucket(rate_per_minute=3000, capacity=1)
+    await bucket.acquire()
+    served = []
+
+    async def call(priority: Priority, name: str):
+        await bucket.acquire(priority)
+        served.append(name)
+
+    tasks = [
+        asyncio.create_task(call(Priority.BACKFILL, "backfill")),
+        asyncio.create_task(call(Priority.SCHEDULE, "schedule")),
+    ]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(call(Priority.LIVE, "live")))
+    await asyncio.gather(*tasks)
+
+    # The live call arrived last but jumped the queue
+    assert served == ["live", "schedule", "backfill"]
+
+
+async def test_reserve_keeps_tokens_for_live_calls():
+    bucket = TokenBucket(rate_per_minute=60, capacity=3, reserve={Priority.BACKFILL: 2})
+
+    await bucket.acquire(Priority.BACKFILL)
+    with pytest.raises(RateLimitTimeout):
+        await bucket.acquire(Priority.BACKFILL, timeout=0.01)
+    # The two reserved tokens are still there for live refreshes
+    await asyncio.wait_for(bucket.acquire(Priority.LIVE), 0.01)
+    await asyncio.wait_for(bucket.acquire(Priority.LIVE), 0.01)
+
+
+async def test_deadline_raises_and_leaves_the_queue():
+    bucket = TokenBucket(
+        rate_per_minute=1, capacity=1, default_timeouts={Priority.LIVE: 0.01}
+    )
+    await bucket.acquire(Priority.LIVE)
+
+    with pytest.raises(RateLimitTimeout):
+        await bucket.acquire(Priority.LIVE)
+
+    stats = bucket.stats()
+    assert stats["timeouts"]["LIVE"] == 1
+    assert stats["waiting"]["LIVE"] == 0
+
+
+async def test_drain_empties_the_bucket():
+    bucket = TokenBucket(rate_per_minute=60, capacity=5)
+
+    bucket.drain()
+
+    with pytest.raises(RateLimitTimeout):
+        await bucket.acquire(timeout=0.01)
+
+
+async def test_shared_buckets_spend_one_budget(tmp_path):
+    # Two workers' buckets over one shared directory
+    shared = SharedState(tmp_path)
+    first, second = (TokenBucket(rate_per_minute=1, capacity=3) for _ in range(2))
+    first.share(shared, "budget")
+    second.share(shared, "budget")
+
+    await first.acquire()
+    await first.acquire()
+    await second.acquire()
+
+    with pytest.raises(RateLimitTimeout):
+        await second.acquire(timeout=0.01)
+    assert first.remaining() < 1
+
+
+async def test_drain_in_one_worker_stops_the_others(tmp_path):
+    shared = SharedState(tmp_path)
+    first, second = (TokenBucket(rate_per_minute=60, capacity=5) for _ in range(2))
+    first.share(shared, "budget")
+    second.share(shared, "budget")
+
+    first.drain()
+
+    with pytest.raises(RateLimitTimeout):
+        await second.acquire(timeout=0.01)
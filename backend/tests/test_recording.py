@@ -0,0 +1,95 @@
+"""
+Recording a night from the fake balldontlie and replaying it offline.
+"""
+
+import json
+from datetime import date
+
+import httpx
+import pytest
+from balldontlie.exceptions import ServerError
+
+from app.providers import balldontlie_provider
+from app.providers.recording import load_recording
+from app.providers.replay_provider import ReplayProvider
+
+BOX_SCORES_PATH = "/nba/v1/box_scores"
+
+
+class Outage(httpx.AsyncBaseTransport):
+    """Answers /box_scores with a 500 while `down`."""
+
+    def __init__(self):
+        self.down = False
+
+    def wrap(self, inner: httpx.AsyncBaseTransport) -> "Outage":
+        self.inner = inner
+        return self
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.down and request.url.path == BOX_SCORES_PATH:
+            return httpx.Response(500, json={"error": "injected failure"})
+        return await self.inner.handle_async_request(request)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def recording(tmp_path):
+    path = tmp_path / "night.jsonl.gz"
+    balldontlie_provider.enable_recording(str(path))
+    yield path
+    balldontlie_provider.disable_recording()
+
+
+async def test_a_recorded_night_replays_offline(make_upstream, recording):
+    outage = Outage()
+    provider = make_upstream(wrap=outage.wrap).balldontlie()
+    recorded = await provider.fetch_box_scores_by_date_raw(date.today())
+    outage.down = True
+    with pytest.raises(ServerError):
+        await provider.fetch_box_scores_by_date_raw(date.today())
+    balldontlie_provider.disable_recording()
+
+    calls = load_recording(recording)
+    assert [c.path for c in calls] == ["nba/v1/box_scores"] * 2
+    assert calls[0].error is None and calls[0].at == 0.0
+    assert calls[1].error["type"] == "ServerError"
+
+    clock = Clock()
+    replay = ReplayProvider(calls, speed=10.0, clock=clock)
+    replayed = await replay.fetch_box_scores_by_date_raw(date.today())
+    assert json.loads(replayed) == json.loads(recorded)
+
+    # Past the recorded failure, replay raises it again, whatever the date
+    clock.now = calls[1].at / replay.speed + 1
+    with pytest.raises(ServerError):
+        await replay.fetch_box_scores_by_date_raw(date(2020, 1, 1))
+    assert replay.served == 2
+
+
+def test_segments_from_restarts_are_merged_in_time_order(tmp_path):
+    path = tmp_path / "night.jsonl"
+    lines = [
+        {"format": 1, "started_at": "2025-01-14T00:00:00+00:00"},
+        {"t": 0.0, "path": "a", "params": None, "body": {"n": 1}},
+        {"t": 30.0, "path": "a", "params": None, "body": {"n": 3}},
+        # A second process started 10 s in
+        {"format": 1, "started_at": "2025-01-14T00:00:10+00:00"},
+        {"t": 5.0, "path": "b", "params": None, "body": {"n": 2}},
+    ]
+    path.write_text("\n".join(json.dumps(line) for line in lines) + "\n")
+
+    calls = load_recording(path)
+
+    assert [(c.at, c.body["n"]) for c in calls] == [(0.0, 1), (15.0, 2), (30.0, 3)]
+
+    path.write_text(json.dumps({"format": 2, "started_at": ""}) + "\n")
+    with pytest.raises(ValueError, match="format 2"):
+        load_recording(path)
@@ -0,0 +1,78 @@
+"""
+Model registry: atomic, immutable, memory-mapped versions, and the API's
+hot reload of the newest one.
+"""
+
+import numpy as np
+import pytest
+from conftest import linear_model
+
+from app.services.prediction_service import ModelReloader, PredictionService
+from ml.model import LinearGameModel
+from ml.registry import ModelRegistry
+
+
+def test_published_versions_are_read_back_memory_mapped(tmp_path):
+    registry = ModelRegistry(tmp_path)
+    assert registry.latest() is None
+
+    registry.publish("v1", kind="k", metadata={"a": 1}, arrays={"w": np.arange(4.0)})
+    registry.publish("v2", kind="k", metadata={}, arrays={})
+    # A crashed publish leaves only a hidden staging directory behind
+    (tmp_path / ".v3-abc").mkdir()
+
+    assert registry.versions() == ["v1", "v2"]
+    assert registry.latest() == "v2"
+    manifest, arrays = registry.read("v1")
+    assert manifest["metadata"] == {"a": 1}
+    assert isinstance(arrays["w"], np.memmap)
+    assert not arrays["w"].flags.writeable
+    np.testing.assert_array_equal(arrays["w"], np.arange(4.0))
+
+
+def test_versions_are_immutable(tmp_path):
+    registry = ModelRegistry(tmp_path)
+    registry.publish("v1", kind="k", metadata={}, arrays={"w": np.zeros(2)})
+
+    with pytest.raises(FileExistsError):
+        registry.publish("v1", kind="k", metadata={}, arrays={"w": np.ones(2)})
+    np.testing.assert_array_equal(registry.read("v1")[1]["w"], np.zeros(2))
+
+
+def test_artifacts_of_another_kind_or_feature_set_are_refused(tmp_path):
+    ModelRegistry(tmp_path).publish("other", kind="elo", metadata={}, arrays={})
+    model = linear_model("stale")
+    model.save(tmp_path)
+    manifest = tmp_path / "stale" / "manifest.json"
+    manifest.write_text(manifest.read_text().replace("home_margin", "home_pace"))
+
+    with pytest.raises(ValueError, match="artifact"):
+        LinearGameModel.load(tmp_path, "other")
+    with pytest.raises(ValueError, match="different features"):
+        LinearGameModel.load(tmp_path, "stale")
+
+
+async def test_reloader_swaps_in_new_versions_and_skips_broken_ones(tmp_path):
+    linear_model("20250101000000").save(tmp_path)
+    service = PredictionService.load(tmp_path, tmp_path / "games")
+    reloader = ModelReloader(service, tmp_path)
+    assert service.model.version == "20250101000000"
+    assert not await reloader.check()
+
+    linear_model("20250102000000", home_edge=1.0).save(tmp_path)
+    assert await reloader.check()
+    assert service.model.version == "20250102000000"
+
+    # Published, but not loadable: keep serving the previous model
+    linear_model("20250103000000").save(tmp_path)
+    (tmp_path / "20250103000000" / "win_coef.npy").unlink()
+    assert not await reloader.check()
+    assert not await reloader.check()
+    assert service.model.version == "20250102000000"
+
+
+def test_service_starts_without_a_model_or_history(tmp_path):
+    service = PredictionService.load(tmp_path / "models", tmp_path / "games")
+
+    assert service.model is None
+    assert service.stats()["model_version"] is None
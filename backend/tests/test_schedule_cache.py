@@ -0,0 +1,90 @@
+import json
+import math
+from datetime import UTC, date, datetime, timedelta
+
+from app.core.http_cache import PreparedJSON
+from app.models.schemas import GameListResponse, GameStatus, GameWithPrediction, Team
+from app.services.schedule_cache import (
+    PAST_UNSETTLED_TTL_SECONDS,
+    SCHEDULE_TTL_SECONDS,
+    TODAY_TTL_SECONDS,
+    DateSlateCache,
+    slate_ttl,
+)
+
+TODAY = date(2025, 11, 10)
+YESTERDAY = TODAY - timedelta(days=1)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def slate(*statuses: GameStatus) -> GameListResponse:
+    team = Team(id=1, name="", city="", abbreviation="", score=0)
+    games = [
+        GameWithPrediction(
+            id=i,
+            status=status,
+            status_text="",
+            period=0,
+            time_remaining=None,
+            home_team=team,
+            away_team=team,
+            start_time=None,
+        )
+        for i, status in enumerate(statuses)
+    ]
+    return GameListResponse(
+        games=games, last_updated=datetime(2025, 11, 10, tzinfo=UTC)
+    )
+
+
+def test_ttl_follows_how_much_a_date_can_still_change():
+    final, live = GameStatus.FINAL, GameStatus.IN_PROGRESS
+
+    assert slate_ttl(YESTERDAY, TODAY, slate(final, final)) == math.inf
+    assert slate_ttl(YESTERDAY, TODAY, slate(final, live)) == PAST_UNSETTLED_TTL_SECONDS
+    assert slate_ttl(YESTERDAY, TODAY, slate()) == SCHEDULE_TTL_SECONDS  # off day
+    assert slate_ttl(TODAY, TODAY, slate(final)) == TODAY_TTL_SECONDS
+    assert slate_ttl(TODAY + timedelta(days=1), TODAY, slate()) == SCHEDULE_TTL_SECONDS
+
+
+def test_stale_slates_are_kept_until_evicted():
+    clock = Clock()
+    cache = DateSlateCache(size=2, clock=clock)
+    body = PreparedJSON.from_bytes(b"{}")
+    for days in (3, 2, 1):
+        game_date = TODAY - timedelta(days=days)
+        response = slate(GameStatus.FINAL if days > 1 else GameStatus.IN_PROGRESS)
+        cache.put(cache.build(game_date, TODAY, response, body, "upstream"))
+
+    assert cache.get(TODAY - timedelta(days=3)) is None  # least recently used
+    final, settling = cache.get(TODAY - timedelta(days=2)), cache.get(YESTERDAY)
+    assert final.final and not settling.final
+
+    clock.now += PAST_UNSETTLED_TTL_SECONDS
+    assert cache.is_fresh(final) and not cache.is_fresh(settling)
+    assert cache.expires_in(settling) == 0
+    assert cache.stats() == {"dates": 2, "final_dates": 1, "ranges": 0}
+
+
+def test_range_body_splices_the_date_bodies_and_is_reused():
+    cache = DateSlateCache()
+    bodies = [
+        (day, PreparedJSON.from_model(slate(GameStatus.FINAL)))
+        for day in (YESTERDAY, TODAY)
+    ]
+
+    body = cache.range_body(bodies)
+
+    assert json.loads(body.content) == {
+        "dates": {day.isoformat(): json.loads(b.content) for day, b in bodies}
+    }
+    assert cache.range_body(bodies) is body
+    changed = [bodies[0], (TODAY, PreparedJSON.from_model(slate()))]
+    assert cache.range_body(changed) is not body
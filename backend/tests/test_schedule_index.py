@@ -0,0 +1,132 @@
+from datetime import UTC, date, datetime, timedelta
+
+import numpy as np
+
+from app.models.schemas import Game, GameStatus, Team
+from app.services.game_decoder import box_score_id
+from app.services.schedule_index import ScheduleIndex
+
+SEASON = 2025
+START = date(2025, 11, 1)
+FETCHED = datetime(2025, 11, 3, tzinfo=UTC)
+
+
+def wire_game(day: int, home: int, visitor: int, hour: int, final: bool = False):
+    """A /games entry `day` days after START; scheduled unless final."""
+    game_date = START + timedelta(days=day)
+    tipoff = f"{game_date.isoformat()}T{hour:02d}:00:00Z"
+
+    def team(team_id: int) -> dict:
+        return {"id": team_id, "name": f"T{team_id}", "city": "", "abbreviation": ""}
+
+    return {
+        "id": 1000 + day,  # upstream's id; the index uses box_score_id
+        "date": game_date.isoformat(),
+        "datetime": tipoff,
+        "status": "Final" if final else tipoff,
+        "period": 4 if final else 0,
+        "home_team_score": 110 if final else 0,
+        "visitor_team_score": 100 if final else 0,
+        "home_team": team(home),
+        "visitor_team": team(visitor),
+    }
+
+
+# Listed out of order: the index sorts by date, tipoff, id
+GAMES = [
+    wire_game(2, 1, 3, hour=23),
+    wire_game(0, 1, 2, hour=23, final=True),
+    wire_game(2, 2, 4, hour=19),
+    wire_game(1, 3, 1, hour=20, final=True),
+    wire_game(4, 2, 1, hour=18),
+    {"id": 9, "date": None, "home_team": {}, "visitor_team": {}},  # TBD
+]
+
+
+def index() -> ScheduleIndex:
+    return ScheduleIndex.build(SEASON, GAMES, FETCHED)
+
+
+def ids(games) -> list[int]:
+    return [g.id for g in games]
+
+
+def test_lookups_by_date_team_and_matchup():
+    schedule = index()
+    day2 = START + timedelta(days=2)
+
+    assert len(schedule) == 5
+    assert ids(schedule.games_on(day2)) == [
+        box_score_id(GAMES[2]),
+        box_score_id(GAMES[0]),
+    ]
+    assert schedule.games_on(START + timedelta(days=3)) == []
+    assert schedule.covers(day2) and not schedule.covers(START - timedelta(days=1))
+
+    team_1 = schedule.team_games(1)
+    assert [g.start_time for g in team_1] == sorted(g.start_time for g in team_1)
+    assert len(team_1) == 4
+    assert ids(schedule.team_games(1, opponent_id=3)) == ids(schedule.team_games(3, 1))
+    assert len(schedule.team_games(3, 1)) == 2
+    assert schedule.team_games(1, opponent_id=4) == []
+    assert schedule.team_games(30) is None
+
+    (opener,) = schedule.games_on(START)
+    assert opener.status == GameStatus.FINAL and opener.home_team.score == 110
+    assert opener.home_team.name == "T1" and opener.away_team.name == "T2"
+
+
+def test_next_game_and_next_tipoff():
+    schedule = index()
+
+    # Team 1's games on days 0 and 1 are final
+    assert schedule.next_game(1, START).id == box_score_id(GAMES[0])
+    assert schedule.next_game(1, START + timedelta(days=3)).id == box_score_id(GAMES[4])
+    assert schedule.next_game(1, START + timedelta(days=5)) is None
+
+    after = datetime(2025, 11, 3, 20, tzinfo=UTC)
+    assert schedule.next_tipoff(after) == datetime(2025, 11, 3, 23, tzinfo=UTC)
+    assert schedule.tipoff(box_score_id(GAMES[2])) == datetime(
+        2025, 11, 3, 19, tzinfo=UTC
+    )
+    assert schedule.game_date(box_score_id(GAMES[4])) == START + timedelta(days=4)
+    assert schedule.game_date(12345) is None
+
+
+def test_finals_are_folded_in_without_touching_the_original():
+    schedule = index()
+    (game,) = schedule.games_on(START + timedelta(days=4))
+    final = Game(
+        **{
+            **game.__dict__,
+            "status": GameStatus.FINAL,
+            "period": 4,
+            "home_team": Team(**{**game.home_team.__dict__, "score": 99}),
+            "away_team": Team(**{**game.away_team.__dict__, "score": 101}),
+        }
+    )
+
+    updated = schedule.with_results([final])
+
+    assert updated.next_game(1, START + timedelta(days=3)) is None
+    (after,) = updated.games_on(START + timedelta(days=4))
+    assert (after.status, after.home_team.score, after.away_team.score) == (
+        GameStatus.FINAL,
+        99,
+        101,
+    )
+    assert schedule.next_game(1, START + timedelta(days=3)).id == game.id
+    # Lookups and unchanged columns are shared, not copied
+    assert updated.columns["tipoff"] is schedule.columns["tipoff"]
+    assert updated.with_results([final]) is None
+
+
+def test_round_trips_through_shared_state_bytes():
+    schedule = index()
+
+    copy = ScheduleIndex.from_bytes(schedule.to_bytes())
+
+    assert copy.stats() == schedule.stats()
+    for name, array in schedule.columns.items():
+        np.testing.assert_array_equal(copy.columns[name], array)
+    assert copy.team_games(1) == schedule.team_games(1)
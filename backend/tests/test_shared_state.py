@@ -0,0 +1,139 @@
+"""
+Cross-worker state. Workers are separate processes in production; here each
+"worker" is a LeaderLock or a swap of game_service's module state, which is
+all a process boundary changes (flocks conflict across open files, even
+within one process).
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.shared_state import LeaderLock, SharedState, pack, unpack
+from app.services import game_poller, game_service
+from app.services.game_decoder import US_EASTERN
+from app.services.game_poller import WorkerCoordinator
+from app.services.game_service import (
+    GameService,
+    enable_sharing,
+    get_snapshot,
+    is_leader,
+    promote_to_leader,
+    sync_shared_state,
+)
+from app.services.schedule_cache import DateSlateCache
+
+
+@pytest.fixture
+def shared(tmp_path) -> SharedState:
+    return SharedState(tmp_path / "shared")
+
+
+class Poller:
+    def __init__(self):
+        self.running = False
+
+    def start(self) -> None:
+        self.running = True
+
+    async def stop(self) -> None:
+        self.running = False
+
+
+def become_follower(monkeypatch) -> None:
+    """Swap in a fresh worker's state: nothing cached, not the leader."""
+    monkeypatch.setattr(game_service, "_snapshot", None)
+    monkeypatch.setattr(game_service, "_snapshot_ready", asyncio.Event())
+    monkeypatch.setattr(game_service, "_dates", DateSlateCache())
+    monkeypatch.setattr(game_service, "_shared_stamps", {})
+    monkeypatch.setattr(game_service, "_leader", False)
+
+
+def test_pack_round_trip():
+    header = {"version": 3, "etags": {"identity": '"abc"'}}
+    parts = {"identity": b"{}", "br": bytes(range(256))}
+
+    assert unpack(pack(header, parts)) == (header, parts)
+
+
+def test_entries_are_versioned_by_stamp(shared):
+    assert shared.read("entry") is None
+
+    shared.write("entry", b"one")
+    stamp, blob = shared.read("entry")
+    assert blob == b"one"
+    assert shared.read("entry", since=stamp) is None
+
+    shared.write("entry", b"two")
+    assert shared.read("entry", since=stamp)[1] == b"two"
+
+
+async def test_named_lock_is_exclusive(shared):
+    async with shared.lock("date", timeout=1) as first:
+        assert first
+        async with shared.lock("date", timeout=0.05) as second:
+            assert not second
+        async with shared.lock("other", timeout=0.05) as other:
+            assert other
+    async with shared.lock("date", timeout=0.05) as after:
+        assert after
+
+
+def test_one_leader_at_a_time(shared):
+    first, second = LeaderLock(shared), LeaderLock(shared)
+
+    assert first.try_acquire()
+    assert not second.try_acquire()
+
+    first.release()
+    assert second.try_acquire()
+    second.release()
+
+
+async def test_follower_takes_over_when_the_leader_stops(shared, monkeypatch):
+    monkeypatch.setattr(game_poller, "FOLLOW_INTERVAL_SECONDS", 0.01)
+    enable_sharing(shared)
+    leader_poller, follower_poller = Poller(), Poller()
+    leader = WorkerCoordinator(LeaderLock(shared), [leader_poller])
+    follower = WorkerCoordinator(LeaderLock(shared), [follower_poller])
+
+    leader.start()
+    follower.start()
+    await asyncio.sleep(0.05)
+    assert leader_poller.running and not follower_poller.running
+
+    await leader.stop()
+    monkeypatch.setattr(game_service, "_leader", False)
+    await asyncio.sleep(0.05)
+    assert follower_poller.running
+    assert is_leader()
+    await follower.stop()
+
+
+async def test_follower_mirrors_the_leaders_snapshot(shared, upstream, monkeypatch):
+    enable_sharing(shared)
+    promote_to_leader()
+    leaders = await GameService(upstream.balldontlie()).refresh_todays_games()
+
+    become_follower(monkeypatch)
+    sync_shared_state()
+
+    mirrored = get_snapshot()
+    assert mirrored.version == leaders.version
+    assert mirrored.body.variants == leaders.body.variants
+    assert mirrored.game_versions == leaders.game_versions
+    assert await upstream.calls() == 1
+
+
+async def test_date_slate_is_built_once_across_workers(shared, upstream, monkeypatch):
+    enable_sharing(shared)
+    service = GameService(upstream.balldontlie())
+    day = datetime.now(US_EASTERN).date() - timedelta(days=3)
+    first = await service.get_date_body(day)
+
+    become_follower(monkeypatch)
+    second = await service.get_date_body(day)
+
+    assert second.etag == first.etag
+    assert await upstream.calls() == 1
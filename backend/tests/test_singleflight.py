@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from app.core.singleflight import SingleFlight
+
+
+async def test_concurrent_callers_share_one_call():
+    flight = SingleFlight("test")
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    results = await asyncio.gather(*(flight.do("key", fetch) for _ in range(10)))
+
+    assert results == [1] * 10
+    assert calls == 1
+    assert flight.stats() == {"flights": 1, "coalesced": 9, "in_flight": 0}
+
+
+async def test_keys_fly_separately_and_are_forgotten_once_settled():
+    flight = SingleFlight("test")
+
+    async def fetch(value):
+        await asyncio.sleep(0)
+        return value
+
+    assert await asyncio.gather(
+        flight.do("a", lambda: fetch("a")), flight.do("b", lambda: fetch("b"))
+    ) == ["a", "b"]
+    # Not a cache: the next call for a settled key starts a new flight
+    assert await flight.do("a", lambda: fetch("again")) == "again"
+    assert flight.stats()["flights"] == 3
+
+
+async def test_every_waiter_gets_the_error():
+    flight = SingleFlight("test")
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream down")
+
+    results = await asyncio.gather(
+        *(flight.do("key", fail) for _ in range(3)), return_exceptions=True
+    )
+
+    assert [type(r) for r in results] == [ValueError] * 3
+    assert flight.stats()["flights"] == 1
+
+
+async def test_cancelled_caller_does_not_cancel_the_call():
+    flight = SingleFlight("test")
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        return "done"
+
+    first = asyncio.create_task(flight.do("key", fetch))
+    second = asyncio.create_task(flight.do("key", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == "done"
+    with pytest.raises(asyncio.CancelledError):
+        await first
@@ -0,0 +1,96 @@
+"""
+Warm restarts: slates saved to SQLite and restored before taking traffic.
+"""
+
+import asyncio
+from datetime import UTC, date, datetime
+
+import pytest
+
+from app.models.schemas import GameListResponse
+from app.services import game_service
+from app.services.game_service import (
+    GameService,
+    disable_persistence,
+    enable_persistence,
+    get_snapshot,
+)
+from app.services.snapshot_store import SnapshotStore, SnapshotWriter
+
+DAY = date(2026, 1, 15)
+
+
+def payload(version: int) -> bytes:
+    return (
+        GameListResponse(games=[], last_updated=datetime.now(UTC), version=version)
+        .model_dump_json()
+        .encode()
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SnapshotStore(tmp_path / "snapshots.db")
+    yield store
+    store.close()
+
+
+def test_slates_survive_reopening(tmp_path, store):
+    assert store.load_slate(DAY) is None
+
+    store.save_slate(DAY, 1, payload(1))
+    store.save_slate(DAY, 2, payload(2))
+    store.close()
+
+    reopened = SnapshotStore(tmp_path / "snapshots.db")
+    response, version = reopened.load_slate(DAY)
+    reopened.close()
+    assert version == 2 and response.version == 2
+
+
+async def test_writer_keeps_only_the_newest_pending_slate(store, monkeypatch):
+    saved = []
+    save_slate = store.save_slate
+    monkeypatch.setattr(
+        store,
+        "save_slate",
+        lambda day, version, body: saved.append(version)
+        or save_slate(day, version, body),
+    )
+    writer = SnapshotWriter(store)
+
+    for version in range(1, 5):
+        writer.schedule(DAY, version, payload(version))
+    await writer.flush()
+
+    # Scheduled faster than the writer ran: only the newest is written
+    assert saved == [4]
+    assert store.load_slate(DAY)[1] == 4
+
+
+async def test_restart_serves_the_saved_slate_before_upstream(
+    tmp_path, upstream, monkeypatch
+):
+    first = SnapshotStore(tmp_path / "snapshots.db")
+    enable_persistence(first)
+    before = await GameService(upstream.balldontlie()).refresh_todays_games()
+    await disable_persistence()
+    first.close()
+
+    # A new process: nothing in memory
+    monkeypatch.setattr(game_service, "_snapshot", None)
+    monkeypatch.setattr(game_service, "_snapshot_ready", asyncio.Event())
+    second = SnapshotStore(tmp_path / "snapshots.db")
+    enable_persistence(second)
+
+    restored = get_snapshot()
+    assert restored.data_source == "disk"
+    assert restored.version == before.version
+    assert restored.response.games == before.response.games
+    assert await upstream.calls() == 1
+
+    # The first tick still reconciles with a full fetch
+    after = await GameService(upstream.balldontlie()).refresh_todays_games()
+    assert after.data_source == "box_scores"
+    await disable_persistence()
+    second.close()